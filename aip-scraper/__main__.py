@@ -3,22 +3,251 @@ UK AIP Scraper
 """
 
 # Python Imports
+import argparse
+import os
+import sys
+import threading
 
 # 3rd Party Imports
 from loguru import logger
 
 # Local Imports
-from . import scraper, verify
+from . import config
+from .airac import BASE_URL, Airac, check_base_url
+
+
+def cycle_args(args:argparse.Namespace) -> dict:
+    """Turn the --cycle option into keyword arguments for Airac / Webscrape"""
+
+    if args.cycle == "next":
+        return {'use_next': True}
+    if args.cycle == "current":
+        return {}
+    return {'date_in': args.cycle}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser"""
+
+    parser = argparse.ArgumentParser(prog="aip-scraper", description="UK AIP Scraper")
+    subparsers = parser.add_subparsers(dest="command")
+
+    scrape = subparsers.add_parser("scrape", help="scrape the eAIP")
+    scrape.add_argument(
+        "--sections",
+        nargs="+",
+        choices=list(config.SECTIONS),
+        metavar="SECTION",
+        help=f"only scrape these sections ({', '.join(config.SECTIONS)}), any sections they depend on are loaded as well"
+        )
+    scrape.add_argument("--icao", nargs="+", help="only scrape AD-2 for these aerodromes")
+    scrape.add_argument(
+        "--cycle",
+        default="current",
+        help="AIRAC cycle to scrape, either 'current', 'next' or the cycle in effect on a date (YYYY-MM-DD)"
+        )
+    scrape.add_argument("--browsers", type=int, default=1, help="number of headless browsers used to render pages")
+    scrape.add_argument("--recycle-after", type=int, default=100, help="restart each browser after this many pages")
+    scrape.add_argument("--no-render", dest="render", action="store_false", help="parse the fetched HTML directly instead of rendering it in a browser")
+    scrape.add_argument("--max-concurrency", type=int, default=16, help="most page requests to have in flight at once")
+    scrape.add_argument("--stream", action="store_true", help="parse the large ENR pages as they download instead of holding them in memory, needs --no-render")
+    scrape.add_argument("--cache-size", type=int, default=256, help="size of the parsed page cache in MB, 0 to turn it off")
+    scrape.add_argument("--base-url", default=BASE_URL, help="where the eAIP is published, eg the address of a stand-in server, each cycle has to be at <URL><cycle>-AIRAC/html/eAIP/ like the NATS eAIP")
+    scrape.add_argument("--sqlite", nargs="?", const=os.path.join(config.WORK_DIR, "aip.sqlite"), metavar="PATH", help="also save the results to an SQLite database")
+    scrape.add_argument(
+        "--checkpoint",
+        nargs="?",
+        const=os.path.join(config.WORK_DIR, "Checkpoints"),
+        metavar="PATH",
+        help="record progress so an interrupted run picks up where it stopped when run again"
+        )
+    scrape.add_argument(
+        "--country",
+        nargs="+",
+        default=[config.COUNTRY_CODE],
+        metavar="CODE[=URL]",
+        help="eAIPs to scrape, optionally with the base URL each is published at, several are scraped at once into a directory each"
+        )
+
+    verify = subparsers.add_parser("verify", help="verify the UK Sector File against scraped data")
+    verify.add_argument("check", choices=["aerodromes", "enr-4.4"])
+    verify.add_argument("--sqlite", nargs="?", const=os.path.join(config.WORK_DIR, "aip.sqlite"), metavar="PATH", help="read the scraped data from an SQLite database instead of the CSVs")
+    verify.add_argument("--cycle", help="AIRAC cycle (YYYY-MM-DD) to read from the database, the latest if not given")
+
+    daemon = subparsers.add_parser("daemon", help="prefetch the next AIRAC cycle in the background and swap it in when it comes into effect")
+    daemon.add_argument("--sections", nargs="+", choices=list(config.SECTIONS), metavar="SECTION", help="only prefetch these sections")
+    daemon.add_argument("--poll", type=float, default=6.0, help="hours between checks for the next cycle")
+    daemon.add_argument("--max-concurrency", type=int, default=2, help="most page requests to have in flight at once")
+    daemon.add_argument("--base-url", default=BASE_URL, help="where the eAIP is published, laid out like the NATS eAIP")
+    daemon.add_argument("--sqlite", nargs="?", const=os.path.join(config.WORK_DIR, "aip.sqlite"), metavar="PATH", help="also save each cycle to an SQLite database")
+    daemon.add_argument("--country", default=config.COUNTRY_CODE, help="eAIP to prefetch")
+    daemon.add_argument("--once", action="store_true", help="check once and exit, eg when run from cron")
+
+    standin = subparsers.add_parser("standin", help="serve synthetic eAIP pages locally for load and scale testing")
+    standin.add_argument("--host", default="127.0.0.1")
+    standin.add_argument("--port", type=int, default=8000)
+    standin.add_argument("--scale", type=float, default=1.0, help="multiple of the size of the UK eAIP to generate")
+    for name in ("aerodromes", "navaids", "fixes", "airways", "airspaces", "areas"):
+        standin.add_argument(f"--{name}", type=int, help=f"number of {name} to generate, overrides --scale")
+    standin.add_argument("--latency", type=float, default=0.0, help="seconds to wait before answering each request")
+    standin.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 429 or 503")
+    standin.add_argument("--seed", type=int, default=0)
+    standin.add_argument("--country", default=config.COUNTRY_CODE, help="country code used in the page names and designators")
+
+    airac = subparsers.add_parser("airac", help="print the AIRAC cycle date and eAIP URL")
+    airac.add_argument("--cycle", default="current", help="'current', 'next' or a date (YYYY-MM-DD)")
+
+    return parser
+
 
 @logger.catch
-def main() -> None:
+def main(argv:list=None) -> None:
     """The main function"""
-    web_scrape = scraper.Webscrape()
-    web_scrape.run()
 
-    #verify_sector_file = verify.Verify()
-    #verify_sector_file.aerodrome_check()
+    args = build_parser().parse_args(argv)
+
+    if args.command == "airac":
+        kwargs = cycle_args(args)
+        cycle = Airac()
+        if kwargs.get('use_next'):
+            print(cycle.next_cycle())
+        else:
+            print(cycle.current_cycle(kwargs.get('date_in')))
+        print(cycle.url(**kwargs))
+    elif args.command == "daemon":
+        from .cache import ParseCache
+        from .daemon import CycleDaemon
+        from .store import Store
+
+        try:
+            check_base_url(args.base_url)
+        except ValueError as err:
+            sys.exit(f"Invalid --base-url: {err}")
+        store = Store(args.sqlite) if args.sqlite else None
+        cycle_daemon = CycleDaemon(
+            sections=args.sections,
+            poll_interval=args.poll * 3600,
+            max_concurrency=args.max_concurrency,
+            base_url=args.base_url,
+            cache=ParseCache(os.path.join(config.WORK_DIR, "Cache")),
+            store=store,
+            country=args.country
+            )
+        try:
+            if args.once:
+                cycle_daemon.tick()
+            else:
+                cycle_daemon.run_forever()
+        except KeyboardInterrupt:
+            cycle_daemon.stop()
+        finally:
+            if store is not None:
+                store.close()
+    elif args.command == "standin":
+        from .standin import StandIn, serve
+
+        standin = StandIn(
+            country=args.country,
+            scale=args.scale,
+            seed=args.seed,
+            aerodromes=args.aerodromes,
+            navaids=args.navaids,
+            fixes=args.fixes,
+            airways=args.airways,
+            airspaces=args.airspaces,
+            areas=args.areas
+            )
+        server = serve(standin, args.host, args.port, args.latency, args.error_rate)
+        logger.info("Scrape it with: scrape --no-render --base-url http://{}:{}/", args.host, server.server_port)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args.command == "verify":
+        from . import verify
+        from .store import Store
+
+        store = Store(args.sqlite) if args.sqlite else None
+        try:
+            verify_sector_file = verify.Verify(store, args.cycle)
+            if args.check == "aerodromes":
+                verify_sector_file.aerodrome_check()
+            else:
+                verify_sector_file.enr_4_4_check()
+        except FileNotFoundError as err:
+            # nothing to check against, say which section is missing rather than dumping a traceback
+            sys.exit(f"Unable to run the {args.check} check: {err}")
+        finally:
+            if store is not None:
+                store.close()
+    else:
+        # the scraper pulls in pandas and selenium so only import it when it is used
+        from . import scraper
+        from .cache import ParseCache
+        from .countries import parse_countries, scrape_countries
+        from .fetch import Fetcher
+        from .store import Store
+
+        if args.command is None:
+            # no sub-command given, scrape everything for the current cycle
+            with scraper.Webscrape() as web_scrape:
+                web_scrape.run()
+        else:
+            fetcher = Fetcher(max_concurrency=args.max_concurrency)
+            cache = None
+            if args.cache_size > 0:
+                cache = ParseCache(os.path.join(config.WORK_DIR, "Cache"), args.cache_size * 1024 * 1024)
+            try:
+                countries = parse_countries(args.country, args.base_url)
+            except ValueError as err:
+                sys.exit(f"Invalid --country or --base-url: {err}")
+            if len(countries) > 1:
+                outputs = scrape_countries(
+                    countries,
+                    args.sections,
+                    icao=args.icao,
+                    sqlite=args.sqlite,
+                    fetcher=fetcher,
+                    cache=cache,
+                    browsers=args.browsers,
+                    recycle_after=args.recycle_after,
+                    render=args.render,
+                    stream=args.stream,
+                    checkpoint_dir=args.checkpoint,
+                    **cycle_args(args)
+                    )
+                failed = [country for country in countries if country not in outputs]
+                if failed:
+                    # the others have been written, but anything running this needs to know they aren't all there
+                    sys.exit(f"Unable to scrape {', '.join(failed)}")
+                return
+            country, base_url = next(iter(countries.items()))
+            store = Store(args.sqlite) if args.sqlite else None
+            try:
+                with scraper.Webscrape(
+                        browsers=args.browsers,
+                        recycle_after=args.recycle_after,
+                        render=args.render,
+                        fetcher=fetcher,
+                        cache=cache,
+                        stream=args.stream,
+                        store=store,
+                        base_url=base_url,
+                        country=country,
+                        checkpoint_dir=args.checkpoint,
+                        **cycle_args(args)
+                        ) as web_scrape:
+                    web_scrape.run(args.sections, args.icao)
+            except Exception:
+                # logger.catch would log it and exit with 0, as if it had worked
+                logger.exception("Unable to scrape {}", country)
+                sys.exit(f"Unable to scrape {country}")
+            finally:
+                if store is not None:
+                    store.close()
 
 if __name__ == "__main__":
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
     logger.info("UK AIP Scraper Starting")
     main()
@@ -0,0 +1,129 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import asyncio
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+from .fetch import RETRY_STATUS, FetchError, Fetcher
+
+Page = namedtuple("Page", ["status", "data"])
+
+
+class AsyncFetcher:
+    '''Class to fetch eAIP pages with asyncio over a single shared keep-alive session.
+
+    Requests go through the concurrency limit, retries and backoff of the Fetcher given, so pages fetched this way and
+    pages fetched by its threads are throttled together.'''
+
+    def __init__(self, fetcher:Fetcher=None, keepalive:float=30.0):
+        if fetcher is None:
+            fetcher = Fetcher()
+        self.fetcher = fetcher
+        self.keepalive = keepalive
+        self.session = None
+        self.errors = ()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self) -> None:
+        """Start the shared client session"""
+
+        # aiohttp is only needed once something is fetched asynchronously
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit_per_host=self.fetcher.max_concurrency, keepalive_timeout=self.keepalive)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.fetcher.timeout))
+        self.errors = (aiohttp.ClientError, asyncio.TimeoutError)
+
+    async def close(self) -> None:
+        """Close the shared client session and any connections it holds"""
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def acquire(self) -> None:
+        """Wait for a free slot under the fetcher's concurrency limit without blocking the event loop"""
+
+        future = self.fetcher.acquire_async(asyncio.get_running_loop())
+        try:
+            await future
+        except asyncio.CancelledError:
+            self.fetcher.cancel_async(future)
+            raise
+
+    async def fetch(self, address:str) -> Page:
+        """Fetch a single page, retrying with backoff when the server pushes back.
+        Raises FetchError if the page still can't be fetched once the retries are used up"""
+
+        if self.session is None:
+            raise RuntimeError("The fetcher has not been opened")
+
+        fetcher = self.fetcher
+        attempt = 0
+        while True:
+            await self.acquire()
+            start = time.monotonic()
+            status = None
+            try:
+                async with self.session.get(address) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After")
+                    data = await response.read()
+            except self.errors as err:
+                error = err
+            finally:
+                fetcher.release()
+            latency = time.monotonic() - start
+
+            if status is not None and status not in RETRY_STATUS:
+                if fetcher.refused(status):
+                    raise FetchError(address, status)
+                fetcher.succeeded(latency)
+                logger.debug("{} {}", status, address)
+                return Page(status, data)
+
+            if status is None:
+                delay = fetcher.failed(address, attempt, latency, reason=repr(error))
+            else:
+                delay = fetcher.failed(address, attempt, latency, status, retry_after=retry_after)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def fetch_many(self, addresses:list) -> list:
+        """Fetch several pages at once in the order given, a page that couldn't be fetched is returned as its error
+        so one failure doesn't lose the rest of the batch"""
+
+        return await asyncio.gather(*(self.fetch(address) for address in addresses), return_exceptions=True)
+
+
+async def fetch_pages(addresses:list, fetcher:Fetcher=None) -> list:
+    """Fetch a batch of pages over one session"""
+
+    async with AsyncFetcher(fetcher) as async_fetcher:
+        return await async_fetcher.fetch_many(addresses)
+
+
+def run(coroutine):
+    """Run a coroutine to completion, on a thread of its own if an event loop is already running on this one"""
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
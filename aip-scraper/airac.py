@@ -5,6 +5,7 @@ UK AIP Scraper
 # Python Imports
 from datetime import date, timedelta
 from math import floor
+from urllib.parse import urlparse
 
 # 3rd Party Imports
 from loguru import logger
@@ -15,6 +16,21 @@ BASE_URL = "https://www.aurora.nats.co.uk/htmlAIP/Publications/"
 BASE_POST_STRING = "-AIRAC/html/eAIP/"
 
 
+def check_base_url(base_url:str) -> str:
+    """Check a base URL follows the NATS layout, where each cycle's pages are at
+    <base_url><cycle>-AIRAC/html/eAIP/<country>-<section>-en-GB.html. Only the form of the URL can be checked here, an
+    eAIP laid out any other way will fail when its pages are fetched"""
+
+    parts = urlparse(base_url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"{base_url} is not an http or https URL")
+    if not base_url.endswith("/") or parts.query or parts.fragment:
+        # the cycle is added straight onto the end
+        raise ValueError(f"{base_url} should be the directory the cycles are published in and end with a /")
+
+    return base_url
+
+
 class Airac:
     '''Class for general functions relating to AIRAC'''
 
@@ -41,10 +57,10 @@ class Airac:
 
         return number_of_cycles
 
-    def current_cycle(self) -> date:
-        """Return the date of the current AIRAC cycle"""
+    def current_cycle(self, date_in:str=None) -> date:
+        """Return the date of the current AIRAC cycle, or the one in effect on the given date"""
 
-        number_of_cycles = self.initialise()
+        number_of_cycles = self.initialise(date_in)
         number_of_days = number_of_cycles * self.cycle_days + 1
         current_cycle = self.base_date + timedelta(days=number_of_days)
         logger.info("Current AIRAC Cycle is: {}", current_cycle)
@@ -59,16 +75,16 @@ class Airac:
 
         return self.base_date + timedelta(days=number_of_days)
 
-    def url(self, use_next:bool=False) -> str:
+    def url(self, use_next:bool=False, date_in:str=None, base_url:str=BASE_URL) -> str:
         """Return a generated URL based on the AIRAC cycle start date"""
 
         if use_next:
             # if the 'use_next' variable is passed, generate a URL for the next AIRAC cycle
             base_date = self.next_cycle()
         else:
-            base_date = self.current_cycle()
+            base_date = self.current_cycle(date_in)
 
-        formatted_url = BASE_URL + str(base_date) + BASE_POST_STRING
+        formatted_url = base_url + str(base_date) + BASE_POST_STRING
         logger.debug(formatted_url)
 
         return formatted_url
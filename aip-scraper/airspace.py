@@ -0,0 +1,242 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import re
+from itertools import compress
+
+# 3rd Party Imports
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Local Imports
+from .functions import METRES_PER_NM
+
+# The same pattern as Geo.sct2dd, split into hemisphere, degrees, minutes and seconds so a whole column of locations can be converted at once
+SCT_LOCATION = r"([NS])([\d]{1,3})\.([\d]{1,2})\.([\d]{1,2}\.[\d]{1,3})\s([EW])([\d]{1,3})\.([\d]{1,2})\.([\d]{1,2}\.[\d]{1,3})"
+# Any line of text, with the location in it if it has one
+VERTEX_LOCATION = re.compile(r"^(?:[^\n]*?" + SCT_LOCATION + r")?[^\n]*$", re.MULTILINE)
+
+# The order of the tables returned by Webscrape.parse_enr02_data, the UIR is the same extent as the FIR so is left out
+ENR_02_TYPES = ["FIR", None, "CTA", "TMA", "ATZ"]
+
+
+def boundary_coords(boundaries:pd.Series) -> pd.DataFrame:
+    """Convert every vertex of every boundary string into decimal degrees in one go, keeping the index of the row it came from"""
+
+    points = boundaries.fillna("").astype(str)
+    if points.empty:
+        return pd.DataFrame({'lat': [], 'lon': []}, dtype=float)
+    text = "\n".join(points.tolist())
+    # single locations, like runway thresholds, don't need splitting up into vertices first
+    if "/" in text:
+        points = points.str.split("/").explode()
+        text = "\n".join(points.tolist())
+    # one regex pass over every vertex at once, a vertex that doesn't match comes back as a row of empty groups
+    matches = VERTEX_LOCATION.findall(text)
+    columns = list(zip(*matches)) if matches else [()] * 8
+    found = np.array(columns[0], dtype=object) != ""
+    count = int(found.sum())
+
+    def numbers(column:int) -> np.ndarray:
+        # float() over the matched strings is several times quicker than numpy converting an array of strings
+        return np.fromiter(map(float, compress(columns[column], found)), dtype=float, count=count)
+
+    lat = numbers(1) + numbers(2) / 60 + numbers(3) / 3600
+    lon = numbers(5) + numbers(6) / 60 + numbers(7) / 3600
+    lat = np.where(np.array(columns[0], dtype=object)[found] == "N", lat, -lat)
+    lon = np.where(np.array(columns[4], dtype=object)[found] == "E", lon, -lon)
+
+    return pd.DataFrame({'lat': lat, 'lon': lon}, index=points.index[found])
+
+
+class AirspaceGeometry:
+    '''Class to turn the ENR-2.1 boundaries into polygons, repair them and check how neighbouring volumes fit together'''
+
+    def __init__(self, enr_02:list):
+        # shapely and pyproj are slow to import so only load them when geometry is built
+        import shapely
+        from pyproj import Transformer
+
+        frames = []
+        for airspace_type, df_airspace in zip(ENR_02_TYPES, enr_02):
+            if airspace_type is None or df_airspace is None or df_airspace.empty:
+                continue
+            frames.append(pd.DataFrame({'type': airspace_type, 'name': df_airspace['name'].astype(str), 'boundary': df_airspace['boundary']}))
+        if frames:
+            self.volumes = pd.concat(frames, ignore_index=True)
+        else:
+            self.volumes = pd.DataFrame({'type': [], 'name': [], 'boundary': []}, dtype=object)
+
+        coords = boundary_coords(self.volumes['boundary'])
+        # areas and distances are worked out on an equal area projection centred on the data
+        centre_lat = float(coords['lat'].mean()) if len(coords) else 54.0
+        centre_lon = float(coords['lon'].mean()) if len(coords) else -3.0
+        self.transformer = Transformer.from_crs("EPSG:4326", f"+proj=laea +lat_0={centre_lat} +lon_0={centre_lon} +units=m", always_xy=True)
+        x, y = self.transformer.transform(coords['lon'].to_numpy(), coords['lat'].to_numpy())
+
+        # a ring needs at least three points, anything less can't be made into a polygon
+        counts = coords.groupby(level=0).size().reindex(self.volumes.index, fill_value=0)
+        self.volumes['vertices'] = counts.to_numpy()
+        usable = coords.index.map(counts).to_numpy() >= 3
+        indices = coords.index.to_numpy()[usable]
+
+        polygons = np.full(len(self.volumes), None, dtype=object)
+        if usable.any():
+            rings = shapely.linearrings(np.column_stack((x[usable], y[usable])), indices=indices)
+            polygons[np.unique(indices)] = shapely.polygons(rings)
+        self.volumes['polygon'] = polygons
+
+        self.validate()
+        logger.info("Built {} airspace polygons, {} could not be built and {} were repaired", int(self.built.sum()), int((~self.built).sum()), int(self.volumes['repaired'].sum()))
+
+    @property
+    def built(self) -> np.ndarray:
+        """Which volumes have a polygon"""
+
+        return self.volumes['polygon'].notna().to_numpy()
+
+    def validate(self) -> None:
+        """Check every polygon and repair any that are invalid, noting why they needed repairing"""
+
+        import shapely
+
+        polygons = self.volumes['polygon'].to_numpy().copy()
+        reasons = np.full(len(polygons), "", dtype=object)
+        reasons[~self.built] = "Fewer than three vertices"
+        repaired = np.zeros(len(polygons), dtype=bool)
+
+        built = np.nonzero(self.built)[0]
+        if len(built):
+            valid = shapely.is_valid(polygons[built])
+            invalid = built[~valid]
+            if len(invalid):
+                reasons[invalid] = shapely.is_valid_reason(polygons[invalid])
+                fixed = shapely.make_valid(polygons[invalid])
+                # make_valid can hand back lines or points along with the polygons, only the area is wanted
+                for position, geometry in zip(invalid, fixed):
+                    if shapely.get_type_id(geometry) not in (3, 6):
+                        parts = shapely.get_parts(geometry)
+                        parts = parts[np.isin(shapely.get_type_id(parts), (3, 6))]
+                        geometry = shapely.union_all(parts) if len(parts) else None
+                    polygons[position] = geometry
+                    repaired[position] = geometry is not None
+
+        self.volumes['polygon'] = polygons
+        self.volumes['reason'] = reasons
+        self.volumes['repaired'] = repaired
+
+    def invalid(self) -> pd.DataFrame:
+        """Volumes that couldn't be built or had to be repaired"""
+
+        return self.volumes.loc[self.volumes['reason'] != "", ['type', 'name', 'vertices', 'reason', 'repaired']].reset_index(drop=True)
+
+    def unions(self) -> pd.DataFrame:
+        """The combined extent of each type of airspace within each FIR, in NM squared"""
+
+        import shapely
+
+        volumes = self.volumes[self.built]
+        firs = volumes[volumes['type'] == "FIR"]
+        others = volumes[volumes['type'] != "FIR"]
+        rows = []
+        if firs.empty or others.empty:
+            return pd.DataFrame(rows, columns=['fir', 'type', 'volumes', 'area_nm2', 'polygon'])
+
+        # find the FIR each volume sits in from a point inside it
+        tree = shapely.STRtree(firs['polygon'].to_numpy())
+        points = shapely.point_on_surface(others['polygon'].to_numpy())
+        volume_positions, fir_positions = tree.query(points, predicate="within")
+        membership = pd.DataFrame({
+            'fir': firs['name'].to_numpy()[fir_positions],
+            'type': others['type'].to_numpy()[volume_positions],
+            'polygon': others['polygon'].to_numpy()[volume_positions]
+            })
+
+        for (fir, airspace_type), group in membership.groupby(['fir', 'type'], sort=True):
+            union = shapely.union_all(group['polygon'].to_numpy())
+            rows.append({'fir': fir, 'type': airspace_type, 'volumes': len(group), 'area_nm2': shapely.area(union) / METRES_PER_NM ** 2, 'polygon': union})
+
+        return pd.DataFrame(rows, columns=['fir', 'type', 'volumes', 'area_nm2', 'polygon'])
+
+    def neighbours(self, predicate:str, distance:float=None) -> list:
+        """Pairs of volumes of the same type that match a spatial predicate, each pair only once"""
+
+        import shapely
+
+        volumes = self.volumes[self.built]
+        polygons = volumes['polygon'].to_numpy()
+        types = volumes['type'].to_numpy()
+        tree = shapely.STRtree(polygons)
+        if distance is None:
+            left, right = tree.query(polygons, predicate=predicate)
+        else:
+            left, right = tree.query(polygons, predicate=predicate, distance=distance)
+        keep = (left < right) & (types[left] == types[right])
+
+        return [volumes.iloc[left[keep]], volumes.iloc[right[keep]]]
+
+    def overlaps(self, min_area:float=0.01) -> pd.DataFrame:
+        """Volumes of the same type that overlap each other by more than min_area NM squared"""
+
+        import shapely
+
+        first, second = self.neighbours("intersects")
+        areas = shapely.area(shapely.intersection(first['polygon'].to_numpy(), second['polygon'].to_numpy())) / METRES_PER_NM ** 2
+        report = pd.DataFrame({
+            'type': first['type'].to_numpy(),
+            'name_a': first['name'].to_numpy(),
+            'name_b': second['name'].to_numpy(),
+            'area_nm2': areas
+            })
+
+        return report[report['area_nm2'] > min_area].sort_values('area_nm2', ascending=False).reset_index(drop=True)
+
+    def gaps(self, tolerance:float=0.1, max_hole:float=1.0) -> pd.DataFrame:
+        """Volumes of the same type that nearly meet, within tolerance NM, plus any holes smaller than max_hole NM squared
+        left inside the union of a type. Both are usually a boundary point typed slightly differently in two places"""
+
+        import shapely
+
+        first, second = self.neighbours("dwithin", tolerance * METRES_PER_NM)
+        distances = shapely.distance(first['polygon'].to_numpy(), second['polygon'].to_numpy()) / METRES_PER_NM
+        report = pd.DataFrame({
+            'type': first['type'].to_numpy(),
+            'name_a': first['name'].to_numpy(),
+            'name_b': second['name'].to_numpy(),
+            'distance_nm': distances,
+            'area_nm2': 0.0
+            })
+        report = report[report['distance_nm'] > 0]
+
+        # slivers left between volumes that should share a boundary
+        holes = []
+        volumes = self.volumes[self.built]
+        for airspace_type, group in volumes[volumes['type'] != "FIR"].groupby('type', sort=True):
+            union = shapely.union_all(group['polygon'].to_numpy())
+            polygons = shapely.get_parts(union)
+            for polygon in polygons[shapely.get_type_id(polygons) == 3]:
+                rings = shapely.get_interior_ring(polygon, np.arange(shapely.get_num_interior_rings(polygon)))
+                if not len(rings):
+                    continue
+                areas = shapely.area(shapely.polygons(rings)) / METRES_PER_NM ** 2
+                for area in areas[areas <= max_hole]:
+                    holes.append({'type': airspace_type, 'name_a': "", 'name_b': "", 'distance_nm': 0.0, 'area_nm2': area})
+
+        if holes:
+            report = pd.concat([report, pd.DataFrame(holes)], ignore_index=True)
+
+        return report.reset_index(drop=True)
+
+    def to_lonlat(self, polygons) -> np.ndarray:
+        """Convert projected polygons back to longitude / latitude"""
+
+        import shapely
+
+        def inverse(coords):
+            lons, lats = self.transformer.transform(coords[:, 0], coords[:, 1], direction="INVERSE")
+            return np.column_stack((lons, lats))
+
+        return shapely.transform(np.asarray(polygons, dtype=object), inverse)
@@ -0,0 +1,136 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import numpy as np
+from loguru import logger
+
+# Local Imports
+from .functions import METRES_PER_NM
+from .tokenizer import ARC, CIRCLE, POINT
+
+
+def sct_locations(lat:np.ndarray, lon:np.ndarray) -> list:
+    """Format arrays of decimal degrees as SCT file locations, eg N051.28.39.00 W000.27.41.00"""
+
+    def parts(values):
+        hundredths = np.round(np.abs(values) * 360000).astype(np.int64)
+        degrees, hundredths = np.divmod(hundredths, 360000)
+        minutes, hundredths = np.divmod(hundredths, 6000)
+        seconds, hundredths = np.divmod(hundredths, 100)
+        return degrees.tolist(), minutes.tolist(), seconds.tolist(), hundredths.tolist()
+
+    lat_hemispheres = np.where(lat < 0, "S", "N").tolist()
+    lon_hemispheres = np.where(lon < 0, "W", "E").tolist()
+
+    # one flat template is around twice as quick as an f-string with unpacking over tens of thousands of vertices
+    template = "%s%03d.%02d.%02d.%02d %s%03d.%02d.%02d.%02d"
+
+    return [template % location for location in zip(lat_hemispheres, *parts(lat), lon_hemispheres, *parts(lon))]
+
+
+class AreaGeometry:
+    '''Class to assemble the ENR-5.1 area boundaries, with their arcs and circles, into vertex arrays in one pass.
+
+    The vertices of every area are held end to end in one array, area i being vertices[offsets[i]:offsets[i + 1]].'''
+
+    def __init__(self, areas:list, step:float=1.0):
+        # pyproj is slow to import so only load it when geometry is built
+        from pyproj import Geod
+
+        self.geod = Geod(ellps="WGS84")
+        self.step = step
+
+        # flatten every part of every boundary into one table, arcs take their ends from the points either side of them
+        elements = []
+        for area, parts in enumerate(areas):
+            points = [index for index, part in enumerate(parts) if part.kind == POINT]
+            for index, part in enumerate(parts):
+                if part.kind == POINT:
+                    elements.append((area, POINT, part.value[0], part.value[1], 0.0, True, np.nan, np.nan, np.nan, np.nan))
+                elif part.kind == ARC and points:
+                    start = parts[max([point for point in points if point < index], default=points[-1])].value
+                    end = parts[min([point for point in points if point > index], default=points[0])].value
+                    clockwise, radius, centre_lat, centre_lon = part.value
+                    elements.append((area, ARC, centre_lat, centre_lon, np.nan if radius is None else radius, clockwise, *start, *end))
+                elif part.kind == CIRCLE and part.value[0] is not None:
+                    radius, centre_lat, centre_lon = part.value
+                    elements.append((area, CIRCLE, centre_lat, centre_lon, radius, True, np.nan, np.nan, np.nan, np.nan))
+
+        if elements:
+            columns = list(zip(*elements))
+        else:
+            columns = [[] for _ in range(10)]
+        element_area = np.array(columns[0], dtype=np.int64)
+        kind = np.array(columns[1], dtype=object)
+        lat = np.array(columns[2], dtype=float)
+        lon = np.array(columns[3], dtype=float)
+        radius = np.array(columns[4], dtype=float) * METRES_PER_NM
+        clockwise = np.array(columns[5], dtype=bool)
+        start_lat, start_lon, end_lat, end_lon = (np.array(column, dtype=float) for column in columns[6:10])
+
+        # every point on every arc and circle is worked out together
+        is_arc = kind == ARC
+        start_azimuth, _, start_distance = self.geod.inv(lon[is_arc], lat[is_arc], start_lon[is_arc], start_lat[is_arc])
+        end_azimuth, _, end_distance = self.geod.inv(lon[is_arc], lat[is_arc], end_lon[is_arc], end_lat[is_arc])
+        sweep = np.where(clockwise[is_arc], (end_azimuth - start_azimuth) % 360, -((start_azimuth - end_azimuth) % 360))
+
+        # as in Geo.generate_semicircle the arc is drawn from its start vertex, the published radius is rounded so the
+        # vertices are seldom exactly on it, and the distance is eased over to the end so the arc meets its end vertex too
+        published = radius[is_arc]
+        off_radius = np.abs(published - start_distance) > 0.1 * METRES_PER_NM
+        if off_radius.any():
+            logger.debug("{} arcs start more than 0.1 NM from their published radius", int(off_radius.sum()))
+        radius[is_arc] = start_distance
+        radius_change = np.zeros(len(kind))
+        radius_change[is_arc] = end_distance - start_distance
+
+        azimuth_start = np.zeros(len(kind))
+        azimuth_sweep = np.zeros(len(kind))
+        azimuth_start[is_arc] = start_azimuth
+        azimuth_sweep[is_arc] = sweep
+        azimuth_sweep[kind == CIRCLE] = 360.0
+
+        # arcs only add the points between their ends, which are vertices in their own right
+        steps = np.maximum(np.ceil(np.abs(azimuth_sweep) / step), 1).astype(np.int64)
+        first = np.where(is_arc, 1, 0)
+        last = np.where(kind == POINT, 0, steps - 1)
+        counts = np.maximum(last - first + 1, 0)
+
+        element = np.repeat(np.arange(len(kind)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + first[element]
+        curved = kind[element] != POINT
+        vertex_lat = lat[element].copy()
+        vertex_lon = lon[element].copy()
+        if curved.any():
+            curve = element[curved]
+            azimuth = azimuth_start[curve] + azimuth_sweep[curve] * k[curved] / steps[curve]
+            distance = radius[curve] + radius_change[curve] * k[curved] / steps[curve]
+            curve_lon, curve_lat, _ = self.geod.fwd(lon[curve], lat[curve], azimuth, distance)
+            vertex_lat[curved] = curve_lat
+            vertex_lon[curved] = curve_lon
+
+        self.vertices = np.column_stack((vertex_lat, vertex_lon))
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(element_area[element], minlength=len(areas)))))
+        logger.debug("Assembled {} vertices for {} areas", len(self.vertices), len(areas))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def area(self, index:int) -> np.ndarray:
+        """The vertices of one area as rows of latitude and longitude"""
+
+        return self.vertices[self.offsets[index]:self.offsets[index + 1]]
+
+    def boundaries(self) -> list:
+        """Each area's boundary in the same format as ENR-2.1, NONE where an area has no boundary"""
+
+        locations = sct_locations(self.vertices[:, 0], self.vertices[:, 1])
+
+        return [
+            "/".join(locations[start:end]) if end > start else "NONE"
+            for start, end in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())
+            ]
@@ -0,0 +1,181 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+
+# Handed to threads waiting for a browser once the pool has been closed
+CLOSED = None
+
+
+class BrowserPool:
+    '''Class to manage a pool of reusable headless browsers for pages that need rendering'''
+
+    def __init__(self, size:int=1, recycle_after:int=100, executable_path:str="chromedriver.exe", driver_factory=None):
+        if size < 1:
+            raise ValueError("The browser pool needs at least one browser")
+        self.size = size
+        self.recycle_after = recycle_after
+        self.executable_path = executable_path
+        # anything that makes an object with get(), page_source and quit(), a headless Chrome if not given
+        self.driver_factory = driver_factory or self.start_chrome
+
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.started = 0
+        self.drivers = set()
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start_chrome(self):
+        """Start a new headless Chrome"""
+
+        # selenium is only needed once we actually start rendering pages
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        options = Options()
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1200")
+
+        return webdriver.Chrome(service=Service(executable_path=self.executable_path), options=options)
+
+    def start_driver(self):
+        """Start a new headless browser"""
+
+        driver = self.driver_factory()
+        logger.debug("Started browser {} of {}", len(self.drivers) + 1, self.size)
+
+        return driver
+
+    def acquire(self) -> list:
+        """Take a browser from the pool, starting one if the pool isn't full yet"""
+
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("The browser pool has been closed")
+            start_new = self.idle.empty() and self.started < self.size
+            if start_new:
+                self.started += 1
+
+        if start_new:
+            try:
+                driver = self.start_driver()
+            except Exception:
+                with self.lock:
+                    self.started -= 1
+                raise
+            with self.lock:
+                if not self.closed:
+                    self.drivers.add(driver)
+                    return [driver, 0]
+            # the pool was closed while the browser was starting
+            self.quit_driver(driver)
+            raise RuntimeError("The browser pool has been closed")
+
+        # the pool is full so wait for another thread to hand one back
+        entry = self.idle.get()
+        if entry is CLOSED:
+            # pass it on so every other waiting thread wakes up too
+            self.idle.put(CLOSED)
+            raise RuntimeError("The browser pool has been closed")
+
+        return entry
+
+    def release(self, entry:list) -> None:
+        """Hand a browser back to the pool, recycling it if it has loaded enough pages"""
+
+        driver, pages = entry
+        if pages >= self.recycle_after:
+            logger.debug("Recycling browser after {} pages", pages)
+            self.quit_driver(driver)
+            with self.lock:
+                if self.closed:
+                    return
+                self.started -= 1
+            # start the replacement straight away so waiting threads aren't left blocked
+            try:
+                self.release(self.acquire())
+            except RuntimeError:
+                # closed while the replacement was starting
+                pass
+            return
+
+        with self.lock:
+            if not self.closed:
+                self.idle.put(entry)
+                return
+        self.quit_driver(driver)
+
+    def quit_driver(self, driver) -> None:
+        """Close a single browser"""
+
+        with self.lock:
+            self.drivers.discard(driver)
+        try:
+            driver.quit()
+        except Exception as err: # pylint: disable=broad-except
+            logger.warning("Unable to close browser: {}", err)
+
+    def render(self, address:str) -> str:
+        """Load the given address in a browser and return the rendered page source"""
+
+        entry = self.acquire()
+        try:
+            entry[0].get(address)
+            source = entry[0].page_source
+        finally:
+            entry[1] += 1
+            self.release(entry)
+
+        return source
+
+    def render_many(self, addresses, window:int=None):
+        """Render several addresses at once, yielding the page sources in the order given. The addresses can be any
+        iterable, only window of them are taken and rendered ahead of the one being handed over"""
+
+        window = window or self.size * 2
+        addresses = iter(addresses)
+        futures = deque()
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            try:
+                for address in islice(addresses, window):
+                    futures.append(executor.submit(self.render, address))
+                while futures:
+                    source = futures.popleft().result()
+                    for address in islice(addresses, 1):
+                        futures.append(executor.submit(self.render, address))
+                    yield source
+            finally:
+                # if the reader stops early, don't render the pages that haven't been started
+                for future in futures:
+                    future.cancel()
+
+    def close(self) -> None:
+        """Close every browser in the pool, waking any thread waiting for one"""
+
+        with self.lock:
+            self.closed = True
+            while not self.idle.empty():
+                self.idle.get_nowait()
+            self.idle.put(CLOSED)
+            drivers = list(self.drivers)
+            self.started = 0
+        for driver in drivers:
+            self.quit_driver(driver)
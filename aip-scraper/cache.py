@@ -0,0 +1,115 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+
+
+def parser_version(*funcs) -> str:
+    """Fingerprint of the source code of the given parsing functions, so any change to them invalidates the cache"""
+
+    digest = hashlib.sha256()
+    for func in funcs:
+        digest.update(inspect.getsource(func).encode("utf-8"))
+
+    return digest.hexdigest()[:16]
+
+
+def content_hash(source) -> str:
+    """Hash of a page's content"""
+
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+
+    return hashlib.sha256(source).hexdigest()
+
+
+class ParseCache:
+    '''Class to store parsed rows on disk, keyed by parser version and page content'''
+
+    def __init__(self, directory:str, max_bytes:int=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+        # work out how much is already on disk
+        self.size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".pkl"))
+
+    def path(self, version:str, page_hash:str) -> str:
+        """File name for a cache entry"""
+
+        return os.path.join(self.directory, f"{version}-{page_hash}.pkl")
+
+    def get(self, version:str, page_hash:str):
+        """Return the cached rows for this page, or None if they aren't cached"""
+
+        path = self.path(version, page_hash)
+        try:
+            with open(path, "rb") as entry:
+                rows = pickle.load(entry)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        # touch the entry so it counts as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self.lock:
+            self.hits += 1
+
+        return rows
+
+    def put(self, version:str, page_hash:str, rows) -> None:
+        """Store the rows parsed from this page"""
+
+        path = self.path(version, page_hash)
+        data = pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as entry:
+            entry.write(data)
+        with self.lock:
+            if os.path.exists(path):
+                self.size -= os.path.getsize(path)
+            os.replace(temp_path, path)
+            self.size += len(data)
+            if self.size > self.max_bytes:
+                self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits within its size limit"""
+
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".pkl")),
+            key=lambda entry: entry.stat().st_mtime
+            )
+        for entry in entries:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.size -= size
+            logger.debug("Evicted {} from the parse cache", entry.name)
+
+    def stats(self) -> dict:
+        """How well the cache is doing"""
+
+        return {'hits': self.hits, 'misses': self.misses, 'bytes': self.size}
@@ -0,0 +1,115 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+
+
+class Checkpoint:
+    '''Class to record each page and section as it is finished so an interrupted run can pick up where it stopped.
+
+    Unlike the parse cache, pages are keyed on their address rather than their content so a resumed run doesn't
+    need to fetch them again. A checkpoint only ever belongs to one country and cycle published at one base URL, and
+    pages and sections are keyed on the version of the parsers so nothing from before a parser changed is resumed.'''
+
+    def __init__(self, directory:str, cycle:str, country:str, base_url:str=""):
+        # a stand-in or mirror publishes the same country and cycle at another address, often with different pages
+        self.path = os.path.join(directory, f"{country}-{cycle}-{self.key(base_url)[:12]}")
+        self.lock = threading.Lock()
+        self.resumed_pages = 0
+        self.resumed_stages = 0
+        os.makedirs(os.path.join(self.path, "pages"), exist_ok=True)
+        os.makedirs(os.path.join(self.path, "stages"), exist_ok=True)
+
+        pages = len(os.listdir(os.path.join(self.path, "pages")))
+        stages = len(os.listdir(os.path.join(self.path, "stages")))
+        if pages or stages:
+            logger.info("Resuming from {} finished pages and {} finished sections in {}", pages, stages, self.path)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """File name safe key for a page or stage"""
+
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+
+    def read(self, kind:str, key:str):
+        """Return what was saved under the key, or None if nothing was"""
+
+        try:
+            with open(os.path.join(self.path, kind, key + ".pkl"), "rb") as entry:
+                return pickle.load(entry)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def write(self, kind:str, key:str, value) -> None:
+        """Save a value under the key, replacing the file in one step so a crash can't leave half of one behind"""
+
+        path = os.path.join(self.path, kind, key + ".pkl")
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as entry:
+            pickle.dump(value, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            entry.flush()
+            os.fsync(entry.fileno())
+        os.replace(temp_path, path)
+
+    def has_page(self, version:str, uri:str, args:tuple) -> bool:
+        """Has a page been parsed by an earlier run?"""
+
+        return os.path.exists(os.path.join(self.path, "pages", self.key(version, uri, args) + ".pkl"))
+
+    def page(self, version:str, uri:str, args:tuple):
+        """The rows parsed from a page by an earlier run, or None"""
+
+        rows = self.read("pages", self.key(version, uri, args))
+        if rows is not None:
+            with self.lock:
+                self.resumed_pages += 1
+
+        return rows
+
+    def save_page(self, version:str, uri:str, args:tuple, rows) -> None:
+        """Record the rows parsed from a page"""
+
+        self.write("pages", self.key(version, uri, args), rows)
+
+    def stage(self, version:str, name:str, *args):
+        """The output of a section finished by an earlier run, or None"""
+
+        output = self.read("stages", self.key(version, name, args))
+        if output is not None:
+            logger.info("Resuming {} from the checkpoint", name)
+            with self.lock:
+                self.resumed_stages += 1
+
+        return output
+
+    def has_stage(self, version:str, name:str, *args) -> bool:
+        """Has a section been finished by an earlier run?"""
+
+        return os.path.exists(os.path.join(self.path, "stages", self.key(version, name, args) + ".pkl"))
+
+    def save_stage(self, version:str, name:str, output, *args) -> None:
+        """Record the output of a finished section"""
+
+        self.write("stages", self.key(version, name, args), output)
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the run it belongs to has finished"""
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        logger.debug("Removed checkpoint {}", self.path)
+
+    def stats(self) -> dict:
+        """How much was picked up from an earlier run"""
+
+        return {'pages': self.resumed_pages, 'stages': self.resumed_stages}
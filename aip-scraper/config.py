@@ -7,11 +7,22 @@ This contains global imports and global variables
 import os
 
 # 3rd Party Imports
-from loguru import logger
 
 # Local Imports
 
 WORK_DIR = os.path.dirname(__file__)
 COUNTRY_CODE = "EG"
 
-logger.info("Working directory is {}", WORK_DIR)
+# Each section of the eAIP that can be scraped along with the sections it needs to be run first
+SECTIONS = {
+    "AD-0.1": [],
+    "AD-2": ["AD-0.1"],
+    "ENR-1.6": ["AD-0.1"],
+    "ENR-2.1": [],
+    "ENR-3.1": [],
+    "ENR-3.3": [],
+    "ENR-3.5": [],
+    "ENR-4.1": [],
+    "ENR-4.4": [],
+    "ENR-5.1": [],
+}
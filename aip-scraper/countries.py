@@ -0,0 +1,108 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+from . import config
+from .airac import BASE_URL, check_base_url
+from .browser import BrowserPool
+from .fetch import Fetcher
+
+
+def parse_countries(specs:list, base_url:str=BASE_URL) -> dict:
+    """Turn a list of 'EG' or 'EI=https://...' strings into country codes and the base URL of their eAIP, which has
+    to follow the NATS layout, see check_base_url"""
+
+    countries = {}
+    for spec in specs:
+        code, _, url = spec.partition("=")
+        code = code.strip().upper()
+        if not code.isalpha():
+            raise ValueError(f"Invalid country code {code}")
+        countries[code] = check_base_url(url.strip() or base_url)
+
+    return countries
+
+
+def country_store_path(path:str, country:str) -> str:
+    """Give each country its own database, the tables are keyed by cycle and position and would clash otherwise"""
+
+    root, ext = os.path.splitext(path)
+
+    return f"{root}-{country}{ext}"
+
+
+def scrape_countries(
+        countries:dict,
+        sections:list=None,
+        icao:list=None,
+        output_dir:str=None,
+        sqlite:str=None,
+        fetcher:Fetcher=None,
+        cache=None,
+        browsers:int=1,
+        recycle_after:int=100,
+        render:bool=True,
+        stream:bool=False,
+        checkpoint_dir:str=None,
+        **cycle_kwargs
+        ) -> dict:
+    """Scrape several countries' eAIPs at once, sharing one fetcher, parse cache and browser pool between them.
+    Each country's CSVs are written to its own directory under output_dir, and each keeps whichever of the icao
+    aerodromes are in its own AD-1. A country that fails is logged and left out of the result, so the others are kept"""
+
+    # the scraper pulls in pandas and selenium so only import it when it is used
+    from .scraper import Webscrape
+    from .store import Store
+
+    base_dir = output_dir or f"{config.WORK_DIR}\\DataFrames\\"
+    if fetcher is None:
+        fetcher = Fetcher()
+    browser = BrowserPool(browsers, recycle_after)
+
+    def scrape(country:str, base_url:str) -> dict:
+        full_dir = os.path.join(base_dir, country) + os.sep
+        os.makedirs(full_dir, exist_ok=True)
+        # an SQLite connection can only be used from the thread that opened it
+        store = Store(country_store_path(sqlite, country)) if sqlite else None
+        try:
+            with Webscrape(
+                    render=render,
+                    fetcher=fetcher,
+                    cache=cache,
+                    stream=stream,
+                    store=store,
+                    base_url=base_url,
+                    country=country,
+                    browser=browser,
+                    checkpoint_dir=checkpoint_dir,
+                    **cycle_kwargs
+                    ) as web_scrape:
+                return web_scrape.run(sections, icao, output_dir=full_dir)
+        finally:
+            if store is not None:
+                store.close()
+
+    outputs = {}
+    try:
+        with ThreadPoolExecutor(max_workers=len(countries) or 1) as executor:
+            futures = {country: executor.submit(scrape, country, base_url) for country, base_url in countries.items()}
+            for country, future in futures.items():
+                try:
+                    outputs[country] = future.result()
+                except Exception:
+                    # one eAIP being unavailable shouldn't lose the others
+                    logger.exception("Unable to scrape {}", country)
+    finally:
+        browser.close()
+
+    logger.info("Scraped {} of {} countries, fetcher {}", len(outputs), len(countries), fetcher.stats())
+
+    return outputs
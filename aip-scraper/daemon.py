@@ -0,0 +1,264 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+
+# 3rd Party Imports
+import urllib3
+from loguru import logger
+
+# Local Imports
+from . import config
+from .airac import BASE_URL, Airac
+from .fetch import Fetcher
+
+COMPLETE_MARKER = "complete"
+CYCLE_FILE = "cycle.txt"
+# Names the cycle in effect, in the staging directory
+CURRENT_FILE = "current.txt"
+
+
+def lower_priority(increment:int=10) -> None:
+    """Run this process at a lower priority so a background scrape doesn't get in the way of anything else"""
+
+    # os.nice is only available on unix
+    if hasattr(os, "nice"):
+        try:
+            os.nice(increment)
+        except OSError as err:
+            logger.warning("Unable to lower the process priority: {}", err)
+
+
+class CycleDaemon:
+    '''Class to scrape the next AIRAC cycle as soon as it is published and swap it in on its effective date.
+
+    Each cycle is scraped into a directory of its own under the staging directory. A pointer file there names the cycle
+    in effect and is replaced in one step, which works the same on Windows, where links to directories need extra rights
+    and can't be replaced in one step. The live output directory is then swapped for a copy of the cycle.'''
+
+    def __init__(
+            self,
+            sections:list=None,
+            poll_interval:float=6 * 3600,
+            max_concurrency:int=2,
+            base_url:str=BASE_URL,
+            output_dir:str=None,
+            staging_dir:str=None,
+            cache=None,
+            store=None,
+            country:str=config.COUNTRY_CODE,
+            checkpoint_dir:str=None
+            ):
+        self.sections = sections
+        self.poll_interval = poll_interval
+        self.max_concurrency = max_concurrency
+        self.base_url = base_url
+        self.output_dir = output_dir or f"{config.WORK_DIR}\\DataFrames\\"
+        self.staging_dir = staging_dir or os.path.join(config.WORK_DIR, "Staging")
+        self.cache = cache
+        self.store = store
+        self.country = country
+        # kept apart from the scrape command's checkpoints, so a manual run neither resumes from nor clears the daemon's
+        self.checkpoint_dir = checkpoint_dir or os.path.join(config.WORK_DIR, "DaemonCheckpoints")
+        self.airac = Airac()
+        self.stopped = threading.Event()
+        self.lowered = False
+
+    def staging_path(self, cycle:date) -> str:
+        """Where a cycle is scraped to before it comes into effect"""
+
+        return os.path.join(self.staging_dir, str(cycle)) + os.sep
+
+    def staged_cycles(self) -> list:
+        """Cycles that have been scraped completely, including the one in effect, oldest first"""
+
+        if not os.path.isdir(self.staging_dir):
+            return []
+
+        cycles = []
+        for name in os.listdir(self.staging_dir):
+            try:
+                cycle = date.fromisoformat(name)
+            except ValueError:
+                continue
+            if os.path.exists(os.path.join(self.staging_dir, name, COMPLETE_MARKER)):
+                cycles.append(cycle)
+
+        return sorted(cycles)
+
+    def promoted_cycle(self) -> date:
+        """The cycle in effect, if one has been promoted"""
+
+        return self.read_cycle(os.path.join(self.staging_dir, CURRENT_FILE))
+
+    def live_cycle(self) -> date:
+        """The cycle the live outputs are from, if it is known"""
+
+        return self.read_cycle(self.output_dir + CYCLE_FILE)
+
+    @staticmethod
+    def read_cycle(path:str) -> date:
+        """Read the cycle written to a file"""
+
+        try:
+            with open(path, "r", encoding="utf-8") as cycle_file:
+                return date.fromisoformat(cycle_file.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def current_dir(self) -> str:
+        """The staging directory of the cycle in effect, anything reading several outputs can read them from here to
+        be sure they all come from the same cycle"""
+
+        cycle = self.promoted_cycle()
+
+        return None if cycle is None else self.staging_path(cycle)
+
+    def is_published(self, cycle:date) -> bool:
+        """Has the eAIP for this cycle been published yet?"""
+
+        address = self.airac.url(date_in=str(cycle), base_url=self.base_url) + self.country + "-AD-0.1-en-GB.html"
+        try:
+            response = Fetcher(max_concurrency=1, retries=2).fetch(address)
+        except urllib3.exceptions.HTTPError as err:
+            logger.warning("Unable to check whether the {} cycle has been published: {}", cycle, err)
+            return False
+
+        return response.status == 200
+
+    def prepare(self, cycle:date) -> None:
+        """Scrape a cycle into its staging directory"""
+
+        # the scraper pulls in pandas and selenium so only import it when it is used
+        from .scraper import Webscrape
+
+        path = self.staging_path(cycle)
+        # anything left over is from a run that didn't finish, the checkpoint lets it carry on from where it stopped
+        os.makedirs(path, exist_ok=True)
+
+        logger.info("Prefetching the {} cycle into {}", cycle, path)
+        fetcher = Fetcher(max_concurrency=self.max_concurrency, initial_concurrency=1)
+        with Webscrape(date_in=str(cycle), render=False, fetcher=fetcher, cache=self.cache, store=self.store, base_url=self.base_url, country=self.country, checkpoint_dir=self.checkpoint_dir) as web_scrape:
+            web_scrape.run(self.sections, output_dir=path)
+
+        # the cycle file travels with the outputs so the two can never disagree
+        with open(path + CYCLE_FILE, "w", encoding="utf-8") as cycle_file:
+            cycle_file.write(str(cycle))
+        # only a complete scrape is ever promoted
+        with open(path + COMPLETE_MARKER, "w", encoding="utf-8") as marker:
+            marker.write(str(cycle))
+        logger.success("The {} cycle is ready to be promoted when it comes into effect", cycle)
+
+    def promote(self, cycle:date) -> None:
+        """Switch over to a staged cycle in one step, then swap the live outputs over to it"""
+
+        managed = self.promoted_cycle() is not None
+        # copy the outputs out first so nothing has changed if this fails part way through
+        incoming = self.copy_out(cycle)
+
+        # replacing a file is a single step on Windows as well as unix, the cycle has been promoted once it is done
+        pointer = os.path.join(self.staging_dir, CURRENT_FILE)
+        with open(pointer + ".tmp", "w", encoding="utf-8") as pointer_file:
+            pointer_file.write(str(cycle))
+        os.replace(pointer + ".tmp", pointer)
+        logger.success("Promoted the {} cycle", cycle)
+
+        self.swap_in(incoming, managed)
+
+        # older cycles are only removed once nothing points at them
+        for older in self.staged_cycles():
+            if older < cycle:
+                shutil.rmtree(self.staging_path(older), ignore_errors=True)
+
+    def copy_out(self, cycle:date) -> str:
+        """Copy a staged cycle next to the live outputs, ready to be swapped in"""
+
+        incoming = self.output_dir.rstrip("\\/") + ".new"
+        shutil.rmtree(incoming, ignore_errors=True)
+        shutil.copytree(self.staging_path(cycle), incoming)
+
+        return incoming
+
+    def swap_in(self, incoming:str, managed:bool=True) -> None:
+        """Swap the live outputs for a copy made by copy_out. Each file is from one cycle or the other, never a mix"""
+
+        live = self.output_dir.rstrip("\\/")
+        outgoing = live + ".old"
+        if os.path.isdir(live):
+            if not managed:
+                # outputs from before the daemon looked after them, keep them out of the way rather than lose them
+                outgoing = os.path.join(self.staging_dir, f"unmanaged-{datetime.now():%Y%m%d%H%M%S}")
+                logger.info("Moved the existing outputs in {} to {}", live, outgoing)
+            else:
+                shutil.rmtree(outgoing, ignore_errors=True)
+            os.rename(live, outgoing)
+        os.rename(incoming, live)
+        if managed:
+            shutil.rmtree(outgoing, ignore_errors=True)
+        logger.info("The outputs in {} are from the {} cycle", self.output_dir, self.live_cycle())
+
+    def tick(self, today:date=None) -> None:
+        """Promote anything that has come into effect, then prefetch the next cycle if it has been published"""
+
+        if not self.lowered:
+            lower_priority()
+            self.lowered = True
+        if today is None:
+            today = date.today()
+
+        promoted = self.promoted_cycle()
+        for cycle in self.staged_cycles():
+            if promoted is not None and cycle < promoted:
+                # superseded without ever being promoted
+                shutil.rmtree(self.staging_path(cycle), ignore_errors=True)
+            elif cycle <= today and (promoted is None or cycle > promoted):
+                self.promote(cycle)
+                promoted = cycle
+        if promoted is not None and self.live_cycle() != promoted:
+            # the last promotion stopped before the live outputs were swapped over
+            logger.info("Finishing the swap of the live outputs to the {} cycle", promoted)
+            self.swap_in(self.copy_out(promoted))
+
+        next_cycle = self.airac.current_cycle(str(today + timedelta(days=self.airac.cycle_days)))
+        if next_cycle in self.staged_cycles() or (promoted is not None and next_cycle <= promoted):
+            logger.debug("The {} cycle has already been prepared", next_cycle)
+            return
+        if not self.is_published(next_cycle):
+            logger.info("The {} cycle hasn't been published yet", next_cycle)
+            return
+
+        try:
+            self.prepare(next_cycle)
+        except Exception:
+            # try again at the next poll, the live outputs haven't been touched
+            logger.exception("Unable to prefetch the {} cycle", next_cycle)
+
+    def next_wait(self) -> float:
+        """Seconds until the next poll, or sooner if a staged cycle comes into effect before then"""
+
+        wait = self.poll_interval
+        upcoming = [cycle for cycle in self.staged_cycles() if cycle > date.today()]
+        if upcoming:
+            until = (datetime.combine(upcoming[0], datetime.min.time()) - datetime.now()).total_seconds()
+            wait = min(wait, max(until + 1, 1.0))
+
+        return wait
+
+    def run_forever(self) -> None:
+        """Poll until stopped"""
+
+        logger.info("Polling for the next AIRAC cycle every {:.1f} hours", self.poll_interval / 3600)
+        while True:
+            self.tick()
+            if self.stopped.wait(self.next_wait()):
+                break
+
+    def stop(self) -> None:
+        """Stop polling"""
+
+        self.stopped.set()
@@ -0,0 +1,288 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd Party Imports
+import urllib3
+from loguru import logger
+
+# Local Imports
+
+# Responses that mean the server wants us to slow down, or is having a moment, and are worth retrying
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class FetchError(urllib3.exceptions.HTTPError):
+    '''Raised when a page can't be fetched, either after running out of retries or because the server refused it'''
+
+    def __init__(self, address:str, status:int=None, reason:str=None):
+        self.address = address
+        self.status = status
+        super().__init__(f"Unable to fetch {address}: {reason or status}")
+
+
+class Fetcher:
+    '''Class to fetch eAIP pages, adapting how many requests are in flight to how the server copes'''
+
+    def __init__(
+            self,
+            max_concurrency:int=16,
+            min_concurrency:int=1,
+            initial_concurrency:int=2,
+            target_latency:float=2.0,
+            retries:int=5,
+            backoff:float=0.5,
+            timeout:float=30.0
+            ):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.target_latency = target_latency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        # one shared pool so connections are reused between pages
+        self.http = urllib3.PoolManager(
+            maxsize=max_concurrency,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=False
+            )
+
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.in_flight = 0
+        self.waiting = 0
+        self.queued = 0
+        # coroutines waiting for a slot, each as its event loop and the future to resolve once it has one
+        self.async_waiters = deque()
+        self.completed = deque()
+        self.requests = 0
+        self.errors = 0
+        self.retried = 0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Wait for a free slot under the current concurrency limit"""
+
+        with self.condition:
+            self.waiting += 1
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.waiting -= 1
+            self.in_flight += 1
+
+    def acquire_async(self, loop):
+        """A future on the given event loop that resolves once a slot has been taken for it.
+        Coroutines are given slots in the order they ask, as soon as one is handed back"""
+
+        future = loop.create_future()
+        with self.condition:
+            if not self.async_waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                future.set_result(True)
+            else:
+                self.waiting += 1
+                self.async_waiters.append((loop, future))
+
+        return future
+
+    def cancel_async(self, future) -> None:
+        """Stop waiting for a slot, handing it straight back if one had already been taken for it"""
+
+        with self.condition:
+            for waiter in self.async_waiters:
+                if waiter[1] is future:
+                    self.async_waiters.remove(waiter)
+                    self.waiting -= 1
+                    return
+        if future.done() and not future.cancelled():
+            # the slot arrived just as the coroutine was cancelled
+            self.give_back()
+        # otherwise the slot is still on its way to the event loop and slot_taken hands it back
+
+    def hand_over(self) -> None:
+        """Give any free slots to the coroutines that have waited longest, holding the condition"""
+
+        while self.async_waiters and self.in_flight < int(self.limit):
+            loop, future = self.async_waiters.popleft()
+            self.waiting -= 1
+            self.in_flight += 1
+            try:
+                loop.call_soon_threadsafe(self.slot_taken, future)
+            except RuntimeError:
+                # the event loop has closed so nothing is waiting any more
+                self.in_flight -= 1
+
+    def slot_taken(self, future) -> None:
+        """Wake the coroutine a slot was taken for, runs on its event loop"""
+
+        if future.done():
+            # it was cancelled while the slot was on its way
+            self.give_back()
+        else:
+            future.set_result(True)
+
+    def give_back(self) -> None:
+        """Hand back a slot that was never used for a request"""
+
+        with self.condition:
+            self.in_flight -= 1
+            self.hand_over()
+            self.condition.notify_all()
+
+    def release(self) -> None:
+        """Hand a slot back"""
+
+        with self.condition:
+            self.in_flight -= 1
+            self.requests += 1
+            self.completed.append(time.monotonic())
+            self.hand_over()
+            self.condition.notify_all()
+
+    def increase(self) -> None:
+        """Additive increase, roughly one extra request in flight per round of requests"""
+
+        with self.condition:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.hand_over()
+            self.condition.notify_all()
+
+    def decrease(self, latency:float) -> None:
+        """Multiplicative decrease, at most once per round trip so one burst of errors only counts once"""
+
+        with self.condition:
+            now = time.monotonic()
+            if now - self.last_decrease < latency:
+                return
+            self.last_decrease = now
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            logger.debug("Concurrency reduced to {}", int(self.limit))
+
+    def succeeded(self, latency:float) -> None:
+        """Adjust the concurrency limit after a response the server coped with"""
+
+        if latency > self.target_latency:
+            self.decrease(latency)
+        else:
+            self.increase()
+
+    def failed(self, address:str, attempt:int, latency:float, status:int=None, reason:str=None, retry_after:str=None) -> float:
+        """Count a failed attempt and return how long to wait before the next one, raising once the retries are used up"""
+
+        with self.condition:
+            self.errors += 1
+        self.decrease(latency)
+        if attempt >= self.retries:
+            logger.error("Giving up on {} after {} attempts, last response {}", address, attempt + 1, reason or status)
+            raise FetchError(address, status, reason)
+
+        # exponential backoff with jitter, unless the server has told us how long to wait
+        delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        logger.warning("Received {} for {}, retrying in {:.1f}s", reason or f"a {status} response", address, delay)
+        with self.condition:
+            self.retried += 1
+
+        return delay
+
+    @staticmethod
+    def refused(status:int) -> bool:
+        """Is this a response that won't get any better by retrying? A 404 is left for the caller as a missing page"""
+
+        return status not in RETRY_STATUS and status != 404 and not 200 <= status < 300
+
+    def fetch(self, address:str, preload_content:bool=True) -> urllib3.HTTPResponse:
+        """Fetch a single page, retrying with backoff when the server pushes back, without preloading the body can be streamed.
+        Raises FetchError if the page still can't be fetched once the retries are used up"""
+
+        attempt = 0
+        while True:
+            self.acquire()
+            start = time.monotonic()
+            try:
+                response = self.http.request("GET", address, preload_content=preload_content)
+            except urllib3.exceptions.HTTPError as err:
+                response = None
+                error = err
+            finally:
+                self.release()
+            latency = time.monotonic() - start
+
+            if response is not None and response.status not in RETRY_STATUS:
+                if self.refused(response.status):
+                    if not preload_content:
+                        response.drain_conn()
+                        response.release_conn()
+                    raise FetchError(address, response.status)
+                self.succeeded(latency)
+                return response
+
+            if response is None:
+                delay = self.failed(address, attempt, latency, reason=str(error))
+            else:
+                if not preload_content:
+                    # hand the connection back before trying again
+                    response.drain_conn()
+                    response.release_conn()
+                delay = self.failed(address, attempt, latency, response.status, retry_after=response.headers.get("Retry-After"))
+            attempt += 1
+            time.sleep(delay)
+
+    def fetch_many(self, addresses:list, window:int=None):
+        """Fetch several pages at once, yielding the responses in the order given.
+        Only window pages are requested ahead of the one being handed over, so a slow reader holds no more than that"""
+
+        window = window or self.max_concurrency * 2
+
+        def fetch_queued(address):
+            with self.condition:
+                self.queued -= 1
+            return self.fetch(address)
+
+        with self.condition:
+            self.queued += len(addresses)
+        submitted = 0
+        futures = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            try:
+                while futures or submitted < len(addresses):
+                    while submitted < len(addresses) and len(futures) < window:
+                        futures.append(executor.submit(fetch_queued, addresses[submitted]))
+                        submitted += 1
+                    yield futures.popleft().result()
+            finally:
+                # if the reader stops early, drop the pages that haven't been started from the backlog
+                unstarted = len(addresses) - submitted + sum(future.cancel() for future in futures)
+                with self.condition:
+                    self.queued -= unstarted
+
+    def rate(self, window:float=10.0) -> float:
+        """Pages completed per second over the last few seconds"""
+
+        with self.condition:
+            cutoff = time.monotonic() - window
+            while self.completed and self.completed[0] < cutoff:
+                self.completed.popleft()
+            return len(self.completed) / window
+
+    def stats(self) -> dict:
+        """Current state of the fetcher"""
+
+        return {
+            'concurrency': int(self.limit),
+            'in_flight': self.in_flight,
+            'backlog': self.queued + self.waiting,
+            'rate': self.rate(),
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retried
+            }
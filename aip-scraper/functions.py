@@ -4,26 +4,117 @@ UK AIP Scraper
 
 # Python Imports
 import re
+import threading
+from collections import OrderedDict
 from functools import partial
 from math import modf
 
 # 3rd Party Imports
-from geographiclib.geodesic import Geodesic
 from loguru import logger
-from pyproj import Proj
-from shapely.geometry import Point as sPoint
-from shapely.ops import transform
 
 # Local Imports
 
+METRES_PER_NM = 1852
+
+
+class ArcCache:
+    '''Class to keep recently generated arcs so an arc shared by several airspaces is only worked out once'''
+
+    # coordinates are rounded to about 1cm before being used as a key
+    QUANTUM = 1e7
+
+    def __init__(self, maxsize:int=4096):
+        self.maxsize = maxsize
+        self.arcs = OrderedDict()
+        self.hits = 0
+        self.reverse_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def key(cls, center_x:float, center_y:float, start_x:float, start_y:float, end_x:float, end_y:float, clockwise:bool) -> tuple:
+        """Quantised centre, start and end plus the direction of an arc"""
+
+        return tuple(round(value * cls.QUANTUM) for value in (center_x, center_y, start_x, start_y, end_x, end_y)) + (bool(clockwise),)
+
+    @staticmethod
+    def reverse(key:tuple) -> tuple:
+        """The key for the same arc drawn from the other end"""
+
+        return key[:2] + key[4:6] + key[2:4] + (not key[6],)
+
+    def get(self, key:tuple) -> tuple:
+        """Return the vertices of a cached arc, or None. The same arc drawn the other way is returned reversed
+        so a boundary shared by two airspaces comes out with exactly the same points"""
+
+        with self.lock:
+            arc = self.arcs.get(key)
+            if arc is not None:
+                self.arcs.move_to_end(key)
+                self.hits += 1
+                return arc
+
+            reverse_key = self.reverse(key)
+            arc = self.arcs.get(reverse_key)
+            if arc is not None:
+                self.arcs.move_to_end(reverse_key)
+                self.hits += 1
+                self.reverse_hits += 1
+                return arc[::-1]
+
+            self.misses += 1
+            return None
+
+    def put(self, key:tuple, arc:list) -> None:
+        """Add an arc, dropping the least recently used one if the cache is full"""
+
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.arcs[key] = tuple(arc)
+            self.arcs.move_to_end(key)
+            while len(self.arcs) > self.maxsize:
+                self.arcs.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Empty the cache and reset the counters"""
+
+        with self.lock:
+            self.arcs.clear()
+            self.hits = self.reverse_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """How well the cache is doing"""
+
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'arcs': len(self.arcs),
+                'hits': self.hits,
+                'reverse_hits': self.reverse_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+                }
+
 
 class Geo:
     '''Class to store various geo tools'''
 
+    # shared by every instance, a new Geo is made for each arc
+    arc_cache = ArcCache()
+
     @staticmethod
-    def geodesic_point_buffer(lat:float, lon:float, dkm:float) -> transform:
+    def geodesic_point_buffer(lat:float, lon:float, dkm:float) -> list:
         """It's a buffer of geodesic points"""
 
+        # pyproj and shapely are slow to import so only load them when needed
+        from pyproj import Proj
+        from shapely.geometry import Point as sPoint
+        from shapely.ops import transform
+
         proj_wgs84 = Proj('+proj=longlat +ellps=WGS84 +datum=WGS84 +no_defs')
         # Azimuthal equidistant projection
         aeqd_proj = '+proj=aeqd +lat_0={lat} +lon_0={lon} +x_0=0 +y_0=0'
@@ -55,6 +146,24 @@ class Geo:
 
         return full_location
 
+    @staticmethod
+    def sct2dd(location:str) -> list:
+        """Converts an SCT file location, eg N051.28.39.00 W000.27.41.00, into Decimal Degrees"""
+
+        coords = re.match(r"([N|S])([\d]{1,3})\.([\d]{1,2})\.([\d]{1,2})\.([\d]{1,3})\s([E|W])([\d]{1,3})\.([\d]{1,2})\.([\d]{1,2})\.([\d]{1,3})", str(location))
+        if coords is None:
+            raise ValueError(f"{location} is not a valid SCT location")
+
+        lat_out = int(coords[2]) + int(coords[3]) / 60 + float(f"{coords[4]}.{coords[5]}") / 3600
+        lon_out = int(coords[7]) + int(coords[8]) / 60 + float(f"{coords[9]}.{coords[10]}") / 3600
+
+        if coords[1] == "S":
+            lat_out = -lat_out
+        if coords[6] == "W":
+            lon_out = -lon_out
+
+        return [lat_out, lon_out]
+
     def get_boundary(self, space:list) -> str:
         """creates a boundary useable in vatSys from AIRAC data"""
 
@@ -150,6 +259,20 @@ class Geo:
     def generate_semicircle(self, center_x:float, center_y:float, start_x:float, start_y:float, end_x:float, end_y:float, clockwise:bool) -> list:
         """Create a semicircle. Direction is 1 for clockwise and 2 for anti-clockwise"""
 
+        # neighbouring airspaces often share an arc so look it up before working it out again
+        key = ArcCache.key(center_x, center_y, start_x, start_y, end_x, end_y, clockwise)
+        arc_out = self.arc_cache.get(key)
+        if arc_out is None:
+            arc_out = self.compute_semicircle(center_x, center_y, start_x, start_y, end_x, end_y, clockwise)
+            self.arc_cache.put(key, arc_out)
+
+        return list(arc_out)
+
+    def compute_semicircle(self, center_x:float, center_y:float, start_x:float, start_y:float, end_x:float, end_y:float, clockwise:bool) -> list:
+        """Work out the points on an arc one degree apart, at most a full circle of them"""
+
+        from geographiclib.geodesic import Geodesic
+
         # centre point to start
         geolib_start = Geodesic.WGS84.Inverse(center_x, center_y, start_x, start_y)
         start_brg = geolib_start['azi1']
@@ -161,19 +284,21 @@ class Geo:
         end_brg = geolib_end['azi1']
         end_brg_compass = ((360 + end_brg) % 360)
 
+        step = 1 if clockwise else -1
+        sweep = ((end_brg_compass - start_brg) * step) % 360
         arc_out = []
-        if clockwise: # if cw
-            while round(start_brg) != round(end_brg_compass):
-                arc_coords = Geodesic.WGS84.Direct(center_x, center_y, start_brg, start_dst)
-                arc_out.append(self.dd2dms(arc_coords['lat2'], arc_coords['lon2']))
-                start_brg = ((start_brg + 1) % 360)
-                logger.debug(start_brg, end_brg_compass)
-        else: # if anti-cw
-            while round(start_brg) != round(end_brg_compass):
-                arc_coords = Geodesic.WGS84.Direct(center_x, center_y, start_brg, start_dst)
-                arc_out.append(self.dd2dms(arc_coords['lat2'], arc_coords['lon2']))
-                start_brg = ((start_brg - 1) % 360)
-                logger.debug(start_brg, end_brg_compass)
+        # stop where the original loop stopped, on the first bearing that rounds to the same whole degree as the end
+        for _ in range(360):
+            if round(start_brg) == round(end_brg_compass):
+                break
+            arc_coords = Geodesic.WGS84.Direct(center_x, center_y, start_brg, start_dst)
+            arc_out.append(self.dd2dms(arc_coords['lat2'], arc_coords['lon2']))
+            start_brg = ((start_brg + step) % 360)
+            logger.trace("{} {}", start_brg, end_brg_compass)
+        else:
+            # rounding halves to even can skip over the end's whole degree, which the original loop went round
+            # forever looking for, so stop at the point nearest the end instead
+            arc_out = arc_out[:int(sweep + 0.5)]
 
         return arc_out
 
@@ -0,0 +1,142 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import re
+import unicodedata
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+
+
+def normalise(text:str) -> str:
+    """Lower case, strip accents and punctuation and collapse whitespace so names compare cleanly"""
+
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"['\u2019]", "", text.casefold())
+    text = re.sub(r"[^\w\s]", " ", text)
+
+    return " ".join(text.split())
+
+
+class AerodromeIndex:
+    '''Class to look up aerodromes by any part of their AD-0.1 name'''
+
+    def __init__(self, df_ad_01, min_length:int=3, max_length:int=10):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.names = {}
+        self.index = {}
+        self.ambiguous = {}
+
+        for icao, name in zip(df_ad_01['icao_designator'], df_ad_01['name']):
+            if not isinstance(name, str):
+                continue
+            name = normalise(name)
+            self.names[icao] = name
+
+            # index every substring within the length range so a lookup is a single dict access
+            substrings = set()
+            for start in range(len(name)):
+                for end in range(start + min_length, min(start + max_length, len(name)) + 1):
+                    substrings.add(name[start:end])
+            for substring in substrings:
+                self.index.setdefault(substring, []).append(icao)
+
+        logger.debug("Indexed {} aerodrome names into {} keys", len(self.names), len(self.index))
+
+    def lookup(self, word:str) -> list:
+        """Return the ICAO designator of every aerodrome whose name contains the word"""
+
+        key = normalise(word)
+        if self.min_length <= len(key) <= self.max_length:
+            matches = self.index.get(key, [])
+        else:
+            # outside what was indexed so fall back to checking each name
+            matches = [icao for icao, name in self.names.items() if key in name]
+
+        if len(matches) > 1:
+            self.ambiguous[key] = matches
+
+        return matches
+
+    def report(self) -> None:
+        """Log every word that matched more than one aerodrome"""
+
+        for word, matches in sorted(self.ambiguous.items()):
+            logger.debug("'{}' is ambiguous, it matches {}", word, ", ".join(matches))
+
+
+class SsrCodeIndex:
+    '''Class to look up what an SSR code is allocated to from the ENR-1.6 code ranges'''
+
+    # SSR codes are four octal digits so there are only 4096 of them
+    CODES = 4096
+
+    def __init__(self, df_enr_016):
+        self.allocations = []
+        self.table = [() for _ in range(self.CODES)]
+
+        seen = set()
+        for row in df_enr_016.itertuples(index=False):
+            allocation = (str(row.start), str(row.end), str(row.depart), str(row.arrive), str(row.string))
+            if allocation in seen:
+                continue
+            seen.add(allocation)
+
+            try:
+                start = self.code_to_int(row.start)
+                end = self.code_to_int(row.end)
+            except ValueError:
+                logger.warning("Skipping SSR allocation {} to {}, not a valid code range", row.start, row.end)
+                continue
+            if end < start:
+                start, end = end, start
+
+            # ranges can overlap, so each code keeps every allocation that covers it
+            position = len(self.allocations)
+            self.allocations.append(dict(zip(('start', 'end', 'depart', 'arrive', 'string'), allocation)))
+            for code in range(start, end + 1):
+                self.table[code] = self.table[code] + (position,)
+
+        logger.debug("Indexed {} SSR allocations", len(self.allocations))
+
+    @staticmethod
+    def code_to_int(code) -> int:
+        """Turn a code as written, eg "7046" or 7046, into its position in the table"""
+
+        text = str(code).strip()
+        # only plain octal digits, so no signs, prefixes or digits above 7
+        if not re.fullmatch(r"[0-7]{1,4}", text):
+            raise ValueError(f"{code!r} is not an SSR code, it should be up to four octal digits from 0000 to 7777")
+
+        return int(text, 8)
+
+    def lookup(self, code) -> list:
+        """Return every allocation covering the given code, none if it isn't a valid code"""
+
+        try:
+            positions = self.table[self.code_to_int(code)]
+        except ValueError:
+            return []
+
+        return [self.allocations[position] for position in positions]
+
+    def lookup_many(self, codes) -> list:
+        """Return the allocations covering each of the given codes, in the same order, none for an invalid code"""
+
+        table = self.table
+        allocations = self.allocations
+        results = []
+        for code in codes:
+            try:
+                positions = table[self.code_to_int(code)]
+            except ValueError:
+                positions = ()
+            results.append([allocations[position] for position in positions])
+
+        return results
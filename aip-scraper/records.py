@@ -0,0 +1,213 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+from typing import Iterator, NamedTuple
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+from .areas import AreaGeometry
+
+
+class Aerodrome(NamedTuple):
+    '''An aerodrome from AD-0.1, with the AD-2.2 details once its page has been parsed'''
+    icao_designator: str
+    name: str
+    verified: int = 0
+    location: str = None
+    elevation: str = None
+    magnetic_variation: str = None
+
+
+class Runway(NamedTuple):
+    '''One end of a runway from AD-2.12'''
+    icao_designator: str
+    runway: str
+    location: str
+    elevation: str
+    bearing: str
+    length: str
+
+
+class Service(NamedTuple):
+    '''An air traffic service frequency from AD-2.18'''
+    icao_designator: str
+    callsign_type: str
+    frequency: str
+
+
+class Navaid(NamedTuple):
+    '''A radio navigation aid from ENR-4.1'''
+    name: str
+    type: str
+    coords: str
+    freq: str
+
+
+class Fix(NamedTuple):
+    '''A significant point from ENR-4.4'''
+    name: str
+    coords: str
+
+
+class Airway(NamedTuple):
+    '''An ATS route from ENR-3.x, the route being the points along it separated by "/"'''
+    section: str
+    name: str
+    route: str
+
+
+class Airspace(NamedTuple):
+    '''A FIR, CTA, TMA or ATZ volume from ENR-2.1'''
+    type: str
+    name: str
+    callsign: str
+    frequency: str
+    boundary: str
+    upper_fl: str
+    lower_fl: str
+
+
+class RestrictedArea(NamedTuple):
+    '''A prohibited, restricted or danger area from ENR-5.1'''
+    name: str
+    boundary: str
+    floor: int
+    ceiling: int
+
+
+class AerodromePage(NamedTuple):
+    '''Everything taken from a single AD-2 page'''
+    aerodrome: Aerodrome
+    runways: list
+    services: list
+
+
+class Records:
+    '''Class to read the eAIP one section at a time as typed records, each produced as soon as its page is parsed.
+
+    Nothing is fetched until a generator is iterated and only a few pages are downloaded ahead of the one being parsed,
+    so a caller can work through the aerodromes while the ENR sections are still to be fetched. Each record is yielded
+    and let go as soon as its page is parsed, so memory doesn't grow with the size of the eAIP. Iterating again fetches
+    the pages again, give the Webscrape a ParseCache so they aren't parsed again as well.'''
+
+    def __init__(self, web_scrape):
+        self.web_scrape = web_scrape
+        self.listed = None
+
+    def aerodrome_list(self) -> Iterator[Aerodrome]:
+        """The aerodromes listed in AD-0.1, without the details from their AD-2 pages"""
+
+        web_scrape = self.web_scrape
+        for rows in web_scrape.parse_pages(web_scrape.parse_ad01_page, [web_scrape.page_name("AD-0.1")]):
+            if rows == 404:
+                continue
+            for row in rows:
+                yield Aerodrome(row['icao_designator'], row['name'])
+
+    def aerodrome_pages(self, icao:list=None) -> Iterator[AerodromePage]:
+        """The AD-2 page of each aerodrome in AD-0.1, or just the ones given, in AD-0.1 order"""
+
+        web_scrape = self.web_scrape
+        if self.listed is None:
+            self.listed = list(self.aerodrome_list())
+        aerodromes = self.listed
+        if icao:
+            aerodromes = [aerodrome for aerodrome in aerodromes if aerodrome.icao_designator in icao]
+
+        pages = web_scrape.parse_pages(
+            web_scrape.parse_ad02_page,
+            [web_scrape.page_name("AD-2." + aerodrome.icao_designator) for aerodrome in aerodromes],
+            [(aerodrome.icao_designator,) for aerodrome in aerodromes]
+            )
+        for aerodrome, page in zip(aerodromes, pages):
+            page = self.aerodrome_page(aerodrome, page)
+            if page is not None:
+                yield page
+
+    @staticmethod
+    def aerodrome_page(aerodrome:Aerodrome, page) -> AerodromePage:
+        """The records from one parsed AD-2 page, or None if the aerodrome has no page"""
+
+        if page == 404:
+            logger.error("Aerodrome " + aerodrome.icao_designator + " does not exist")
+            return None
+        if page['aerodrome'] is not None:
+            aerodrome = aerodrome._replace(**page['aerodrome'])
+
+        return AerodromePage(
+            aerodrome,
+            [Runway(**runway) for runway in page['runways']],
+            [Service(**service) for service in page['services']]
+            )
+
+    def aerodromes(self, icao:list=None) -> Iterator[Aerodrome]:
+        """Each aerodrome with its AD-2.2 details"""
+
+        for page in self.aerodrome_pages(icao):
+            yield page.aerodrome
+
+    def runways(self, icao:list=None) -> Iterator[Runway]:
+        """Every runway end of every aerodrome"""
+
+        for page in self.aerodrome_pages(icao):
+            yield from page.runways
+
+    def services(self, icao:list=None) -> Iterator[Service]:
+        """Every air traffic service frequency of every aerodrome"""
+
+        for page in self.aerodrome_pages(icao):
+            yield from page.services
+
+    def navaids(self) -> Iterator[Navaid]:
+        """The navaids in ENR-4.1"""
+
+        web_scrape = self.web_scrape
+        for rows in web_scrape.parse_pages(web_scrape.parse_enr04_page, [web_scrape.page_name("ENR-4.1")], [("1",)], streamable=True):
+            if rows != 404:
+                for row in rows:
+                    yield Navaid(**row)
+
+    def fixes(self) -> Iterator[Fix]:
+        """The significant points in ENR-4.4"""
+
+        web_scrape = self.web_scrape
+        for rows in web_scrape.parse_pages(web_scrape.parse_enr04_page, [web_scrape.page_name("ENR-4.4")], [("4",)], streamable=True):
+            if rows != 404:
+                for row in rows:
+                    yield Fix(row['name'], row['coords'])
+
+    def airways(self, sections:tuple=("1", "3", "5")) -> Iterator[Airway]:
+        """The ATS routes in each of the given ENR-3 sections"""
+
+        web_scrape = self.web_scrape
+        uris = [web_scrape.page_name("ENR-3." + section) for section in sections]
+        for section, rows in zip(sections, web_scrape.parse_pages(web_scrape.parse_enr03_page, uris, streamable=True)):
+            if rows != 404:
+                for row in rows:
+                    yield Airway("3." + section, row['name'], row['route'])
+
+    def airspaces(self) -> Iterator[Airspace]:
+        """The FIR, CTA, TMA and ATZ volumes in ENR-2.1, the UIR is the same extent as the FIR so isn't repeated"""
+
+        web_scrape = self.web_scrape
+        for airspaces in web_scrape.parse_pages(web_scrape.parse_enr02_page, [web_scrape.page_name("ENR-2.1")], streamable=True):
+            if airspaces == 404:
+                continue
+            for airspace_type, rows in airspaces.items():
+                for row in rows:
+                    yield Airspace(airspace_type, **row)
+
+    def restricted_areas(self) -> Iterator[RestrictedArea]:
+        """The prohibited, restricted and danger areas in ENR-5.1"""
+
+        web_scrape = self.web_scrape
+        for rows in web_scrape.parse_pages(web_scrape.parse_enr051_page, [web_scrape.page_name("ENR-5.1")], streamable=True):
+            if rows == 404:
+                continue
+            boundaries = AreaGeometry([row['parts'] for row in rows]).boundaries()
+            for row, boundary in zip(rows, boundaries):
+                yield RestrictedArea(row['name'], boundary, row['floor'], row['ceiling'])
@@ -0,0 +1,179 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import heapq
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+from .functions import METRES_PER_NM, Geo
+
+
+class RouteGraph:
+    '''Class to build a graph of the ATS route network from ENR-3 with point locations from ENR-4'''
+
+    def __init__(self, enr_03:list, enr_041, enr_044):
+        # locations of all the navaids and fixes, navaids take priority if a name appears in both
+        self.points = {}
+        for df_points in (enr_041, enr_044):
+            for name, coords in zip(df_points['name'], df_points['coords']):
+                if name in self.points:
+                    logger.debug("{} is listed more than once in ENR-4, keeping the first", name)
+                    continue
+                try:
+                    self.points[str(name)] = tuple(Geo.sct2dd(coords))
+                except ValueError as err:
+                    logger.warning(err)
+
+        # each airway can be listed in more than one ENR-3 section so keep every sequence of points
+        self.airways = {}
+        self.positions = {}
+        for df_routes in enr_03:
+            for name, route in zip(df_routes['name'], df_routes['route']):
+                if not isinstance(route, str) or route == "":
+                    continue
+                sequence = route.split("/")
+                self.airways.setdefault(str(name), []).append(sequence)
+                # an airway can pass through the same point more than once so keep every place it appears
+                positions = {}
+                for index, point in enumerate(sequence):
+                    positions.setdefault(point, []).append(index)
+                self.positions.setdefault(str(name), []).append(positions)
+
+        self.unresolved = set()
+        self.adjacency = {}
+        self.build()
+
+    def build(self) -> None:
+        """Join up consecutive points on each airway and work out the length of every segment in one go"""
+
+        # pyproj is slow to import so only load it when a graph is built
+        from pyproj import Geod
+
+        segments = []
+        for airway, sequences in self.airways.items():
+            for sequence in sequences:
+                for point in sequence:
+                    if point not in self.points:
+                        self.unresolved.add(point)
+                for start, end in zip(sequence, sequence[1:]):
+                    if start in self.points and end in self.points:
+                        segments.append((airway, start, end))
+
+        if self.unresolved:
+            logger.warning("{} route points have no location in ENR-4: {}", len(self.unresolved), ", ".join(sorted(self.unresolved)))
+
+        lats_1 = [self.points[start][0] for _, start, _ in segments]
+        lons_1 = [self.points[start][1] for _, start, _ in segments]
+        lats_2 = [self.points[end][0] for _, _, end in segments]
+        lons_2 = [self.points[end][1] for _, _, end in segments]
+        distances = Geod(ellps="WGS84").inv(lons_1, lats_1, lons_2, lats_2)[2] if segments else []
+
+        for (airway, start, end), distance in zip(segments, distances):
+            distance = float(distance) / METRES_PER_NM
+            for point_a, point_b in ((start, end), (end, start)):
+                link = self.adjacency.setdefault(point_a, {}).setdefault(point_b, [distance, set()])
+                link[1].add(airway)
+
+        logger.info("Route graph built with {} points and {} segments", len(self.adjacency), len(segments))
+
+    def expand(self, airway:str, entry:str, exit_point:str) -> list:
+        """Return the points along an airway from the entry point to the exit point, in either direction"""
+
+        for sequence, positions in zip(self.airways.get(airway, []), self.positions.get(airway, [])):
+            if entry in positions and exit_point in positions:
+                # where either point is on the airway more than once, fly the shortest stretch between them, forwards if there's a tie
+                _, _, start, end = min(
+                    (abs(end - start), end < start, start, end)
+                    for start in positions[entry]
+                    for end in positions[exit_point]
+                    )
+                if start <= end:
+                    return sequence[start:end + 1]
+                return sequence[end:start + 1][::-1]
+
+        raise ValueError(f"{entry} and {exit_point} are not both on {airway}")
+
+    def distance(self, points:list) -> float:
+        """Length of a path through the graph in NM"""
+
+        total = 0.0
+        for start, end in zip(points, points[1:]):
+            try:
+                total += self.adjacency[start][end][0]
+            except KeyError as err:
+                raise ValueError(f"{start} and {end} are not joined by an airway") from err
+
+        return total
+
+    def shortest_path(self, origin:str, destination:str) -> list:
+        """Return the distance and the points on the shortest airway path between two points"""
+
+        if origin not in self.adjacency or destination not in self.adjacency:
+            raise ValueError(f"{origin} or {destination} is not on the route network")
+
+        best = {origin: 0.0}
+        previous = {}
+        queue = [(0.0, origin)]
+        while queue:
+            distance, point = heapq.heappop(queue)
+            if point == destination:
+                path = [point]
+                while point in previous:
+                    point = previous[point]
+                    path.append(point)
+                return [distance, path[::-1]]
+            if distance > best[point]:
+                continue
+            for neighbour, (length, _) in self.adjacency[point].items():
+                new_distance = distance + length
+                if new_distance < best.get(neighbour, float("inf")):
+                    best[neighbour] = new_distance
+                    previous[neighbour] = point
+                    heapq.heappush(queue, (new_distance, neighbour))
+
+        raise ValueError(f"There is no airway path from {origin} to {destination}")
+
+    def validate(self, route:str) -> list:
+        """Expand a filed route, eg "DVR L9 KONAN", returning the points flown and any errors found"""
+
+        items = route.split()
+        points = []
+        errors = []
+        if not items:
+            return [points, ["Empty route"]]
+
+        points.append(items[0])
+        if items[0] not in self.points:
+            errors.append(f"{items[0]} is not a known point")
+
+        index = 1
+        while index < len(items):
+            item = items[index]
+            if item in self.airways:
+                if index + 1 >= len(items):
+                    errors.append(f"{item} has no exit point")
+                    break
+                exit_point = items[index + 1]
+                try:
+                    points.extend(self.expand(item, points[-1], exit_point)[1:])
+                except ValueError as err:
+                    errors.append(str(err))
+                    points.append(exit_point)
+                index += 2
+            else:
+                # direct to a point
+                if item not in self.points:
+                    errors.append(f"{item} is not a known point or airway")
+                points.append(item)
+                index += 1
+
+        return [points, errors]
+
+    def validate_many(self, routes:list) -> list:
+        """Validate a batch of filed routes"""
+
+        return [self.validate(route) for route in routes]
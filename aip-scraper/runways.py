@@ -0,0 +1,162 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import re
+
+# 3rd Party Imports
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Local Imports
+from .airspace import boundary_coords
+from .functions import METRES_PER_NM
+
+CENTRELINE_COLUMNS = [
+    'icao_designator',
+    'runway',
+    'reciprocal',
+    'paired',
+    'threshold_lat',
+    'threshold_lon',
+    'end_lat',
+    'end_lon',
+    'length',
+    'bearing',
+    'extended_lat',
+    'extended_lon',
+    'centreline',
+    'extended_centreline'
+    ]
+
+PAIR_COLUMNS = ['icao_designator', 'runway', 'reciprocal', 'length', 'bearing', 'centreline', 'extended_centreline']
+
+
+def reciprocal(runways:pd.Series) -> pd.Series:
+    """The designator of the opposite end of each runway, eg 09L -> 27R and 18 -> 36"""
+
+    # there are only a few hundred different designators however many aerodromes there are, so work each one out once
+    codes, designators = pd.factorize(runways.fillna("").astype(str))
+    matches = re.findall(r"^(?:(\d{2})([LCR]?)$)?.*$", "\n".join(designators.tolist()), re.MULTILINE)
+    parts = np.array(matches, dtype=str).reshape(-1, 2)
+    valid = parts[:, 0] != ""
+    number = np.where(valid, parts[:, 0], "0").astype(int)
+    opposite = np.char.zfill(((number + 17) % 36 + 1).astype(str), 2)
+    suffix = np.select([parts[:, 1] == "L", parts[:, 1] == "R"], ["R", "L"], parts[:, 1])
+    opposite = np.append(np.where(valid, np.char.add(opposite, suffix), None).astype(object), None)
+
+    # a missing designator is coded -1, which picks up the None on the end
+    return pd.Series(opposite[codes], index=runways.index, dtype=object)
+
+
+class RunwayGeometry:
+    '''Class to pair up the AD-2.12 runway ends and work out each runway's centreline and extended centreline in one pass'''
+
+    def __init__(self, df_rwy:pd.DataFrame, extension:float=10.0):
+        # pyproj is slow to import so only load it when geometry is built
+        from pyproj import Geod
+
+        self.geod = Geod(ellps="WGS84")
+        self.extension = extension
+        self.ends = df_rwy.drop_duplicates(['icao_designator', 'runway']).reset_index(drop=True)
+
+    def centrelines(self) -> pd.DataFrame:
+        """One row per runway end, with the far end of the runway and the end of the extended centreline on its approach.
+        Ends whose reciprocal isn't published are extended along their true bearing by their length. The centreline
+        runs from the threshold to the far end and the extended centreline from the end of the approach to the
+        threshold, both as (lon, lat) LINESTRINGs.
+
+        Everything is worked out in a handful of vectorised passes so the time grows linearly with the number of ends,
+        around 9us each with the lines, which keeps it under a second up to about 100 times the UK runway set (64,000
+        ends), see benchmarks/runway_centrelines.py"""
+
+        # shapely is slow to import so only load it when geometry is built
+        import shapely
+
+        ends = self.ends
+        if ends.empty:
+            return pd.DataFrame(columns=CENTRELINE_COLUMNS)
+
+        coords = boundary_coords(ends['location'])
+        ends = ends.loc[coords.index]
+        lat = coords['lat'].to_numpy()
+        lon = coords['lon'].to_numpy()
+        opposite = reciprocal(ends['runway'])
+
+        # look up the reciprocal of each end among the ends at the same aerodrome
+        position = pd.Series(np.arange(len(ends)), index=pd.MultiIndex.from_arrays([ends['icao_designator'], ends['runway']]))
+        match = position.reindex(pd.MultiIndex.from_arrays([ends['icao_designator'], opposite])).to_numpy()
+        paired = ~np.isnan(match)
+        match = np.where(paired, match, 0).astype(int)
+
+        # where there is no reciprocal, the far end comes from the published bearing and length
+        unpaired = np.flatnonzero(~paired)
+        bearing = pd.to_numeric(ends['bearing'].iloc[unpaired], errors="coerce").to_numpy()
+        length = pd.to_numeric(ends['length'].iloc[unpaired], errors="coerce").to_numpy()
+        derived_lon, derived_lat, _ = self.geod.fwd(lon[unpaired], lat[unpaired], np.nan_to_num(bearing), np.nan_to_num(length))
+        end_lat = lat[match]
+        end_lon = lon[match]
+        end_lat[unpaired] = derived_lat
+        end_lon[unpaired] = derived_lon
+
+        # the centreline gives the true bearing and length from one threshold to the other
+        true_bearing, _, distance = self.geod.inv(lon, lat, end_lon, end_lat)
+        # the approach comes in over the threshold so the extended centreline runs the opposite way
+        extended_lon, extended_lat, _ = self.geod.fwd(lon, lat, true_bearing + 180.0, np.full(len(lat), self.extension * METRES_PER_NM))
+
+        if len(unpaired):
+            logger.debug("{} runway ends have no published reciprocal, their far end has been derived", len(unpaired))
+
+        # every line is two vertices, so they are all built in one call from an (ends, 2, 2) array
+        threshold = np.column_stack((lon, lat))
+        centreline = shapely.linestrings(np.stack((threshold, np.column_stack((end_lon, end_lat))), axis=1))
+        extended_centreline = shapely.linestrings(np.stack((np.column_stack((extended_lon, extended_lat)), threshold), axis=1))
+
+        return pd.DataFrame({
+            'icao_designator': ends['icao_designator'].to_numpy(),
+            'runway': ends['runway'].to_numpy(),
+            'reciprocal': opposite.to_numpy(),
+            'paired': paired,
+            'threshold_lat': lat,
+            'threshold_lon': lon,
+            'end_lat': end_lat,
+            'end_lon': end_lon,
+            'length': np.round(distance, 1),
+            'bearing': np.round(true_bearing % 360.0, 2),
+            'extended_lat': extended_lat,
+            'extended_lon': extended_lon,
+            'centreline': centreline,
+            'extended_centreline': extended_centreline
+            }, columns=CENTRELINE_COLUMNS)
+
+    def pairs(self) -> pd.DataFrame:
+        """Each runway once, as the pair of ends that make it up. The centreline runs between the two thresholds and
+        the extended centreline through both approaches and both thresholds, as (lon, lat) LINESTRINGs"""
+
+        import shapely
+
+        centrelines = self.centrelines()
+        if centrelines.empty:
+            return pd.DataFrame(columns=PAIR_COLUMNS)
+        ends = centrelines[centrelines['paired']]
+        first = ends[ends['runway'] < ends['reciprocal']]
+        # the other end of each runway, for the far approach
+        second = first[['icao_designator', 'reciprocal']].merge(
+            ends[['icao_designator', 'runway', 'extended_lat', 'extended_lon']],
+            left_on=['icao_designator', 'reciprocal'],
+            right_on=['icao_designator', 'runway'],
+            how="left"
+            )
+        vertices = np.stack((
+            np.column_stack((first['extended_lon'], first['extended_lat'])),
+            np.column_stack((first['threshold_lon'], first['threshold_lat'])),
+            np.column_stack((first['end_lon'], first['end_lat'])),
+            np.column_stack((second['extended_lon'], second['extended_lat']))
+            ), axis=1)
+
+        pairs = first[PAIR_COLUMNS[:-1]].reset_index(drop=True)
+        pairs['extended_centreline'] = shapely.linestrings(vertices) if len(pairs) else np.empty(0, dtype=object)
+
+        return pairs
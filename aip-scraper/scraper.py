@@ -3,58 +3,249 @@ UK AIP Scraper
 """
 
 # Python Imports
+import os
 import re
+import sys
+from collections import deque
 
 # 3rd Party Imports
 import pandas as pd
-import requests
-import urllib3
 from bs4 import BeautifulSoup
 from loguru import logger
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 
 # Local Imports
-from . import config
-from .airac import Airac
+from . import aio, config, tokenizer
+from .airac import BASE_URL, Airac
+from .airspace import AirspaceGeometry
+from .areas import AreaGeometry
+from .browser import BrowserPool
+from .cache import ParseCache, content_hash, parser_version
+from .checkpoint import Checkpoint
+from .fetch import Fetcher
 from .functions import Geo
+from .index import AerodromeIndex
+from .records import Records
+from .runways import RunwayGeometry
+from .store import Store
+from .stream import StreamPage
+from .tokenizer import ARC, CALLSIGN, FREQUENCY, TITLE, VERTEX, find_arc_points, tokenize_enr02, tokenize_enr051
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class Webscrape:
     '''Class to scrape data from the given AIRAC eAIP URL'''
 
-    def __init__(self):
+    def __init__(self, use_next:bool=False, date_in:str=None, browsers:int=1, recycle_after:int=100, render:bool=True, fetcher:Fetcher=None, cache:ParseCache=None, stream:bool=False, store:Store=None, base_url:str=BASE_URL, country:str=config.COUNTRY_CODE, browser:BrowserPool=None, checkpoint_dir:str=None):
         cycle = Airac()
-        self.cycle = cycle.current_cycle()
-        self.cycle_url = cycle.url()
-        self.country = config.COUNTRY_CODE
-
-        options = Options()
-        options.headless = True
-        options.add_argument("--window-size=1920,1200")
-        self.driver = webdriver.Chrome(options=options, executable_path="chromedriver.exe")
-
-    def __del__(self):
-        self.driver.quit()
+        if use_next:
+            self.cycle = cycle.next_cycle()
+        else:
+            self.cycle = cycle.current_cycle(date_in)
+        self.cycle_url = cycle.url(use_next, date_in, base_url)
+        self.country = country
+        logger.info("Working directory is {}", config.WORK_DIR)
+
+        self.render = render
+        # a pool handed in is shared with other scrapers so is left for its owner to close
+        self.owns_browser = browser is None
+        if browser is None:
+            browser = BrowserPool(browsers, recycle_after)
+        self.browser = browser
+        if fetcher is None:
+            fetcher = Fetcher()
+        self.fetcher = fetcher
+        self.cache = cache
+        self.prefetched = {}
+        self.store = store
+        self.checkpoint = None
+        if checkpoint_dir is not None:
+            self.checkpoint = Checkpoint(checkpoint_dir, str(self.cycle), self.country, base_url)
+            # a section's output depends on every parser it calls, so any change to them starts it again
+            self.stage_version = parser_version(sys.modules[__name__], Geo, tokenizer, AreaGeometry, AerodromeIndex)
+        # streaming reads the large pages as they arrive, the rendered source is only available as a whole page
+        self.stream = stream and not render
+        if stream and render:
+            logger.warning("Streaming is only available when pages are not rendered, pages will be parsed whole")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Close down the browsers used for rendering"""
+
+        if self.owns_browser:
+            self.browser.close()
+
+    def records(self) -> Records:
+        """Read the eAIP section by section as typed records instead of waiting for run() to finish"""
+
+        return Records(self)
+
+    def page_name(self, section:str) -> str:
+        """The file name of a section's page in this country's eAIP"""
+
+        return f"{self.country}-{section}-en-GB.html"
 
     def get_table_soup(self, uri) -> BeautifulSoup:
         """Parse the given table into a beautifulsoup object"""
 
-        address = self.cycle_url + uri
-
-        http = urllib3.PoolManager()
+        return list(self.get_table_soups([uri]))[0]
 
-        response = http.request("GET", address)
-        if response.status == 404:
-            logger.error("Unable to retrieve page. Received a 404 response")
-            return 404
+    def get_table_soups(self, uris:list):
+        """Parse the given tables into beautifulsoup objects, fetching and rendering them concurrently"""
 
-        logger.info(address)
+        for source in self.get_page_sources(uris):
+            if source == 404:
+                yield 404
+            else:
+                yield BeautifulSoup(source, "html.parser")
+
+    def get_page_sources(self, uris:list):
+        """Fetch the given pages concurrently, rendering them if needed, and yield the page source"""
+
+        addresses = [self.cycle_url + uri for uri in uris]
+        # use anything that has already been prefetched and fetch the rest
+        prefetched = {address: self.prefetched.pop(address) for address in addresses if address in self.prefetched}
+        # the fetcher yields each page in order as soon as it arrives, so the first page can be parsed while the rest download
+        fetched = self.fetcher.fetch_many([address for address in addresses if address not in prefetched])
+
+        def sources():
+            for address in addresses:
+                response = prefetched[address] if address in prefetched else next(fetched)
+                if response.status == 404:
+                    logger.error("Unable to retrieve page. Received a 404 response")
+                    yield address, 404
+                else:
+                    logger.info(address)
+                    yield address, response.data
+
+        if not self.render:
+            for _, source in sources():
+                yield source
+            logger.debug("Fetcher {}", self.fetcher.stats())
+            return
+
+        # the browsers render a few pages ahead of the one being parsed, as the fetcher does, skipping missing pages
+        missing = deque()
+
+        def to_render():
+            for address, source in sources():
+                missing.append(source == 404)
+                if source != 404:
+                    yield address
+
+        for source in self.browser.render_many(to_render()):
+            while missing.popleft():
+                yield 404
+            yield source
+        while missing:
+            missing.popleft()
+            yield 404
+        logger.debug("Fetcher {}", self.fetcher.stats())
+
+    async def fetch_pages(self, uris:list) -> list:
+        """Fetch a batch of pages asynchronously over one keep-alive session, throttled along with every other request"""
+
+        return await aio.fetch_pages([self.cycle_url + uri for uri in uris], self.fetcher)
+
+    def prefetch(self, uris:list) -> None:
+        """Fetch a batch of pages up front so the section parsers don't wait on them one at a time"""
+
+        addresses = [self.cycle_url + uri for uri in uris]
+        pages = aio.run(self.fetch_pages(uris))
+        fetched = {address: page for address, page in zip(addresses, pages) if not isinstance(page, Exception)}
+        for address, page in zip(addresses, pages):
+            if address not in fetched:
+                # leave it to be fetched again when it is parsed, which raises if it still fails
+                logger.warning("Unable to prefetch {}: {}", address, page)
+        self.prefetched.update(fetched)
+        logger.debug("Prefetched {} of {} pages, fetcher {}", len(fetched), len(pages), self.fetcher.stats())
+
+    def stream_pages(self, uris:list):
+        """Fetch the given pages one at a time, yielding a page that is parsed as the response is read"""
+
+        for uri in uris:
+            address = self.cycle_url + uri
+            response = self.fetcher.fetch(address, preload_content=False)
+            if response.status == 404:
+                logger.error("Unable to retrieve page. Received a 404 response")
+                response.drain_conn()
+                response.release_conn()
+                yield 404
+                continue
+            logger.info(address)
+            try:
+                yield StreamPage(response.stream(STREAM_CHUNK_SIZE))
+            finally:
+                response.drain_conn()
+                response.release_conn()
+
+    def parse_pages(self, page_parser, uris:list, page_args:list=None, streamable:bool=False):
+        """Run page_parser over each page, skipping any page finished by an interrupted run for this cycle"""
+
+        if page_args is None:
+            page_args = [()] * len(uris)
+        version = None
+        if self.cache is not None or self.checkpoint is not None:
+            version = parser_version(page_parser, Webscrape.search, Geo, tokenizer)
+
+        resumed = [False] * len(uris)
+        if self.checkpoint is not None:
+            # only read each page's rows when it is reached, rather than holding every finished page at once
+            resumed = [self.checkpoint.has_page(version, uri, args) for uri, args in zip(uris, page_args)]
+        to_parse = [(uri, args) for uri, args, done in zip(uris, page_args, resumed) if not done]
+        parsed = self.parse_fetched_pages(
+            page_parser,
+            [uri for uri, _ in to_parse],
+            [args for _, args in to_parse],
+            streamable,
+            version
+            )
+
+        for uri, args, done in zip(uris, page_args, resumed):
+            rows = self.checkpoint.page(version, uri, args) if done else None
+            if rows is None:
+                if done:
+                    # the finished page couldn't be read back, so it isn't in parsed and has to be parsed on its own
+                    rows = next(self.parse_fetched_pages(page_parser, [uri], [args], streamable, version))
+                else:
+                    rows = next(parsed)
+                if self.checkpoint is not None and rows != 404:
+                    self.checkpoint.save_page(version, uri, args, rows)
+            yield rows
+
+    def parse_fetched_pages(self, page_parser, uris:list, page_args:list, streamable:bool, version:str):
+        """Fetch and parse each page, skipping the parse if the same page has been parsed before"""
+
+        if self.stream and streamable:
+            # the page is never held in full so there is nothing to look up in the parse cache
+            for page, args in zip(self.stream_pages(uris), page_args):
+                yield 404 if page == 404 else page_parser(page, *args)
+            return
+
+        for source, args in zip(self.get_page_sources(uris), page_args):
+            if source == 404:
+                yield 404
+                continue
+
+            if self.cache is not None:
+                page_hash = content_hash(content_hash(source) + repr(args))
+                rows = self.cache.get(version, page_hash)
+                if rows is not None:
+                    yield rows
+                    continue
 
-        self.driver.get(address)
-        source = self.driver.page_source
+            rows = page_parser(BeautifulSoup(source, "html.parser"), *args)
+            if self.cache is not None:
+                self.cache.put(version, page_hash, rows)
+            yield rows
 
-        return BeautifulSoup(source, "html.parser")
+        if self.cache is not None:
+            logger.debug("Parse cache {}", self.cache.stats())
 
     def parse_ad01_data(self) -> pd.DataFrame:
         """Parse the data from AD-0.1"""
@@ -70,10 +261,16 @@ class Webscrape:
             'name',
             'magnetic_variation'
             ]
-        df = pd.DataFrame(columns=df_columns)
 
         # scrape the data
-        get_aerodrome_list = self.get_table_soup(self.country + "-AD-0.1-en-GB.html")
+        rows = next(self.parse_pages(self.parse_ad01_page, [self.page_name("AD-0.1")]))
+
+        return pd.DataFrame(rows, columns=df_columns, dtype=object)
+
+    def parse_ad01_page(self, get_aerodrome_list:BeautifulSoup) -> list:
+        """Parse the aerodrome list from the AD-0.1 page"""
+
+        rows = []
 
         # process the data
         list_aerodrome_list = get_aerodrome_list.find_all("h3")
@@ -82,18 +279,16 @@ class Webscrape:
             get_aerodrome = re.search(rf"({self.country}[A-Z]{{2}})(\n[\s\S]{{7}}\n[\s\S]{{8}})([A-Z]{{4}}.*)(\n[\s\S]{{6}}<\/a>)", str(row))
             if get_aerodrome:
                 # Place each aerodrome into the DB
-                df_out = {
+                rows.append({
                     'icao_designator': str(get_aerodrome[1]),
                     'verified': 0,
                     'location': 0,
                     'elevation': 0,
                     'name': str(get_aerodrome[3]),
                     'magnetic_variation': 0
-                    }
-                df_out = pd.DataFrame(df_out, columns=df_columns, index=[0])
-                df = pd.concat([df, df_out], ignore_index=True)
+                    })
 
-        return df
+        return rows
 
     def parse_ad02_data(self, df_ad_01:pd.DataFrame) -> pd.DataFrame:
         """Parse the data from AD-2.x"""
@@ -107,124 +302,144 @@ class Webscrape:
             'bearing',
             'length'
             ]
-        df_rwy = pd.DataFrame(columns=df_columns_rwy)
+        rows_rwy = []
 
         df_columns_srv = [
             'icao_designator',
             'callsign_type',
             'frequency'
             ]
-        df_srv = pd.DataFrame(columns=df_columns_srv)
+        rows_srv = []
+
+        # Fetch every aerodrome page up front so they can be loaded concurrently
+        aerodrome_icaos = list(df_ad_01['icao_designator'])
+        aerodrome_pages = self.parse_pages(
+            self.parse_ad02_page,
+            [self.page_name("AD-2." + aerodrome_icao) for aerodrome_icao in aerodrome_icaos],
+            [(aerodrome_icao,) for aerodrome_icao in aerodrome_icaos]
+            )
 
         # Select all aerodromes in the dataframe
-        for index, row in df_ad_01.iterrows():
-            aerodrome_icao = row['icao_designator']
-            # Select all runways in this aerodrome
-            get_runways = self.get_table_soup(self.country + "-AD-2."+ aerodrome_icao +"-en-GB.html")
-            if get_runways != 404:
+        for index, aerodrome_icao, page in zip(df_ad_01.index, aerodrome_icaos, aerodrome_pages):
+            if page != 404:
                 logger.info("  Parsing AD-2 data for " + aerodrome_icao)
-                aerodrome_ad_02_02 = get_runways.find(id=aerodrome_icao + "-AD-2.2")
-                aerodrome_ad_02_12 = get_runways.find(id=aerodrome_icao + "-AD-2.12")
-                aerodrome_ad_02_18 = get_runways.find(id=aerodrome_icao + "-AD-2.18")
+                if page['aerodrome'] is None:
+                    continue
 
-                # Find current magnetic variation for this aerodrome
-                aerodrome_mag_var = self.search(r"([\d]{1}\.[\d]{2}).([W|E]{1})", "TAD_HP;VAL_MAG_VAR", str(aerodrome_ad_02_02))
-                plus_minus = Geo.plus_minus(aerodrome_mag_var[0][1])
-                float_mag_var = plus_minus + aerodrome_mag_var[0][0]
+                for column, value in page['aerodrome'].items():
+                    df_ad_01.at[index, column] = value
+                rows_rwy.extend(page['runways'])
+                rows_srv.extend(page['services'])
+            else:
+                logger.error("Aerodrome " + aerodrome_icao + " does not exist")
 
-                # Find lat/lon/elev for aerodrome
-                aerodrome_lat = re.search(r'(Lat: )(<span class="SD" id="ID_[\d]{7,}">)([\d]{6})([N|S]{1})', str(aerodrome_ad_02_02))
-                aerodrome_lon = re.search(r"(Long: )(<span class=\"SD\" id=\"ID_[\d]{7,}\">)([\d]{7})([E|W]{1})", str(aerodrome_ad_02_02))
-                aerodrome_elev = re.search(r"(VAL_ELEV\;)([\d]{1,4})", str(aerodrome_ad_02_02))
+        df_rwy = pd.DataFrame(rows_rwy, columns=df_columns_rwy, dtype=object)
+        df_srv = pd.DataFrame(rows_srv, columns=df_columns_srv, dtype=object)
 
-                logger.trace(aerodrome_lat)
-                logger.trace(aerodrome_lon)
+        return [df_ad_01, df_rwy, df_srv]
 
-                try:
-                    full_location = Geo.sct_location_builder(
-                        aerodrome_lat.group(3),
-                        aerodrome_lon.group(3),
-                        aerodrome_lat.group(4),
-                        aerodrome_lon.group(4)
-                        )
-                except AttributeError as err:
-                    logger.warning(err)
-                    continue
+    def parse_ad02_page(self, get_runways:BeautifulSoup, aerodrome_icao:str) -> dict:
+        """Parse the aerodrome, runway and service data from a single AD-2 page"""
+
+        page = {'aerodrome': None, 'runways': [], 'services': []}
 
-                df_ad_01.at[index, 'verified'] = 1
-                df_ad_01.at[index, 'magnetic_variation'] = str(float_mag_var)
-                df_ad_01.at[index, 'location'] = str(full_location)
-                df_ad_01.at[index, 'elevation'] = str(aerodrome_elev[2])
-
-                # Find runway locations
-                aerodrome_runways = self.search(r"([\d]{2}[L|C|R]?)", "TRWY_DIRECTION;TXT_DESIG", str(aerodrome_ad_02_12))
-                aerodrome_runways_lat = self.search(r"([\d]{6}\.[\d]{2}[N|S]{1})", "TRWY_CLINE_POINT;GEO_LAT", str(aerodrome_ad_02_12))
-                aerodrome_runways_lon = self.search(r"([\d]{7}\.[\d]{2}[E|W]{1})", "TRWY_CLINE_POINT;GEO_LONG", str(aerodrome_ad_02_12))
-                aerodrome_runways_elev = self.search(r"([\d]{3}\.[\d]{1})", "TRWY_CLINE_POINT;VAL_ELEV", str(aerodrome_ad_02_12))
-                aerodrome_runways_brg = self.search(r"([\d]{3}\.[\d]{2}.)", "TRWY_DIRECTION;VAL_TRUE_BRG", str(aerodrome_ad_02_12))
-                aerodrome_runways_len = self.search(r"([\d]{3,4})", "TRWY;VAL_LEN", str(aerodrome_ad_02_12))
-
-                for rwy, lat, lon, elev, brg, rwyLen in zip(aerodrome_runways, aerodrome_runways_lat, aerodrome_runways_lon, aerodrome_runways_elev, aerodrome_runways_brg, aerodrome_runways_len):
-                    # Add runway to the aerodromeDB
-                    lat_split = re.search(r"([\d]{6}\.[\d]{2})([N|S]{1})", str(lat))
-                    lon_split = re.search(r"([\d]{7}\.[\d]{2})([E|W]{1})", str(lon))
-
-                    loc = Geo.sct_location_builder(
-                        lat_split.group(1),
-                        lon_split.group(1),
-                        lat_split.group(2),
-                        lon_split.group(2)
-                        )
-
-                    df_rwy_out = {
-                        'icao_designator': str(aerodrome_icao),
-                        'runway': str(rwy),
-                        'location': str(loc),
-                        'elevation': str(elev),
-                        'bearing': str(brg).rstrip('°'),
-                        'length': str(rwyLen)
-                        }
-                    df_rwy_out = pd.DataFrame(df_rwy_out, columns=df_columns_rwy, index=[0])
-                    df_rwy = pd.concat([df_rwy, df_rwy_out], ignore_index=True)
-
-                # Find air traffic services
-                aerodrome_services = self.search(r"(APPROACH|GROUND|DELIVERY|TOWER|DIRECTOR|INFORMATION|RADAR|RADIO|FIRE|EMERGENCY)", "TCALLSIGN_DETAIL", str(aerodrome_ad_02_18))
-                service_frequency = self.search(r"([\d]{3}\.[\d]{3})", "TFREQUENCY", str(aerodrome_ad_02_18))
-
-                last_srv = ''
-                if len(aerodrome_services) == len(service_frequency):
-                    # Simple aerodrome setups with 1 job, 1 frequency
-                    for srv, frq in zip(aerodrome_services, service_frequency):
-                        if str(srv) is None:
-                            s_type = last_srv
-                        else:
-                            s_type = str(srv)
-                            last_srv = s_type
-                        df_srv_out = {'icao_designator': str(aerodrome_icao),'callsign_type': s_type,'frequency': str(frq)}
-                        df_srv_out = pd.DataFrame(df_srv_out, columns=df_columns_srv, index=[0])
-                        df_srv = pd.concat([df_srv, df_srv_out], ignore_index=True)
+        aerodrome_ad_02_02 = get_runways.find(id=aerodrome_icao + "-AD-2.2")
+        aerodrome_ad_02_12 = get_runways.find(id=aerodrome_icao + "-AD-2.12")
+        aerodrome_ad_02_18 = get_runways.find(id=aerodrome_icao + "-AD-2.18")
+
+        # Find current magnetic variation for this aerodrome
+        aerodrome_mag_var = self.search(r"([\d]{1}\.[\d]{2}).([W|E]{1})", "TAD_HP;VAL_MAG_VAR", str(aerodrome_ad_02_02))
+        plus_minus = Geo.plus_minus(aerodrome_mag_var[0][1])
+        float_mag_var = plus_minus + aerodrome_mag_var[0][0]
+
+        # Find lat/lon/elev for aerodrome
+        aerodrome_lat = re.search(r'(Lat: )(<span class="SD" id="ID_[\d]{7,}">)([\d]{6})([N|S]{1})', str(aerodrome_ad_02_02))
+        aerodrome_lon = re.search(r"(Long: )(<span class=\"SD\" id=\"ID_[\d]{7,}\">)([\d]{7})([E|W]{1})", str(aerodrome_ad_02_02))
+        aerodrome_elev = re.search(r"(VAL_ELEV\;)([\d]{1,4})", str(aerodrome_ad_02_02))
+
+        logger.trace(aerodrome_lat)
+        logger.trace(aerodrome_lon)
+
+        try:
+            full_location = Geo.sct_location_builder(
+                aerodrome_lat.group(3),
+                aerodrome_lon.group(3),
+                aerodrome_lat.group(4),
+                aerodrome_lon.group(4)
+                )
+        except AttributeError as err:
+            logger.warning(err)
+            return page
+
+        page['aerodrome'] = {
+            'verified': 1,
+            'magnetic_variation': str(float_mag_var),
+            'location': str(full_location),
+            'elevation': str(aerodrome_elev[2])
+            }
+
+        # Find runway locations
+        aerodrome_runways = self.search(r"([\d]{2}[L|C|R]?)", "TRWY_DIRECTION;TXT_DESIG", str(aerodrome_ad_02_12))
+        aerodrome_runways_lat = self.search(r"([\d]{6}\.[\d]{2}[N|S]{1})", "TRWY_CLINE_POINT;GEO_LAT", str(aerodrome_ad_02_12))
+        aerodrome_runways_lon = self.search(r"([\d]{7}\.[\d]{2}[E|W]{1})", "TRWY_CLINE_POINT;GEO_LONG", str(aerodrome_ad_02_12))
+        aerodrome_runways_elev = self.search(r"([\d]{3}\.[\d]{1})", "TRWY_CLINE_POINT;VAL_ELEV", str(aerodrome_ad_02_12))
+        aerodrome_runways_brg = self.search(r"([\d]{3}\.[\d]{2}.)", "TRWY_DIRECTION;VAL_TRUE_BRG", str(aerodrome_ad_02_12))
+        aerodrome_runways_len = self.search(r"([\d]{3,4})", "TRWY;VAL_LEN", str(aerodrome_ad_02_12))
+
+        for rwy, lat, lon, elev, brg, rwyLen in zip(aerodrome_runways, aerodrome_runways_lat, aerodrome_runways_lon, aerodrome_runways_elev, aerodrome_runways_brg, aerodrome_runways_len):
+            # Add runway to the aerodromeDB
+            lat_split = re.search(r"([\d]{6}\.[\d]{2})([N|S]{1})", str(lat))
+            lon_split = re.search(r"([\d]{7}\.[\d]{2})([E|W]{1})", str(lon))
+
+            loc = Geo.sct_location_builder(
+                lat_split.group(1),
+                lon_split.group(1),
+                lat_split.group(2),
+                lon_split.group(2)
+                )
+
+            page['runways'].append({
+                'icao_designator': str(aerodrome_icao),
+                'runway': str(rwy),
+                'location': str(loc),
+                'elevation': str(elev),
+                'bearing': str(brg).rstrip('°'),
+                'length': str(rwyLen)
+                })
+
+        # Find air traffic services
+        aerodrome_services = self.search(r"(APPROACH|GROUND|DELIVERY|TOWER|DIRECTOR|INFORMATION|RADAR|RADIO|FIRE|EMERGENCY)", "TCALLSIGN_DETAIL", str(aerodrome_ad_02_18))
+        service_frequency = self.search(r"([\d]{3}\.[\d]{3})", "TFREQUENCY", str(aerodrome_ad_02_18))
+
+        last_srv = ''
+        if len(aerodrome_services) == len(service_frequency):
+            # Simple aerodrome setups with 1 job, 1 frequency
+            for srv, frq in zip(aerodrome_services, service_frequency):
+                if str(srv) is None:
+                    s_type = last_srv
                 else:
-                    # Complex aerodrome setups with multiple frequencies for the same job
-                    logger.warning("Aerodrome " + aerodrome_icao + " has a complex comms structure")
-                    for row in aerodrome_ad_02_18.find_all("span"):
-                        # get the full row and search between two "TCALLSIGN_DETAIL" objects
-                        table_row = re.search(r"(APPROACH|GROUND|DELIVERY|TOWER|DIRECTOR|INFORMATION|RADAR|RADIO|FIRE|EMERGENCY)", str(row))
-                        if table_row is not None:
-                            callsign_type = table_row.group(1)
-                        freq_row = re.search(r"([\d]{3}\.[\d]{3})", str(row))
-                        if freq_row is not None:
-                            frequency = str(freq_row.group(1))
-                            if frequency != "121.500": # filter out guard / emergency frequency
-                                df_srv_out = {
-                                    'icao_designator': str(aerodrome_icao),
-                                    'callsign_type': callsign_type,
-                                    'frequency': frequency
-                                    }
-                                df_srv_out = pd.DataFrame(df_srv_out, columns=df_columns_srv, index=[0])
-                                df_srv = pd.concat([df_srv, df_srv_out], ignore_index=True)
-            else:
-                logger.error("Aerodrome " + aerodrome_icao + " does not exist")
-        return [df_ad_01, df_rwy, df_srv]
+                    s_type = str(srv)
+                    last_srv = s_type
+                page['services'].append({'icao_designator': str(aerodrome_icao),'callsign_type': s_type,'frequency': str(frq)})
+        else:
+            # Complex aerodrome setups with multiple frequencies for the same job
+            logger.warning("Aerodrome " + aerodrome_icao + " has a complex comms structure")
+            for row in aerodrome_ad_02_18.find_all("span"):
+                # get the full row and search between two "TCALLSIGN_DETAIL" objects
+                table_row = re.search(r"(APPROACH|GROUND|DELIVERY|TOWER|DIRECTOR|INFORMATION|RADAR|RADIO|FIRE|EMERGENCY)", str(row))
+                if table_row is not None:
+                    callsign_type = table_row.group(1)
+                freq_row = re.search(r"([\d]{3}\.[\d]{3})", str(row))
+                if freq_row is not None:
+                    frequency = str(freq_row.group(1))
+                    if frequency != "121.500": # filter out guard / emergency frequency
+                        page['services'].append({
+                            'icao_designator': str(aerodrome_icao),
+                            'callsign_type': callsign_type,
+                            'frequency': frequency
+                            })
+
+        return page
 
     def parse_enr016_data(self, df_ad_01:pd.DataFrame) -> pd.DataFrame:
         """Parse the data from ENR-1.6"""
@@ -237,61 +452,116 @@ class Webscrape:
             'arrive',
             'string'
             ]
-        df = pd.DataFrame(columns=df_columns)
+        rows = []
+
+        code_ranges = next(self.parse_pages(self.parse_enr016_page, [self.page_name("ENR-1.6")]))
+        aerodrome_index = AerodromeIndex(df_ad_01)
+        unresolved = []
+        for code_range in code_ranges:
+            start = code_range['start']
+            end = code_range['end']
+
+            # an array of words to search through to try and match code range to destination airport
+            loc_array = code_range['words']
+            df_out = None
+            for loc in loc_array:
+                strip = re.search(r"([A-Za-z]{3,10})", loc)
+                if strip:
+                    dep = self.country + r"\w{2}"
+                    # search the index of aerodrome names
+                    name = aerodrome_index.lookup(strip.group(1))
+                    if len(name) == 1:
+                        df_out = {
+                            'start': start,
+                            'end': end,
+                            'depart': dep,
+                            'arrive': name[0],
+                            'string': strip.group(1)
+                            }
+                    elif strip.group(1) == "RAF" or strip.group(1) == "Military" or strip.group(1) == "RNAS" or strip.group(1) == "NATO":
+                        df_out = {
+                            'start': start,
+                            'end': end,
+                            'depart': dep,
+                            'arrive': 'Military',
+                            'string': strip.group(1)
+                            }
+                    elif strip.group(1) == "Transit":
+                        df_out = {
+                            'start': start,
+                            'end': end,
+                            'depart': dep,
+                            'arrive': loc_array[2],
+                            'string': strip.group(1)
+                            }
+
+                    if df_out is not None:
+                        rows.append(df_out)
+
+            if df_out is None:
+                unresolved.append({'start': start, 'end': end, 'string': " ".join(loc_array)})
+                logger.warning("SSR codes {} to {} ({}) could not be matched to an aerodrome", start, end, " ".join(loc_array))
+
+        aerodrome_index.report()
+        df = pd.DataFrame(rows, columns=df_columns, dtype=object)
+        df.attrs['unresolved'] = pd.DataFrame(unresolved, columns=['start', 'end', 'string'], dtype=object)
+
+        return df
+
+    def parse_enr016_page(self, webpage:BeautifulSoup) -> list:
+        """Parse the SSR code ranges and the words describing who they are allocated to from ENR-1.6"""
+
+        code_ranges = []
 
-        webpage = self.get_table_soup(self.country + "-ENR-1.6-en-GB.html")
         get_div = webpage.find("div", id = "ENR-1.6.2.6")
         get_tr = get_div.find_all('tr')
         for row in get_tr:
             get_p = row.find_all('p')
             if len(get_p) > 1:
-                text = re.search(r"([\d]{4})...([\d]{4})", get_p[0].text) # this will just return ranges and ignore all discreet codes in the table
+                text = re.search(r"([\d]{4})...([\d]{4})", get_p[0].text)
+                discrete = re.fullmatch(r"\s*([0-7]{4})\s*", get_p[0].text)
                 if text:
-                    start = text.group(1)
-                    end = text.group(2)
-
-                    # create an array of words to search through to try and match code range to destination airport
-                    loc_array = get_p[1].text.split()
-                    df_out = None
-                    for loc in loc_array:
-                        strip = re.search(r"([A-Za-z]{3,10})", loc)
-                        if strip:
-                            dep = str(r"EG\w{2}")
-                            # search the dataframe containing icao_codes
-                            name = df_ad_01[df_ad_01['name'].str.contains(strip.group(1), case=False, na=False)]
-                            if len(name.index) == 1:
-                                df_out = {
-                                    'start': start,
-                                    'end': end,
-                                    'depart': dep,
-                                    'arrive': name.iloc[0]['icao_designator'],
-                                    'string': strip.group(1)
-                                    }
-                            elif strip.group(1) == "RAF" or strip.group(1) == "Military" or strip.group(1) == "RNAS" or strip.group(1) == "NATO":
-                                df_out = {
-                                    'start': start,
-                                    'end': end,
-                                    'depart': dep,
-                                    'arrive': 'Military',
-                                    'string': strip.group(1)
-                                    }
-                            elif strip.group(1) == "Transit":
-                                df_out = {
-                                    'start': start,
-                                    'end': end,
-                                    'depart': dep,
-                                    'arrive': loc_array[2],
-                                    'string': strip.group(1)
-                                    }
-
-                            if df_out is not None:
-                                df_out = pd.DataFrame(df_out, columns=df_columns, index=[0])
-                                df = pd.concat([df, df_out], ignore_index=True)
-        return df
+                    code_ranges.append({
+                        'start': text.group(1),
+                        'end': text.group(2),
+                        'words': get_p[1].text.split()
+                        })
+                elif discrete:
+                    # discrete codes are stored as a range of one
+                    code_ranges.append({
+                        'start': discrete.group(1),
+                        'end': discrete.group(1),
+                        'words': get_p[1].text.split()
+                        })
+
+        return code_ranges
 
     def parse_enr02_data(self) -> pd.DataFrame:
         """Parse the data from ENR-2"""
 
+        df_columns = [
+            'name',
+            'callsign',
+            'frequency',
+            'boundary',
+            'upper_fl',
+            'lower_fl'
+            ]
+
+        logger.info("Parsing "+ self.country +"-ENR-2.1 Data (FIR, UIR, TMA AND CTA)...")
+        airspaces = next(self.parse_pages(self.parse_enr02_page, [self.page_name("ENR-2.1")], streamable=True))
+
+        df_fir = pd.DataFrame(airspaces['FIR'], columns=df_columns, dtype=object)
+        df_cta = pd.DataFrame(airspaces['CTA'], columns=df_columns, dtype=object)
+        df_tma = pd.DataFrame(airspaces['TMA'], columns=df_columns, dtype=object)
+        df_atz = pd.DataFrame(airspaces['ATZ'], columns=df_columns, dtype=object)
+        df_uir = df_fir # UIR is same extent as FIR
+
+        return [df_fir, df_uir, df_cta, df_tma, df_atz]
+
+    def parse_enr02_page(self, get_data:BeautifulSoup) -> dict:
+        """Parse the FIR, CTA, TMA and ATZ boundaries from ENR-2.1"""
+
         def coord_to_table(last_df_in_title, callsign_out, frequency, output):
             df_out = {
                 'name': last_df_in_title,
@@ -303,204 +573,142 @@ class Webscrape:
                 }
             return df_out
 
-        df_columns = [
-            'name',
-            'callsign',
-            'frequency',
-            'boundary',
-            'upper_fl',
-            'lower_fl'
-            ]
-        df_fir = pd.DataFrame(columns=df_columns)
-        df_uir = pd.DataFrame(columns=df_columns)
-        df_cta = pd.DataFrame(columns=df_columns)
-        df_tma = pd.DataFrame(columns=df_columns)
-        df_atz = pd.DataFrame(columns=df_columns)
+        airspaces = {'FIR': [], 'CTA': [], 'TMA': [], 'ATZ': []}
 
-        logger.info("Parsing "+ self.country +"-ENR-2.1 Data (FIR, UIR, TMA AND CTA)...")
-        get_data = self.get_table_soup(self.country + "-ENR-2.1-en-GB.html")
+        # create a list of complex airspace areas with the direction of each arc for reference later on
+        complex_areas = {}
 
-        # create a list of complex airspace areas with the direction of the arc for reference later on
-        df_columns = [
-            'area',
-            'number',
-            'direction'
-            ]
-        complex_areas = pd.DataFrame(columns=df_columns)
-        row = 0
-        # find everything enclosed in <p></p> tags
-        complex_search_data = get_data.find_all("p")
-        complex_len = len(complex_search_data)
-        while row < complex_len:
-            title = re.search(r"id=\"ID_[\d]{8,10}\"\>([A-Z]*)\s(ATZ|FIR|CTA|TMA|CTR)\s([0-9]{0,2})\<", str(complex_search_data[row]))
-            if title:
-                print_title = f"{str(title.group(1))} {str(title.group(2))} {str(title.group(3))}"
-
-                direction = re.findall(r"(?<=\s)(anti-clockwise|clockwise)(?=\s)", str(complex_search_data[row+1]))
-                if direction:
-                    area_number = 0
-                    for d in direction:
-                        ca_out = {'area': print_title, 'number': str(area_number), 'direction': str(d)}
-                        ca_out = pd.DataFrame(ca_out, columns=df_columns, index=[0])
-                        complex_areas = pd.concat([complex_areas, ca_out], ignore_index=True)
-                        area_number += 1
-                    row += 1
-            row += 1
-        complex_areas.to_csv(f'{config.WORK_DIR}\\DataFrames\\enr_02-CW-ACW-Helper.csv')
-
-        search_data = get_data.find_all("span")
-        airspace = False
+        def span_texts():
+            """Read the <p> and <span> tags in a single pass, noting arc directions and yielding the span text"""
+            pending_title = None
+            for element in get_data.find_all(["p", "span"]):
+                if element.name == "span":
+                    yield element.get_text()
+                    continue
+                if pending_title is not None:
+                    # the paragraph after a title says which way its arcs go
+                    direction = re.findall(r"(?<=\s)(anti-clockwise|clockwise)(?=\s)", str(element))
+                    title, pending_title = pending_title, None
+                    if direction:
+                        complex_areas[title] = direction
+                        continue
+                title = re.search(r"id=\"ID_[\d]{8,10}\"\>([A-Z]*)\s(ATZ|FIR|CTA|TMA|CTR)\s([0-9]{0,2})\<", str(element))
+                if title:
+                    pending_title = f"{str(title.group(1))} {str(title.group(2))} {str(title.group(3))}".strip()
+
+        def arc_direction(area, number):
+            """Is this going to be a clockwise or anti-clockwise arc? Clockwise unless the AIP says otherwise"""
+            directions = complex_areas.get(area.strip())
+            if directions is None:
+                directions = next((value for key, value in complex_areas.items() if key.startswith(area.strip())), [])
+            if number < len(directions):
+                return directions[number] == "clockwise"
+            return True
+
+        # convert the page into tokens once then run through them in a single pass, the arc directions
+        # are all known by the time the tokens are used
+        tokens, coords = tokenize_enr02(span_texts())
+
+        airspace = None
         last_airspace = None
-        row = 0
         last_arc_title = False
         arc_counter = 0
         space = []
         loop_coord = False
         first_callsign = False
         first_freq = False
+        df_in_title = None
         last_df_in_title = None
+        print_title = None
+        callsign_out = ''
+        frequency = ''
+
+        def emit():
+            """Add the boundary collected so far to the table for its airspace type"""
+            output = Geo().get_boundary(space)
+            # CTRs are found but not output, UIRs are the same extent as the FIR in the UK
+            if last_airspace in airspaces:
+                airspaces[last_airspace].append(coord_to_table(last_df_in_title, callsign_out, frequency, output))
+
+        for kind, value in tokens:
+            if kind == TITLE:
+                # search for FIR / UIR* / CTA / TMA in the printed title *removed as same extent of FIR in UK
+                print_title, airspace = value
+                if airspace:
+                    df_in_title = print_title
+                loop_coord = True
 
-        while row < len(search_data):
-            # find an airspace
-            title = re.search(r"TAIRSPACE;TXT_NAME", str(search_data[row]))
-            coords = re.search(r"(?:TAIRSPACE_VERTEX;GEO_L(?:AT|ONG);)([\d]{4})", str(search_data[row]))
-            callsign = re.search(r"TUNIT;TXT_NAME", str(search_data[row]))
-            freq = re.search(r"TFREQUENCY;VAL_FREQ_TRANS", str(search_data[row]))
-            arc = re.search(r"TAIRSPACE_VERTEX;VAL_RADIUS_ARC", str(search_data[row]))
-
-            if title:
-                # get the printed title
-                print_title = re.search(r"\>(.*)\<", str(search_data[row-1]))
-                if print_title:
-                    # search for FIR / UIR* / CTA / TMA in the printed title *removed as same extent of FIR in UK
-                    airspace = re.search(r"(ATZ|FIR|CTA|TMA|CTR)", str(search_data[row-1]))
-                    if airspace:
-                        df_in_title = str(print_title.group(1))
-                    loop_coord = True
-
-            if callsign and (first_callsign is False):
-                # get the first (and only the first) printed callsign
-                print_callsign = re.search(r"\>(.*)\<", str(search_data[row-1]))
-                if print_callsign:
-                    callsign_out = print_callsign.group(1)
-                    first_callsign = True
-            
-            if freq and (first_freq is False):
+            elif kind == CALLSIGN and first_callsign is False:
                 # get the first (and only the first) printed callsign
-                print_frequency = re.search(r"\>(1[1-3]{1}[\d]{1}\.[\d]{3})\<", str(search_data[row-1]))
-                if print_frequency:
-                    frequency = print_frequency.group(1)
-                    first_freq = True
+                callsign_out = value
+                first_callsign = True
+
+            elif kind == FREQUENCY and first_freq is False:
+                # get the first (and only the first) printed frequency
+                frequency = value
+                first_freq = True
 
-            if arc:
+            elif kind == ARC:
                 # what to do with "thence clockwise by the arc of a circle"
                 # check to see if this a series, if so then increment the counter
                 if df_in_title == str(last_arc_title):
                     arc_counter += 1
                 else:
                     arc_counter = 0
-                
-                # is this going to be a clockwise or anti-clockwise arc?
-                complex_areas = pd.read_csv(f'{config.WORK_DIR}\\DataFrames\\enr_02-CW-ACW-Helper.csv', index_col=0)
-                cacw = complex_areas.loc[(complex_areas["area"].str.match(df_in_title)) & (complex_areas["number"] == arc_counter)]
-                cacw = cacw['direction'].to_string(index=False)
-                logger.debug(cacw)
-                if cacw == "clockwise":
-                    cacw = True
-                elif cacw == "anti-clockwise":
-                    cacw = False
-
-                # work back through the rows to identify the start lat/lon
-                count_back = 2 # start countback from 2
-                start_lon = None
-                start_lat = None
-                while start_lon is None:
-                    start_lon = re.search(r"\>([\d]{6,7})(E|W)\<", str(search_data[row-count_back]))
-                    count_back += 1
-                while start_lat is None:
-                    start_lat = re.search(r"\>([\d]{6,7})(N|S)\<", str(search_data[row-count_back]))
-                    count_back += 1
-
-                # work forward to find the centre point and end lat/lon
-                count_forward = 1
-                end_lat = None
-                end_lon = None
-                mid_lat = None
-                mid_lon = None
-                while mid_lat is None:
-                    mid_lat = re.search(r"\>([\d]{6,7})(N|S)\<", str(search_data[row+count_forward]))
-                    count_forward += 1
-                while mid_lon is None:
-                    mid_lon = re.search(r"\>([\d]{6,7})(E|W)\<", str(search_data[row+count_forward]))
-                    count_forward += 1
-                while end_lat is None:
-                    end_lat = re.search(r"\>([\d]{6,7})(N|S)\<", str(search_data[row+count_forward]))
-                    count_forward += 1
-                while end_lon is None:
-                    end_lon = re.search(r"\>([\d]{6,7})(E|W)\<", str(search_data[row+count_forward]))
-                    count_forward += 1
-
-                # convert from dms to dd
-                start_dd = Geo.dms2dd(start_lat[1], start_lon[1], start_lat[2], start_lon[2])
-                mid_dd = Geo.dms2dd(mid_lat[1], mid_lon[1], mid_lat[2], mid_lon[2])
-                end_dd = Geo.dms2dd(end_lat[1], end_lon[1], end_lat[2], end_lon[2])
-
-                arc_geo = Geo()
-                arc_out = arc_geo.generate_semicircle(float(mid_dd[0]), float(mid_dd[1]), float(start_dd[0]), float(start_dd[1]), float(end_dd[0]), float(end_dd[1]), cacw)
-                for coord in arc_out:
-                    space.append(coord)
+                cacw = arc_direction(str(df_in_title), arc_counter)
+
+                try:
+                    start_lat, start_lon, mid_lat, mid_lon, end_lat, end_lon = find_arc_points(coords, value)
+                except ValueError as err:
+                    logger.warning("{} in {}", err, df_in_title)
+                else:
+                    # convert from dms to dd
+                    start_dd = Geo.dms2dd(start_lat[0], start_lon[0], start_lat[1], start_lon[1])
+                    mid_dd = Geo.dms2dd(mid_lat[0], mid_lon[0], mid_lat[1], mid_lon[1])
+                    end_dd = Geo.dms2dd(end_lat[0], end_lon[0], end_lat[1], end_lon[1])
+
+                    arc_geo = Geo()
+                    arc_out = arc_geo.generate_semicircle(float(mid_dd[0]), float(mid_dd[1]), float(start_dd[0]), float(start_dd[1]), float(end_dd[0]), float(end_dd[1]), cacw)
+                    space.extend(arc_out)
 
                 # store the last arc title to compare against
-                last_arc_title = str(print_title.group(1))
+                last_arc_title = str(print_title)
 
-            if coords:
+            elif kind == VERTEX:
                 loop_coord = False
-                # get the coordinate
-                print_coord = re.findall(r"\>([\d]{6,7})(N|S|E|W)\<", str(search_data[row-1]))
-                if print_coord:
-                    space.append(print_coord[0])
+                if value is not None:
+                    space.append(value)
 
-            if loop_coord and (space != []):
-                output = Geo.get_boundary(space, last_df_in_title)
-                if airspace:
-                    # for FIRs do this
-                    if last_airspace.group(1) == "FIR":
-                        df_fir_out = coord_to_table(last_df_in_title, callsign_out, frequency, output)
-                        df_fir = pd.concat([df_fir, df_fir_out], ignore_index=True)
-                    # for UIRs do this - same extent as FIR
-                    #if last_airspace.group(1) == "UIR":
-                    #    df_uir_out = {'name': last_df_in_title,'callsign': callsign_out,'frequency': str(frequency), 'boundary': str(output), 'upper_fl': '000', 'lower_fl': '000'}
-                    #    df_uir = df_uir.append(df_uir_out, ignore_index=True)
-                    # for CTAs do this
-                    if last_airspace.group(1) == "CTA":
-                        df_cta_out = coord_to_table(last_df_in_title, callsign_out, frequency, output)
-                        df_cta = pd.concat([df_cta, df_cta_out], ignore_index=True)
-                    if last_airspace.group(1) == "TMA":
-                        df_tma_out = coord_to_table(last_df_in_title, callsign_out, frequency, output)
-                        df_tma = pd.concat([df_tma, df_tma_out], ignore_index=True)
-                    if last_airspace.group(1) == "ATZ":
-                        df_atz_out = coord_to_table(last_df_in_title, callsign_out, frequency, output)
-                        df_atz = pd.concat([df_atz, df_atz_out], ignore_index=True)
-                    space = []
-                    loop_coord = True
-                    first_callsign = False
-                    first_freq = False
+            if loop_coord and space and airspace:
+                emit()
+                space = []
+                first_callsign = False
+                first_freq = False
 
             if airspace:
                 last_df_in_title = df_in_title
                 last_airspace = airspace
-            row += 1
-        df_uir = df_fir # UIR is same extent as FIR
 
-        return [df_fir, df_uir, df_cta, df_tma, df_atz]
+        # the last airspace on the page has no title after it to trigger the output
+        if space and last_airspace:
+            emit()
+        logger.debug("Arc cache {}", Geo.arc_cache.stats())
+
+        return airspaces
 
     def parse_enr03_data(self, section:str) -> pd.DataFrame:
         """Parse the data from ENR-3"""
 
         df_columns = ['name', 'route']
-        df_enr_3 = pd.DataFrame(columns=df_columns)
         logger.info("Parsing "+ self.country +"-ENR-3."+ section +" data to obtain ATS routes...")
-        get_enr_3 = self.get_table_soup(self.country + "-ENR-3."+ section +"-en-GB.html")
+        rows = next(self.parse_pages(self.parse_enr03_page, [self.page_name("ENR-3." + section)], streamable=True))
+
+        return pd.DataFrame(rows, columns=df_columns, dtype=object)
+
+    def parse_enr03_page(self, get_enr_3:BeautifulSoup) -> list:
+        """Parse the ATS routes from an ENR-3 page"""
+
+        rows = []
         list_tables = get_enr_3.find_all("tbody")
 
         for row in list_tables:
@@ -510,19 +718,23 @@ class Webscrape:
             if get_airway_name:
                 for point in get_airway_route:
                     print_route += str(point[0]) + "/"
-                df_out = {'name': str(get_airway_name[0]), 'route': str(print_route).rstrip('/')}
-                df_out = pd.DataFrame(df_out, columns=df_columns, index=[0])
-                df_enr_3 = pd.concat([df_enr_3, df_out], ignore_index=True)
+                rows.append({'name': str(get_airway_name[0]), 'route': str(print_route).rstrip('/')})
 
-        return df_enr_3
+        return rows
 
     def parse_enr04_data(self, sub:str) -> pd.DataFrame:
         """Parse the data from ENR-4"""
 
         df_columns = ['name', 'type', 'coords', 'freq']
-        df = pd.DataFrame(columns=df_columns)
         logger.info("Parsing "+ self.country +"-ENR-4."+ sub +" Data (RADIO NAVIGATION AIDS - EN-ROUTE)...")
-        get_data = self.get_table_soup(self.country + "-ENR-4."+ sub +"-en-GB.html")
+        rows = next(self.parse_pages(self.parse_enr04_page, [self.page_name("ENR-4." + sub)], [(sub,)], streamable=True))
+
+        return pd.DataFrame(rows, columns=df_columns, dtype=object)
+
+    def parse_enr04_page(self, get_data:BeautifulSoup, sub:str) -> list:
+        """Parse the navaids (ENR-4.1) or fixes (ENR-4.4) from an ENR-4 page"""
+
+        rows = []
         list_data = get_data.find_all("tr", class_ = "Table-row-type-3")
 
         for row in list_data:
@@ -566,78 +778,175 @@ class Webscrape:
                     # Add fix to the aerodromeDB
                     df_out = {'name': str(name[1]), 'type': 'FIX', 'coords': str(full_location), 'freq': '000.000'}
 
-                df_out = pd.DataFrame(df_out, columns=df_columns, index=[0])
-                df = pd.concat([df, df_out], ignore_index=True)
+                rows.append(df_out)
 
-        return df
+        return rows
 
     def parse_enr051_data(self) -> pd.DataFrame:
         """Parse the data from ENR-5-1"""
 
         df_columns = ['name', 'boundary', 'floor', 'ceiling']
-        df_enr_05 = pd.DataFrame(columns=df_columns)
         logger.info("Parsing "+ self.country +"-ENR-5.1 data for PROHIBITED, RESTRICTED AND DANGER AREAS...")
-        get_enr_05 = self.get_table_soup(self.country + "-ENR-5.1-en-GB.html")
+        rows = next(self.parse_pages(self.parse_enr051_page, [self.page_name("ENR-5.1")], streamable=True))
+
+        # the boundaries of every area are assembled together once the whole page has been read
+        boundaries = AreaGeometry([row['parts'] for row in rows]).boundaries()
+        rows = [dict(row, boundary=boundary) for row, boundary in zip(rows, boundaries)]
+
+        return pd.DataFrame(rows, columns=df_columns, dtype=object)
+
+    def parse_enr051_page(self, get_enr_05:BeautifulSoup) -> list:
+        """Parse the prohibited, restricted and danger areas from ENR-5.1"""
+
+        rows = []
         list_tables = get_enr_05.find_all("tr")
 
         for row in list_tables:
-            get_id = self.search(r"((EG)\s(D|P|R)[\d]{3}[A-Z]*)", "TAIRSPACE;CODE_ID", str(row))
+            get_id = self.search(r"((" + re.escape(self.country) + r")\s(D|P|R)[\d]{3}[A-Z]*)", "TAIRSPACE;CODE_ID", str(row))
             get_name = self.search(r"([A-Z\s]*)", "TAIRSPACE;TXT_NAME", str(row))
-            get_loc = self.search(r"([\d]{6,7})([N|E|S|W]{1})", "TAIRSPACE_VERTEX;GEO_L", str(row))
-            get_upper = self.search(r"([\d]{3,5})", "TAIRSPACE_VOLUME;VAL_DIST_VER_UPPER", str(row))
-            #getLower = self.search("([\d]{3,5})|(SFC)", "TAIRSPACE_VOLUME;VAL_DIST_VER_LOWER", str(row))
 
             if get_id:
-                for upper in get_upper:
-                    up = upper
-                df_out = {'name': str(get_id[0][0]) + ' ' + str(get_name[2]), 'boundary': "NONE", 'floor': 0, 'ceiling': str(up)}
-                df_out = pd.DataFrame(df_out, columns=df_columns, index=[0])
-                df_enr_05 = pd.concat([df_enr_05, df_out], ignore_index=True)
+                area = tokenize_enr051(text for text in row.find_all(string=True) if text.strip())
+                rows.append({'name': str(get_id[0][0]) + ' ' + str(get_name[2]), 'parts': area['parts'], 'floor': area['floor'], 'ceiling': area['ceiling']})
+
+        return rows
+
+    @staticmethod
+    def resolve_sections(sections:list=None) -> list:
+        """Return the requested sections plus anything they depend on, in run order"""
 
-        return df_enr_05
+        if sections is None:
+            return list(config.SECTIONS)
 
-    def run(self) -> pd.DataFrame:
-        """Parses all(ish) of the eAIP"""
+        required = set()
+        for section in sections:
+            if section not in config.SECTIONS:
+                raise ValueError(f"Unknown eAIP section {section}")
+            required.add(section)
+            required.update(config.SECTIONS[section])
 
-        full_dir = f"{config.WORK_DIR}\\DataFrames\\"
+        return [section for section in config.SECTIONS if section in required]
+
+    def run(self, sections:list=None, icao:list=None, output_dir:str=None) -> dict:
+        """Parses all(ish) of the eAIP, or just the given sections and aerodromes"""
+
+        full_dir = output_dir or f"{config.WORK_DIR}\\DataFrames\\"
         logger.debug("Output DIR is {}", full_dir)
 
-        ad_01 = self.parse_ad01_data() # returns single dataframe
-        ad_01.to_csv(f'{full_dir}ad_01.csv')
+        run_sections = self.resolve_sections(sections)
+        logger.info("Running sections {} for the {} cycle", ", ".join(run_sections), self.cycle)
+        output = {}
+
+        if "AD-0.1" in run_sections:
+            ad_01 = self.stage("AD-0.1", self.parse_ad01_data) # returns single dataframe
+            output["AD-0.1"] = ad_01
+
+        if "AD-2" in run_sections:
+            if icao:
+                # only refresh the requested aerodromes
+                df_ad_01 = ad_01.loc[ad_01['icao_designator'].isin(icao)].copy()
+            else:
+                df_ad_01 = ad_01
+            ad_02 = self.stage("AD-2", lambda: self.parse_ad02_data(df_ad_01), icao) # returns df_ad_01, df_rwy, df_srv
+            ad_01.update(ad_02[0])
+            self.write_csv(ad_02[1], f'{full_dir}ad_02-Runways.csv', icao)
+            self.write_csv(ad_02[2], f'{full_dir}ad_02-Services.csv', icao)
+            self.write_csv(RunwayGeometry(ad_02[1]).centrelines(), f'{full_dir}ad_02-Centrelines.csv', icao)
+            output["AD-2"] = ad_02
+
+            self.write_csv(ad_01.loc[ad_01['icao_designator'].isin(df_ad_01['icao_designator'])], f'{full_dir}ad_01.csv', icao)
+        elif sections is None or "AD-0.1" in sections:
+            # only overwrite AD-0.1 if it was asked for, not when it was just loaded as a dependency
+            ad_01.to_csv(f'{full_dir}ad_01.csv')
+
+        if "ENR-1.6" in run_sections:
+            enr_016 = self.stage("ENR-1.6", lambda: self.parse_enr016_data(ad_01)) # returns single dataframe
+            enr_016.to_csv(f'{full_dir}enr_016.csv')
+            enr_016.attrs['unresolved'].to_csv(f'{full_dir}enr_016-Unresolved.csv')
+            output["ENR-1.6"] = enr_016
+
+        if "ENR-2.1" in run_sections:
+            enr_02 = self.stage("ENR-2.1", self.parse_enr02_data) # returns dfFir, dfUir, dfCta, dfTma
+            enr_02[0].to_csv(f'{full_dir}enr_02-FIR.csv')
+            enr_02[1].to_csv(f'{full_dir}enr_02-UIR.csv')
+            enr_02[2].to_csv(f'{full_dir}enr_02-CTA.csv')
+            enr_02[3].to_csv(f'{full_dir}enr_02-TMA.csv')
+            enr_02[4].to_csv(f'{full_dir}enr_02-ATZ.csv')
+            self.write_airspace_reports(enr_02, full_dir)
+            output["ENR-2.1"] = enr_02
+
+        # the ENR-3 and ENR-4 sections are one page each so fetch them all at once
+        enr_pages = [
+            self.page_name(section) for section in run_sections
+            if section.startswith(("ENR-3", "ENR-4")) and (self.checkpoint is None or not self.checkpoint.has_stage(self.stage_version, section))
+            ]
+        if len(enr_pages) > 1 and not self.stream:
+            self.prefetch(enr_pages)
+
+        for section in ("1", "3", "5"):
+            if f"ENR-3.{section}" in run_sections:
+                enr_03 = self.stage(f"ENR-3.{section}", lambda: self.parse_enr03_data(section)) # returns single dataframe
+                enr_03.to_csv(f'{full_dir}enr_03{section}.csv')
+                output[f"ENR-3.{section}"] = enr_03
+
+        for sub in ("1", "4"):
+            if f"ENR-4.{sub}" in run_sections:
+                enr_04 = self.stage(f"ENR-4.{sub}", lambda: self.parse_enr04_data(sub)) # returns single dataframe
+                enr_04.to_csv(f'{full_dir}enr_04{sub}.csv')
+                output[f"ENR-4.{sub}"] = enr_04
+
+        if "ENR-5.1" in run_sections:
+            enr_051 = self.stage("ENR-5.1", self.parse_enr051_data) # returns single dataframe
+            enr_051.to_csv(f'{full_dir}enr_051.csv')
+            output["ENR-5.1"] = enr_051
 
-        ad_02 = self.parse_ad02_data(ad_01) # returns df_ad_01, df_rwy, df_srv
-        ad_02[1].to_csv(f'{full_dir}ad_02-Runways.csv')
-        ad_02[2].to_csv(f'{full_dir}ad_02-Services.csv')
+        if self.store is not None:
+            self.store.save(self.cycle, output)
+        if self.checkpoint is not None:
+            # everything made it out so there is nothing left to resume
+            logger.debug("Resumed {}", self.checkpoint.stats())
+            self.checkpoint.clear()
 
-        enr_016 = self.parse_enr016_data(ad_01) # returns single dataframe
-        enr_016.to_csv(f'{full_dir}enr_016.csv')
+        return output
 
-        enr_02 = self.parse_enr02_data() # returns dfFir, dfUir, dfCta, dfTma
-        enr_02[0].to_csv(f'{full_dir}enr_02-FIR.csv')
-        enr_02[1].to_csv(f'{full_dir}enr_02-UIR.csv')
-        enr_02[2].to_csv(f'{full_dir}enr_02-CTA.csv')
-        enr_02[3].to_csv(f'{full_dir}enr_02-TMA.csv')
-        enr_02[4].to_csv(f'{full_dir}enr_02-ATZ.csv')
+    def stage(self, section:str, parse, *args):
+        """Run a section's parser, or pick up its output if an interrupted run already finished it"""
 
-        enr_031 = self.parse_enr03_data('1') # returns single dataframe
-        enr_031.to_csv(f'{full_dir}enr_031.csv')
+        if self.checkpoint is not None:
+            output = self.checkpoint.stage(self.stage_version, section, *args)
+            if output is not None:
+                return output
 
-        enr_033 = self.parse_enr03_data('3') # returns single dataframe
-        enr_033.to_csv(f'{full_dir}enr_033.csv')
+        output = parse()
+        if self.checkpoint is not None:
+            self.checkpoint.save_stage(self.stage_version, section, output, *args)
 
-        enr_035 = self.parse_enr03_data('5') # returns single dataframe
-        enr_035.to_csv(f'{full_dir}enr_035.csv')
+        return output
 
-        enr_041 = self.parse_enr04_data('1') # returns single dataframe
-        enr_041.to_csv(f'{full_dir}enr_041.csv')
+    @staticmethod
+    def write_airspace_reports(enr_02:list, full_dir:str) -> None:
+        """Build the ENR-2.1 polygons and write out any that were invalid, overlapped or left gaps"""
+
+        import shapely
 
-        enr_044 = self.parse_enr04_data('4') # returns single dataframe
-        enr_044.to_csv(f'{full_dir}enr_044.csv')
+        geometry = AirspaceGeometry(enr_02)
+        geometry.invalid().to_csv(f'{full_dir}enr_02-Invalid.csv')
+        geometry.overlaps().to_csv(f'{full_dir}enr_02-Overlaps.csv')
+        geometry.gaps().to_csv(f'{full_dir}enr_02-Gaps.csv')
 
-        enr_051 = self.parse_enr051_data() # returns single dataframe
-        enr_051.to_csv(f'{full_dir}enr_051.csv')
+        unions = geometry.unions()
+        unions['polygon'] = shapely.to_wkt(geometry.to_lonlat(unions['polygon']), rounding_precision=6)
+        unions.to_csv(f'{full_dir}enr_02-Unions.csv')
 
-        return [ad_01, ad_02, enr_016, enr_02, enr_031, enr_033, enr_035, enr_041, enr_044, enr_051]
+    @staticmethod
+    def write_csv(df:pd.DataFrame, path:str, icao:list=None) -> None:
+        """Write a dataframe to CSV, replacing only the given aerodromes if the file already exists"""
+
+        if icao and os.path.exists(path):
+            existing = pd.read_csv(path, index_col=0, dtype=str)
+            existing = existing.loc[~existing['icao_designator'].isin(icao)]
+            df = pd.concat([existing, df.astype(str)], ignore_index=True)
+        df.to_csv(path)
 
     @staticmethod
     def search(find, name, string):
@@ -0,0 +1,178 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import numpy as np
+from loguru import logger
+
+# Local Imports
+from .functions import METRES_PER_NM, Geo
+
+EARTH_RADIUS_M = 6371008.8
+# A great circle distance on the mean sphere is within about half a percent of the WGS84 distance
+SPHERE_MARGIN = 1.01
+
+
+def to_unit_vectors(lats, lons) -> np.ndarray:
+    """Convert decimal degree lat/lon to points on a unit sphere so straight line distance tracks great circle distance"""
+
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lons = np.radians(np.asarray(lons, dtype=float))
+    cos_lat = np.cos(lats)
+
+    return np.column_stack((cos_lat * np.cos(lons), cos_lat * np.sin(lons), np.sin(lats)))
+
+
+def nm_to_chord(distance:float) -> float:
+    """Convert a great circle distance in NM to a straight line distance on the unit sphere"""
+
+    return 2 * np.sin(min(distance * METRES_PER_NM / EARTH_RADIUS_M, np.pi) / 2)
+
+
+class PointIndex:
+    '''Class to find the nearest navaids and fixes to any position'''
+
+    def __init__(self, frames:list):
+        names = []
+        types = []
+        lats = []
+        lons = []
+        for df_points in frames:
+            for name, point_type, coords in zip(df_points['name'], df_points['type'], df_points['coords']):
+                try:
+                    lat, lon = Geo.sct2dd(coords)
+                except ValueError as err:
+                    logger.warning(err)
+                    continue
+                names.append(str(name))
+                types.append(str(point_type))
+                lats.append(lat)
+                lons.append(lon)
+
+        self.names = np.array(names, dtype=object)
+        self.types = np.array(types, dtype=object)
+        self.lats = np.array(lats, dtype=float)
+        self.lons = np.array(lons, dtype=float)
+        self.vectors = to_unit_vectors(self.lats, self.lons)
+
+        self.by_name = {}
+        for position, name in enumerate(names):
+            self.by_name.setdefault(name, []).append(position)
+
+        # scipy is optional, without it queries fall back to a brute force search in numpy
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            logger.debug("scipy is not installed, nearest point queries will use a brute force search")
+            self.tree = None
+        else:
+            self.tree = cKDTree(self.vectors) if len(names) else None
+
+        logger.debug("Indexed {} points", len(names))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, name:str) -> list:
+        """Return every point with the given identifier"""
+
+        return [
+            {'name': self.names[position], 'type': self.types[position], 'lat': float(self.lats[position]), 'lon': float(self.lons[position])}
+            for position in self.by_name.get(name, [])
+            ]
+
+    def query_chords(self, vectors:np.ndarray, k:int) -> list:
+        """Find the k closest points to each vector, returning straight line distances and positions"""
+
+        if self.tree is not None:
+            chords, positions = self.tree.query(vectors, k=k)
+            return [chords.reshape(len(vectors), k), positions.reshape(len(vectors), k)]
+
+        chords = np.empty((len(vectors), k))
+        positions = np.empty((len(vectors), k), dtype=int)
+        # do this in chunks so the distance matrix doesn't get too big
+        chunk = max(1, 2_000_000 // max(len(self), 1))
+        for start in range(0, len(vectors), chunk):
+            block = vectors[start:start + chunk]
+            distances = np.linalg.norm(block[:, None, :] - self.vectors[None, :, :], axis=2)
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k] if k < len(self) else np.tile(np.arange(len(self)), (len(block), 1))
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1)
+            positions[start:start + chunk] = np.take_along_axis(nearest, order, axis=1)
+            chords[start:start + chunk] = np.take_along_axis(nearest_distances, order, axis=1)
+
+        return [chords, positions]
+
+    def nearest(self, lats, lons, k:int=1) -> list:
+        """Return the names and WGS84 distances in NM of the k closest points to each position"""
+
+        if len(self) == 0:
+            raise ValueError("There are no points in the index")
+
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        k = min(k, len(self))
+
+        # take a couple of spare candidates from the sphere then rank them on the ellipsoid
+        candidates = min(k + 2, len(self))
+        _, positions = self.query_chords(to_unit_vectors(lats, lons), candidates)
+
+        distances = self.distances(np.repeat(lats, candidates), np.repeat(lons, candidates), positions.ravel()).reshape(positions.shape)
+        order = np.argsort(distances, axis=1)[:, :k]
+        positions = np.take_along_axis(positions, order, axis=1)
+        distances = np.take_along_axis(distances, order, axis=1)
+
+        return [self.names[positions], distances]
+
+    def within(self, lats, lons, radius:float) -> list:
+        """Return the names and WGS84 distances in NM of every point within the radius (NM) of each position"""
+
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        vectors = to_unit_vectors(lats, lons)
+        # gather candidates on the sphere a little beyond the radius, then measure them on the ellipsoid the same as nearest()
+        chord = nm_to_chord(radius * SPHERE_MARGIN)
+
+        if self.tree is not None:
+            matches = [np.asarray(positions, dtype=int) for positions in self.tree.query_ball_point(vectors, chord)]
+        else:
+            matches = [np.nonzero(np.linalg.norm(self.vectors - vector, axis=1) <= chord)[0] for vector in vectors]
+
+        counts = [len(positions) for positions in matches]
+        positions = np.concatenate(matches) if matches else np.empty(0, dtype=int)
+        distances = self.distances(np.repeat(lats, counts), np.repeat(lons, counts), positions)
+
+        results = []
+        for start, end in zip(np.cumsum(counts) - counts, np.cumsum(counts)):
+            inside = start + np.nonzero(distances[start:end] <= radius)[0]
+            inside = inside[np.argsort(distances[inside])]
+            results.append(list(zip(self.names[positions[inside]], distances[inside])))
+
+        return results
+
+    def distances(self, lats:np.ndarray, lons:np.ndarray, positions:np.ndarray) -> np.ndarray:
+        """WGS84 distance in NM from each position to the indexed point at the same place in positions"""
+
+        # pyproj is slow to import so only load it when a query is made
+        from pyproj import Geod
+
+        if len(positions) == 0:
+            return np.empty(0)
+
+        return Geod(ellps="WGS84").inv(lons, lats, self.lons[positions], self.lats[positions])[2] / METRES_PER_NM
+
+    def snap(self, lats, lons, max_distance:float=None) -> list:
+        """Snap each position to the name of the closest point, or None if nothing is within max_distance (NM)"""
+
+        names, distances = self.nearest(lats, lons, 1)
+        snapped = []
+        for name, distance in zip(names[:, 0], distances[:, 0]):
+            if max_distance is not None and distance > max_distance:
+                snapped.append(None)
+            else:
+                snapped.append(name)
+
+        return snapped
@@ -0,0 +1,419 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import cos, radians, sin
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+from .airac import BASE_POST_STRING
+
+# Roughly the size of the UK eAIP, multiplied by the scale given to the stand-in
+UK_COUNTS = {
+    'aerodromes': 150,
+    'navaids': 120,
+    'fixes': 2500,
+    'airways': 350,
+    'airspaces': 200,
+    'areas': 450,
+    }
+
+SYLLABLES = ["KA", "LO", "RI", "BE", "NU", "TA", "SO", "MI", "DE", "VA", "ZU", "PE", "GO", "LI", "RA", "HE"]
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+SERVICES = ["TOWER", "APPROACH", "GROUND", "RADAR", "INFORMATION", "RADIO", "DELIVERY"]
+AREA_TYPES = ["D", "R", "P"]
+
+
+def word(number:int, syllables:int=3) -> str:
+    """A pronounceable made up name, unique for each number below 16 ** syllables"""
+
+    letters = ""
+    for _ in range(syllables):
+        letters += SYLLABLES[number % len(SYLLABLES)]
+        number //= len(SYLLABLES)
+
+    return letters
+
+
+def code(number:int, length:int) -> str:
+    """A unique identifier of capital letters, spread out so neighbouring numbers don't look alike"""
+
+    space = len(LETTERS) ** length
+    number = (number * 7919 + 104729) % space
+    letters = ""
+    for _ in range(length):
+        letters = LETTERS[number % len(LETTERS)] + letters
+        number //= len(LETTERS)
+
+    return letters
+
+
+def dms(value:float, lon:bool=False, decimals:bool=False) -> str:
+    """Format decimal degrees the way the eAIP does, eg 512839N, 0002741W or 512838.48N"""
+
+    hemisphere = ("E" if value >= 0 else "W") if lon else ("N" if value >= 0 else "S")
+    hundredths = round(abs(value) * 360000)
+    degrees, hundredths = divmod(hundredths, 360000)
+    minutes, hundredths = divmod(hundredths, 6000)
+    seconds, hundredths = divmod(hundredths, 100)
+    text = f"{degrees:03d}" if lon else f"{degrees:02d}"
+    text += f"{minutes:02d}{seconds:02d}"
+    if decimals:
+        text += f".{hundredths:02d}"
+
+    return text + hemisphere
+
+
+class StandIn:
+    '''Class to generate synthetic eAIP pages in the same markup the parsers read from the real thing'''
+
+    def __init__(self, country:str="EG", scale:float=1.0, seed:int=0, **counts):
+        self.country = country
+        self.seed = seed
+        self.counts = {name: max(1, int(count * scale)) for name, count in UK_COUNTS.items()}
+        self.counts.update({name: count for name, count in counts.items() if count is not None})
+        if self.counts['aerodromes'] > len(LETTERS) ** 2:
+            # ICAO designators are the country code plus two letters
+            logger.warning("Only {} aerodromes can be generated for {}", len(LETTERS) ** 2, country)
+            self.counts['aerodromes'] = len(LETTERS) ** 2
+
+        self.next_id = 1000000
+        self.id_lock = threading.Lock()
+        self.pages = {}
+        self.page_lock = threading.Lock()
+
+        rng = random.Random(seed)
+        self.aerodromes = [
+            {'icao': country + code(number, 2), 'name': word(number), 'lat': rng.uniform(50.0, 58.5), 'lon': rng.uniform(-6.0, 1.5)}
+            for number in range(self.counts['aerodromes'])
+            ]
+        self.navaids = [
+            {'name': code(number, 3), 'type': rng.choice(["VORDME", "VOR", "DME", "NDB"]), 'lat': rng.uniform(49.5, 60.5), 'lon': rng.uniform(-8.0, 2.0)}
+            for number in range(self.counts['navaids'])
+            ]
+        self.fixes = [
+            {'name': code(number, 5), 'lat': rng.uniform(49.5, 60.5), 'lon': rng.uniform(-8.0, 2.0)}
+            for number in range(self.counts['fixes'])
+            ]
+
+    def span(self, value:str, name:str) -> str:
+        """A value and the span naming the field it belongs to, on one line as the parsers expect"""
+
+        with self.id_lock:
+            self.next_id += 1
+            span_id = self.next_id
+
+        return f'<span class="SD" id="ID_{span_id}">{value}</span><span class="sdParams">{name}</span>\n'
+
+    @staticmethod
+    def document(title:str, body:str) -> str:
+        """Wrap a page body up as an eAIP page"""
+
+        return f'<!DOCTYPE html>\n<html><head><title>{title}</title></head><body>\n{body}</body></html>\n'
+
+    def page(self, name:str) -> bytes:
+        """Return the page with the given file name, or None if there isn't one"""
+
+        with self.page_lock:
+            if name in self.pages:
+                return self.pages[name]
+
+        prefix = self.country + "-"
+        suffix = "-en-GB.html"
+        if not (name.startswith(prefix) and name.endswith(suffix)):
+            return None
+        section = name[len(prefix):-len(suffix)]
+
+        icaos = {aerodrome['icao'] for aerodrome in self.aerodromes}
+        if section == "AD-0.1":
+            source = self.ad01()
+        elif section.startswith("AD-2.") and section[5:] in icaos:
+            source = self.ad02(section[5:])
+        elif section == "ENR-1.6":
+            source = self.enr016()
+        elif section == "ENR-2.1":
+            source = self.enr021()
+        elif section in ("ENR-3.1", "ENR-3.3", "ENR-3.5"):
+            source = self.enr03(section[-1])
+        elif section in ("ENR-4.1", "ENR-4.4"):
+            source = self.enr04(section[-1])
+        elif section == "ENR-5.1":
+            source = self.enr051()
+        else:
+            return None
+
+        data = self.document(section, source).encode("utf-8")
+        with self.page_lock:
+            self.pages[name] = data
+
+        return data
+
+    def ad01(self) -> str:
+        """The list of aerodromes"""
+
+        rows = []
+        for aerodrome in self.aerodromes:
+            rows.append(f'<h3 class="Title"><a href="{self.country}-AD-2.{aerodrome["icao"]}-en-GB.html">{aerodrome["icao"]}\n  -    \n        {aerodrome["name"]}\n      </a></h3>\n')
+
+        return "".join(rows)
+
+    def ad02(self, icao:str) -> str:
+        """A single aerodrome page with its location, runways and services"""
+
+        number = [aerodrome['icao'] for aerodrome in self.aerodromes].index(icao)
+        aerodrome = self.aerodromes[number]
+        rng = random.Random(f"{self.seed}-{icao}")
+
+        mag_var = f"{rng.uniform(0, 3):.2f}°{rng.choice('WE')}"
+        elevation = rng.randint(0, 900)
+        parts = [f'<div id="{icao}-AD-2.2">\n']
+        parts.append(self.span(mag_var, "TAD_HP;VAL_MAG_VAR"))
+        parts.append(f'Lat: {self.span(dms(aerodrome["lat"]), "TAD_HP;GEO_LAT")}')
+        parts.append(f'Long: {self.span(dms(aerodrome["lon"], lon=True), "TAD_HP;GEO_LONG")}')
+        parts.append(self.span(f"{elevation} FT", f"TAD_HP;VAL_ELEV;{elevation}"))
+        parts.append('</div>\n')
+
+        parts.append(f'<div id="{icao}-AD-2.12">\n')
+        for _ in range(rng.randint(1, 3)):
+            heading = rng.randint(1, 18)
+            bearing = heading * 10 + rng.uniform(-4, 4)
+            length = rng.randint(600, 3900)
+            # the two ends of the runway, each a little way from the aerodrome reference point
+            offset = length / 2 / 111320
+            for end, direction in ((heading, bearing), (heading + 18, bearing + 180)):
+                back = radians(direction + 180)
+                lat = aerodrome['lat'] + offset * cos(back)
+                lon = aerodrome['lon'] + offset * sin(back) / cos(radians(aerodrome['lat']))
+                parts.append(self.span(f"{end:02d}", "TRWY_DIRECTION;TXT_DESIG"))
+                parts.append(self.span(dms(lat, decimals=True), "TRWY_CLINE_POINT;GEO_LAT"))
+                parts.append(self.span(dms(lon, lon=True, decimals=True), "TRWY_CLINE_POINT;GEO_LONG"))
+                parts.append(self.span(f"{rng.uniform(0, 900):05.1f}", "TRWY_CLINE_POINT;VAL_ELEV"))
+                parts.append(self.span(f"{direction % 360:06.2f}°", "TRWY_DIRECTION;VAL_TRUE_BRG"))
+                parts.append(self.span(str(length), "TRWY;VAL_LEN"))
+        parts.append('</div>\n')
+
+        parts.append(f'<div id="{icao}-AD-2.18">\n')
+        for service in rng.sample(SERVICES, rng.randint(1, 4)):
+            parts.append(self.span(service, "TCALLSIGN_DETAIL"))
+            parts.append(self.span(f"{rng.randint(118, 136)}.{rng.choice(range(0, 1000, 5)):03d}", "TFREQUENCY"))
+        parts.append('</div>\n')
+
+        return "".join(parts)
+
+    def enr016(self) -> str:
+        """The SSR code allocations, a block of codes for each aerodrome plus a few discrete codes"""
+
+        rng = random.Random(f"{self.seed}-ENR-1.6")
+        rows = ['<div id="ENR-1.6.2.6"><table>\n']
+        code_number = 0o0100
+        for aerodrome in self.aerodromes:
+            size = rng.choice([8, 16, 32])
+            if code_number + size > 0o7777:
+                break
+            words = f"{aerodrome['name'].title()} {rng.choice(['Departures', 'Arrivals', 'Conspicuity'])}"
+            rows.append(f'<tr><td><p>{code_number:04o} — {code_number + size - 1:04o}</p></td><td><p>{words}</p></td></tr>\n')
+            if rng.random() < 0.1:
+                rows.append(f'<tr><td><p>{code_number + size - 1:04o}</p></td><td><p>{words}</p></td></tr>\n')
+            code_number += size
+        rows.append('</table></div>\n')
+
+        return "".join(rows)
+
+    def vertex(self, lat:float, lon:float, arc:bool=False) -> str:
+        """A boundary vertex, or the centre of an arc"""
+
+        tag = "_ARC" if arc else ";" + str(random.Random(lat).randint(1000, 9999))
+
+        return self.span(dms(lat), f"TAIRSPACE_VERTEX;GEO_LAT{tag}") + self.span(dms(lon, lon=True), f"TAIRSPACE_VERTEX;GEO_LONG{tag}")
+
+    def enr021(self) -> str:
+        """The FIR, CTAs, TMAs and ATZs, some of them with arcs"""
+
+        rng = random.Random(f"{self.seed}-ENR-2.1")
+        parts = []
+
+        def header(title, name):
+            parts.append(self.span(title, "TAIRSPACE;TXT_NAME"))
+            parts.append(self.span(f"{name} CONTROL", "TUNIT;TXT_NAME"))
+            parts.append(self.span(f"1{rng.randint(18, 35)}.{rng.choice(range(0, 1000, 25)):03d}", "TFREQUENCY;VAL_FREQ_TRANS"))
+
+        # one FIR covering everything
+        header("LONDON FIR", "LONDON")
+        for corner in ((49.5, -8.0), (60.5, -8.0), (60.5, 2.0), (49.5, 2.0)):
+            parts.append(self.vertex(*corner))
+
+        for number in range(self.counts['airspaces']):
+            aerodrome = self.aerodromes[number % len(self.aerodromes)]
+            kind = ["CTA", "TMA", "ATZ"][number % 3]
+            size = {'CTA': 0.4, 'TMA': 0.6, 'ATZ': 0.05}[kind]
+            title = f"{aerodrome['name']} {kind} {number // len(self.aerodromes) + 1}"
+            arc = rng.random() < 0.5
+            clockwise = rng.random() < 0.5
+
+            parts.append(f'<p><span class="SD" id="ID_{10000000 + number}">{title}</span></p>\n')
+            if arc:
+                parts.append(f'<p> then {"clockwise" if clockwise else "anti-clockwise"} by the arc of a circle </p>\n')
+            header(title, aerodrome['name'])
+
+            # a box around the aerodrome, the eastern side is an arc centred on the middle of that side. The box is
+            # walked clockwise for a clockwise arc and anti-clockwise otherwise so the arc always bows out of it
+            lat, lon = aerodrome['lat'], aerodrome['lon']
+            north_east, south_east = (lat + size, lon + size), (lat - size, lon + size)
+            parts.append(self.vertex(lat - size, lon - size))
+            if clockwise:
+                parts.append(self.vertex(lat + size, lon - size))
+                parts.append(self.vertex(*north_east))
+            else:
+                parts.append(self.vertex(*south_east))
+            if arc:
+                parts.append(self.span(str(round(size * 60, 1)), "TAIRSPACE_VERTEX;VAL_RADIUS_ARC"))
+                parts.append(self.vertex(lat, lon + size, arc=True))
+            if clockwise:
+                parts.append(self.vertex(*south_east))
+            else:
+                parts.append(self.vertex(*north_east))
+                parts.append(self.vertex(lat + size, lon - size))
+
+        return "".join(parts)
+
+    def enr03(self, section:str) -> str:
+        """The ATS routes, each a run of fixes and navaids"""
+
+        rng = random.Random(f"{self.seed}-ENR-3.{section}")
+        points = [fix['name'] for fix in self.fixes] + [navaid['name'] for navaid in self.navaids]
+        airways = self.counts['airways'] // 3 or 1
+        prefix = {"1": "LNMPQ", "3": "UN", "5": "Y"}[section]
+        tables = ['<table>\n']
+        for number in range(airways):
+            designator = f"{prefix[number % len(prefix)]}{number + 1}"
+            route = rng.sample(points, min(len(points), rng.randint(2, 12)))
+            rows = [self.span(designator, "TEN_ROUTE_RTE;TXT_DESIG")]
+            for point in route:
+                point_type = "DESIGNATED_POINT" if len(point) == 5 else "VOR"
+                rows.append(self.span(point, f"T{point_type};CODE_ID"))
+            tables.append(f'<tbody><tr><td>\n{"".join(rows)}</td></tr></tbody>\n')
+        tables.append('</table>\n')
+
+        return "".join(tables)
+
+    def enr04(self, sub:str) -> str:
+        """The navaids (ENR-4.1) or fixes (ENR-4.4)"""
+
+        rng = random.Random(f"{self.seed}-ENR-4.{sub}")
+        rows = ['<table>\n']
+        if sub == "1":
+            for navaid in self.navaids:
+                rows.append(f'<tr class="Table-row-type-3" id="ENR-{navaid["type"]}-{navaid["name"]}"><td>\n')
+                rows.append(self.span(f"{rng.randint(108, 117)}.{rng.choice(range(0, 1000, 50)):03d}", "TVOR;VAL_FREQ"))
+                rows.append(self.span(dms(navaid['lat'], decimals=True), "TVOR;GEO_LAT"))
+                rows.append(self.span(dms(navaid['lon'], lon=True, decimals=True), "TVOR;GEO_LONG"))
+                rows.append('</td></tr>\n')
+        else:
+            for fix in self.fixes:
+                rows.append(f'<tr class="Table-row-type-3" id="ENR-{fix["name"]}"><td>\n')
+                rows.append(self.span(dms(fix['lat']), "TDESIGNATED_POINT;GEO_LAT"))
+                rows.append(self.span(dms(fix['lon'], lon=True), "TDESIGNATED_POINT;GEO_LONG"))
+                rows.append('</td></tr>\n')
+        rows.append('</table>\n')
+
+        return "".join(rows)
+
+    def enr051(self) -> str:
+        """The prohibited, restricted and danger areas"""
+
+        rng = random.Random(f"{self.seed}-ENR-5.1")
+        rows = ['<table>\n']
+        for number in range(self.counts['areas']):
+            designator = f"{self.country} {AREA_TYPES[number % 3]}{number % 1000:03d}{LETTERS[number // 1000 - 1] if number >= 1000 else ''}"
+            lat = rng.uniform(50.0, 58.5)
+            lon = rng.uniform(-6.0, 1.5)
+            size = rng.uniform(0.02, 0.3)
+            rows.append('<tr><td>\n')
+            rows.append(self.span(designator, "TAIRSPACE;CODE_ID"))
+            # the kind of area is printed ahead of the name, the parser takes the name from after it
+            kind = {"D": "DANGER AREA", "R": "RESTRICTED AREA", "P": "PROHIBITED AREA"}[AREA_TYPES[number % 3]]
+            rows.append(f'<span class="SD" id="ID_{10000000 + number}">{kind}</span>' + self.span(f"{word(number, 2)} RANGE", "TAIRSPACE;TXT_NAME"))
+            shape = rng.random()
+            if shape < 0.3:
+                # a circle around a range or a site
+                rows.append('A circle, ' + self.span(str(round(size * 30, 1)), "TAIRSPACE_VERTEX;VAL_RADIUS_ARC"))
+                rows.append(self.span("NM", "TAIRSPACE_VERTEX;UOM_RADIUS_ARC") + ' radius centred at ')
+                rows.append(self.vertex(lat, lon, arc=True))
+            else:
+                rows.append(self.vertex(lat, lon))
+                rows.append(self.vertex(lat + size, lon))
+                rows.append(self.vertex(lat + size, lon + size))
+                if shape < 0.6:
+                    # the southern side bows out as an arc centred on the middle of the box
+                    rows.append(f'thence {rng.choice(["clockwise", "anti-clockwise"])} by the arc of a circle radius ')
+                    rows.append(self.span(str(round(size * 60 * 0.8, 1)), "TAIRSPACE_VERTEX;VAL_RADIUS_ARC") + ' NM centred on ')
+                    rows.append(self.vertex(lat + size / 2, lon + size / 2, arc=True) + ' to ')
+                rows.append(self.vertex(lat, lon + size))
+            if rng.random() < 0.3:
+                rows.append(self.span(str(rng.choice([55, 95, 195, 245])), "TAIRSPACE_VOLUME;VAL_DIST_VER_UPPER"))
+                rows.append(self.span("FL", "TAIRSPACE_VOLUME;UOM_DIST_VER_UPPER"))
+            else:
+                rows.append(self.span(str(rng.choice([2000, 5000, 10000, 23000])), "TAIRSPACE_VOLUME;VAL_DIST_VER_UPPER"))
+                rows.append(self.span("FT", "TAIRSPACE_VOLUME;UOM_DIST_VER_UPPER"))
+            rows.append(self.span(rng.choice(["SFC", "1000"]), "TAIRSPACE_VOLUME;VAL_DIST_VER_LOWER"))
+            rows.append(self.span("FT", "TAIRSPACE_VOLUME;UOM_DIST_VER_LOWER"))
+            rows.append('</td></tr>\n')
+        rows.append('</table>\n')
+
+        return "".join(rows)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    '''Class to serve stand-in pages, with optional latency and errors'''
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.error_rate and server.random.random() < server.error_rate:
+            self.send_response(server.random.choice([429, 503]))
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        # the cycle part of the path is ignored, any cycle is served the same pages
+        path = self.path.split("?")[0]
+        data = server.standin.page(path.rsplit("/", 1)[-1]) if BASE_POST_STRING in path else None
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.trace("{} {}", self.address_string(), format % args)
+
+
+def serve(standin:StandIn, host:str="127.0.0.1", port:int=0, latency:float=0.0, error_rate:float=0.0) -> ThreadingHTTPServer:
+    """Start a stand-in server in the background, the base URL to scrape it is http://host:port/"""
+
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.standin = standin
+    server.latency = latency
+    server.error_rate = error_rate
+    server.random = random.Random(standin.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info("Stand-in eAIP serving on http://{}:{}/", *server.server_address[:2])
+
+    return server
@@ -0,0 +1,229 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import sqlite3
+from datetime import date
+
+# 3rd Party Imports
+from loguru import logger
+
+# Local Imports
+
+# One table per kind of record. Every row is tagged with the AIRAC cycle it came from, tables without a
+# natural key are keyed on the position of the row within its part of the section instead
+TABLES = {
+    'aerodromes': {
+        'columns': ['icao_designator', 'verified', 'location', 'elevation', 'name', 'magnetic_variation'],
+        'key': ['icao_designator'],
+        'indexes': [['icao_designator'], ['name']],
+        },
+    'runways': {
+        'columns': ['icao_designator', 'runway', 'location', 'elevation', 'bearing', 'length'],
+        'key': ['icao_designator', 'runway'],
+        'indexes': [['icao_designator']],
+        },
+    'services': {
+        'columns': ['icao_designator', 'callsign_type', 'frequency'],
+        'key': ['icao_designator', 'callsign_type', 'frequency'],
+        'indexes': [['icao_designator']],
+        },
+    'ssr_codes': {
+        'columns': ['start', 'end', 'depart', 'arrive', 'string'],
+        'key': ['start', 'end', 'arrive', 'string'],
+        'indexes': [['arrive']],
+        },
+    'airspaces': {
+        'columns': ['type', 'seq', 'name', 'callsign', 'frequency', 'boundary', 'upper_fl', 'lower_fl'],
+        'key': ['type', 'seq'],
+        'indexes': [['name']],
+        },
+    'airways': {
+        'columns': ['section', 'seq', 'name', 'route'],
+        'key': ['section', 'seq'],
+        'indexes': [['name']],
+        },
+    'navaids': {
+        'columns': ['name', 'type', 'coords', 'freq'],
+        'key': ['name', 'type'],
+        'indexes': [['name']],
+        },
+    'fixes': {
+        'columns': ['name', 'type', 'coords', 'freq'],
+        'key': ['name'],
+        'indexes': [['name']],
+        },
+    'restricted_areas': {
+        'columns': ['name', 'boundary', 'floor', 'ceiling'],
+        'key': ['name'],
+        'indexes': [['name']],
+        },
+    }
+
+# Which tables each part of a section's output goes into, along with any columns that are fixed for that part
+SECTION_TABLES = {
+    "AD-0.1": [('aerodromes', {})],
+    "AD-2": [('aerodromes', {}), ('runways', {}), ('services', {})],
+    "ENR-1.6": [('ssr_codes', {})],
+    "ENR-2.1": [('airspaces', {'type': "FIR"}), ('airspaces', {'type': "UIR"}), ('airspaces', {'type': "CTA"}), ('airspaces', {'type': "TMA"}), ('airspaces', {'type': "ATZ"})],
+    "ENR-3.1": [('airways', {'section': "3.1"})],
+    "ENR-3.3": [('airways', {'section': "3.3"})],
+    "ENR-3.5": [('airways', {'section': "3.5"})],
+    "ENR-4.1": [('navaids', {})],
+    "ENR-4.4": [('fixes', {})],
+    "ENR-5.1": [('restricted_areas', {})],
+    }
+
+
+def quote(name:str) -> str:
+    """Quote a column name, some of them ('start', 'end') are SQL keywords"""
+
+    return '"' + name.replace('"', '""') + '"'
+
+
+def clean(value):
+    """SQLite can't store pandas' missing values or numpy scalars, convert them to plain Python"""
+
+    if value is None:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+
+    return value
+
+
+class Store:
+    '''Class to keep the scraped sections in an SQLite database so they can be looked up without loading whole CSVs'''
+
+    def __init__(self, path:str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.create()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Close the database"""
+
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def create(self) -> None:
+        """Create any tables and indexes that don't already exist"""
+
+        with self.connection:
+            for table, spec in TABLES.items():
+                columns = ", ".join(quote(column) for column in ['cycle'] + spec['columns'])
+                key = ", ".join(quote(column) for column in ['cycle'] + spec['key'])
+                self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns}, PRIMARY KEY ({key}))")
+                for index in spec['indexes']:
+                    name = f"{table}_{'_'.join(index)}"
+                    self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(quote(column) for column in index)}, cycle)")
+
+    def upsert(self, table:str, cycle:str, rows:list, fixed:dict=None) -> int:
+        """Insert rows for a cycle, replacing any row that already has the same key"""
+
+        spec = TABLES[table]
+        fixed = fixed or {}
+        columns = ['cycle'] + spec['columns']
+        key = ['cycle'] + spec['key']
+        updates = [column for column in spec['columns'] if column not in spec['key']]
+
+        statement = f"INSERT INTO {table} ({', '.join(quote(column) for column in columns)}) VALUES ({', '.join('?' * len(columns))})"
+        statement += f" ON CONFLICT ({', '.join(quote(column) for column in key)}) DO "
+        if updates:
+            statement += "UPDATE SET " + ", ".join(f"{quote(column)} = excluded.{quote(column)}" for column in updates)
+        else:
+            statement += "NOTHING"
+
+        values = []
+        for seq, row in enumerate(rows):
+            record = dict(fixed, seq=seq)
+            record.update(row)
+            values.append([str(cycle)] + [clean(record.get(column)) for column in spec['columns']])
+        self.connection.executemany(statement, values)
+
+        if 'seq' in spec['key']:
+            # the rows are keyed on their position so clear out any left over from a longer earlier run
+            where = " AND ".join(f"{quote(column)} = ?" for column in fixed)
+            where = "cycle = ? AND seq >= ?" + (f" AND {where}" if where else "")
+            self.connection.execute(f"DELETE FROM {table} WHERE {where}", [str(cycle), len(values)] + list(fixed.values()))
+
+        return len(values)
+
+    def save(self, cycle:str, output:dict) -> None:
+        """Save the output of Webscrape.run() for the given cycle in one transaction"""
+
+        with self.connection:
+            for section, frames in output.items():
+                if not isinstance(frames, list):
+                    frames = [frames]
+                for (table, fixed), df in zip(SECTION_TABLES[section], frames):
+                    rows = df.to_dict("records")
+                    count = self.upsert(table, cycle, rows, fixed)
+                    logger.debug("Saved {} {} rows for {}", count, table, section)
+        logger.info("Saved {} to {}", ", ".join(output), self.path)
+
+    def cycles(self) -> list:
+        """Every cycle held in the database, oldest first"""
+
+        selects = " UNION ".join(f"SELECT cycle FROM {table}" for table in TABLES)
+
+        return [row[0] for row in self.connection.execute(f"SELECT cycle FROM ({selects}) ORDER BY cycle")]
+
+    def query(self, table:str, cycle:str=None, **filters) -> list:
+        """Return the rows of a table as dicts, for one cycle (the one in effect today if not given) and matching any column filters"""
+
+        if table not in TABLES:
+            raise ValueError(f"Unknown table {table}")
+        for column in filters:
+            if column not in TABLES[table]['columns']:
+                raise ValueError(f"{table} has no column {column}")
+
+        if cycle is None:
+            # cycles are prefetched before they come into effect so don't hand out one that hasn't started yet
+            latest = self.connection.execute(f"SELECT MAX(cycle) FROM {table} WHERE cycle <= ?", [str(date.today())]).fetchone()[0]
+            if latest is None:
+                latest = self.connection.execute(f"SELECT MAX(cycle) FROM {table}").fetchone()[0]
+            if latest is None:
+                return []
+            cycle = latest
+
+        where = ["cycle = ?"] + [f"{quote(column)} = ?" for column in filters]
+        order = ", ".join(quote(column) for column in TABLES[table]['key'])
+        rows = self.connection.execute(
+            f"SELECT * FROM {table} WHERE {' AND '.join(where)} ORDER BY {order}",
+            [str(cycle)] + list(filters.values())
+            )
+
+        return [dict(row) for row in rows]
+
+    def runways(self, icao:str, cycle:str=None) -> list:
+        """All the runways at an aerodrome"""
+
+        return self.query('runways', cycle, icao_designator=icao)
+
+    def services(self, icao:str, cycle:str=None) -> list:
+        """All the ATC services at an aerodrome"""
+
+        return self.query('services', cycle, icao_designator=icao)
+
+    def fix(self, name:str, cycle:str=None) -> list:
+        """Look up a fix or navaid by name"""
+
+        return self.query('fixes', cycle, name=name) + self.query('navaids', cycle, name=name)
+
+    def airway(self, name:str, cycle:str=None) -> list:
+        """Look up an airway by name, it may be listed in more than one ENR-3 section"""
+
+        return self.query('airways', cycle, name=name)
@@ -0,0 +1,165 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import codecs
+from collections import deque
+from html.parser import HTMLParser
+
+# 3rd Party Imports
+from bs4 import BeautifulSoup
+
+# Local Imports
+
+# Elements that never have a closing tag
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+    }
+
+
+class ElementStream(HTMLParser):
+    '''Class to pull matching elements out of an HTML document as it is read'''
+
+    def __init__(self, names:list, class_:str=None):
+        super().__init__(convert_charrefs=False)
+        self.names = set(names)
+        self.class_ = class_
+        self.capture = None
+        self.stack = []
+        self.completed = deque()
+
+    def matches(self, tag:str, attrs:list) -> bool:
+        """Does this start tag begin an element we are looking for?"""
+
+        if tag not in self.names:
+            return False
+        if self.class_ is None:
+            return True
+        classes = dict(attrs).get("class") or ""
+
+        return self.class_ in classes.split()
+
+    def finish(self) -> None:
+        """The element being captured has closed, queue it up"""
+
+        self.completed.append("".join(self.capture))
+        self.capture = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.capture is None:
+            if not self.matches(tag, attrs):
+                return
+            self.capture = []
+        self.capture.append(self.get_starttag_text())
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+        elif not self.stack:
+            self.finish()
+
+    def handle_startendtag(self, tag, attrs):
+        if self.capture is None:
+            if not self.matches(tag, attrs):
+                return
+            self.capture = []
+        self.capture.append(self.get_starttag_text())
+        if not self.stack:
+            self.finish()
+
+    def handle_endtag(self, tag):
+        if self.capture is None:
+            return
+        self.capture.append(f"</{tag}>")
+        if tag in self.stack:
+            while self.stack.pop() != tag:
+                pass
+        if not self.stack:
+            self.finish()
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.capture.append(data)
+
+    def handle_entityref(self, name):
+        if self.capture is not None:
+            self.capture.append(f"&{name};")
+
+    def handle_charref(self, name):
+        if self.capture is not None:
+            self.capture.append(f"&#{name};")
+
+    def handle_comment(self, data):
+        if self.capture is not None:
+            self.capture.append(f"<!--{data}-->")
+
+
+def decode_chunks(chunks, encoding:str="utf-8"):
+    """Decode a stream of bytes into text without splitting any characters"""
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield chunk
+            continue
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def iter_elements(chunks, names:list, class_:str=None):
+    """Yield each matching element, in document order, as soon as it has been read"""
+
+    parser = ElementStream(names, class_)
+
+    def drain():
+        while parser.completed:
+            fragment = BeautifulSoup(parser.completed.popleft(), "html.parser")
+            root = fragment.find(names)
+            if root is None:
+                continue
+            # nested matches are returned after their parent, the same as find_all on the full page
+            yield root
+            if class_ is None:
+                yield from root.find_all(names)
+            else:
+                yield from root.find_all(names, class_=class_)
+
+    for chunk in decode_chunks(chunks):
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+class StreamPage:
+    '''Class to stand in for a BeautifulSoup page, reading the page as a stream so only one find_all is allowed'''
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.used = False
+
+    def find_all(self, name, class_:str=None):
+        """Yield the matching elements as the page is read"""
+
+        if self.used:
+            raise RuntimeError("A streamed page can only be searched once")
+        self.used = True
+        names = [name] if isinstance(name, str) else list(name)
+
+        return iter_elements(self.chunks, names, class_)
@@ -0,0 +1,175 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import re
+from collections import namedtuple
+
+# 3rd Party Imports
+
+# Local Imports
+from .functions import METRES_PER_NM
+
+Token = namedtuple("Token", ["kind", "value"])
+
+# Token kinds found in the ENR-2.1 airspace tables
+TITLE = "title"
+CALLSIGN = "callsign"
+FREQUENCY = "frequency"
+VERTEX = "vertex"
+ARC = "arc"
+
+COORD_VALUE = re.compile(r"([\d]{6,7})(N|S|E|W)")
+FREQUENCY_VALUE = re.compile(r"(1[1-3]{1}[\d]{1}\.[\d]{3})")
+VERTEX_PARAM = re.compile(r"TAIRSPACE_VERTEX;GEO_L(?:AT|ONG);([\d]{4})")
+AIRSPACE_TYPE = re.compile(r"(ATZ|FIR|CTA|TMA|CTR)")
+
+
+def tokenize_enr02(texts) -> list:
+    """Turn the text of each ENR-2.1 <span> into a list of typed tokens and a list of every coordinate seen"""
+
+    # each value span is followed by a span naming the field it belongs to, so tokens are
+    # emitted when the field name is seen using the text of the span before it
+    tokens = []
+    coords = []
+    previous = ""
+    for text in texts:
+        if "TAIRSPACE;TXT_NAME" in text:
+            airspace_type = AIRSPACE_TYPE.search(previous)
+            tokens.append(Token(TITLE, (previous, airspace_type.group(1) if airspace_type else None)))
+        if "TUNIT;TXT_NAME" in text:
+            tokens.append(Token(CALLSIGN, previous))
+        if "TFREQUENCY;VAL_FREQ_TRANS" in text:
+            frequency = FREQUENCY_VALUE.fullmatch(previous)
+            if frequency:
+                tokens.append(Token(FREQUENCY, frequency.group(1)))
+        if "TAIRSPACE_VERTEX;VAL_RADIUS_ARC" in text:
+            # arcs point into the coordinate list so the start, centre and end can be found directly
+            tokens.append(Token(ARC, len(coords)))
+        if "TAIRSPACE_VERTEX;GEO_L" in text and VERTEX_PARAM.search(text):
+            vertex = COORD_VALUE.fullmatch(previous)
+            tokens.append(Token(VERTEX, (vertex.group(1), vertex.group(2)) if vertex else None))
+
+        coord = COORD_VALUE.fullmatch(text)
+        if coord:
+            coords.append((coord.group(1), coord.group(2)))
+        previous = text
+
+    return [tokens, coords]
+
+
+def find_arc_points(coords:list, index:int) -> list:
+    """Find the start, centre and end of an arc from the coordinates either side of it"""
+
+    # the start is the last lat/lon before the arc, the centre and end are the next two lat/lon pairs after it
+    def search(position, step, hemispheres):
+        while 0 <= position < len(coords):
+            if coords[position][1] in hemispheres:
+                return position
+            position += step
+        raise ValueError("Unable to find the arc coordinates")
+
+    start_lon = search(index - 1, -1, "EW")
+    start_lat = search(start_lon - 1, -1, "NS")
+    mid_lat = search(index, 1, "NS")
+    mid_lon = search(mid_lat + 1, 1, "EW")
+    end_lat = search(mid_lon + 1, 1, "NS")
+    end_lon = search(end_lat + 1, 1, "EW")
+
+    return [coords[position] for position in (start_lat, start_lon, mid_lat, mid_lon, end_lat, end_lon)]
+
+
+# Token kinds found in the ENR-5.1 area boundaries
+POINT = "point"
+CIRCLE = "circle"
+
+AREA_COORD_VALUE = re.compile(r"([\d]{6,7}(?:\.[\d]+)?)(N|S|E|W)")
+LIMIT_VALUE = re.compile(r"(FL)?\s*([\d]+)")
+FEET_PER_METRE = 3.28084
+
+
+def dms_to_degrees(digits:str, hemisphere:str) -> float:
+    """Convert an eAIP coordinate, eg 512839 N or 0002741.50 W, into decimal degrees"""
+
+    whole, _, decimals = digits.partition(".")
+    degrees = int(whole[:-4]) + int(whole[-4:-2]) / 60 + float(whole[-2:] + "." + (decimals or "0")) / 3600
+
+    return -degrees if hemisphere in "SW" else degrees
+
+
+def parse_limit(value:str, unit:str="") -> int:
+    """Turn a published vertical limit into feet, None if it is unlimited or can't be read"""
+
+    value = value.strip().upper()
+    unit = unit.strip().upper()
+    if value in ("SFC", "GND"):
+        return 0
+    limit = LIMIT_VALUE.search(value)
+    if value == "UNL" or limit is None:
+        return None
+
+    height = int(limit.group(2))
+    if limit.group(1) or unit == "FL":
+        return height * 100
+    if unit == "M":
+        return round(height * FEET_PER_METRE)
+
+    return height
+
+
+def tokenize_enr051(texts) -> dict:
+    """Turn the text of each string in an ENR-5.1 table row into the parts of the area's boundary and its limits"""
+
+    # as in ENR-2.1 each value is followed by a span naming its field, anything else is the text joining them up
+    parts = []
+    limits = {'upper': ["", ""], 'lower': ["", ""]}
+    lat = None
+    centre_lat = None
+    radius = None
+    clockwise = True
+    previous = ""
+    for text in texts:
+        if "TAIRSPACE_VERTEX;GEO_LAT" in text or "TAIRSPACE_VERTEX;GEO_LONG" in text:
+            coord = AREA_COORD_VALUE.fullmatch(previous.strip())
+            if coord:
+                value = dms_to_degrees(coord.group(1), coord.group(2))
+                if "_ARC" not in text:
+                    if coord.group(2) in "NS":
+                        lat = value
+                    elif lat is not None:
+                        parts.append(Token(POINT, (lat, value)))
+                        lat = None
+                elif coord.group(2) in "NS":
+                    centre_lat = value
+                elif centre_lat is not None:
+                    parts.append(Token(ARC, (clockwise, radius, centre_lat, value)))
+                    centre_lat = None
+                    radius = None
+                    clockwise = True
+        elif "TAIRSPACE_VERTEX;VAL_RADIUS_ARC" in text:
+            try:
+                radius = float(previous)
+            except ValueError:
+                radius = None
+        elif "TAIRSPACE_VERTEX;UOM_RADIUS_ARC" in text and radius is not None and previous.strip().upper() == "KM":
+            radius = radius * 1000 / METRES_PER_NM
+        elif "TAIRSPACE_VOLUME;VAL_DIST_VER_" in text:
+            limits["upper" if "UPPER" in text else "lower"][0] = previous
+        elif "TAIRSPACE_VOLUME;UOM_DIST_VER_" in text:
+            limits["upper" if "UPPER" in text else "lower"][1] = previous
+        elif "anti-clockwise" in text or "counter-clockwise" in text:
+            clockwise = False
+        elif "clockwise" in text:
+            clockwise = True
+        previous = text
+
+    # with no other vertices the centre and radius describe a whole circle rather than an arc between two of them
+    if not any(part.kind == POINT for part in parts):
+        parts = [Token(CIRCLE, part.value[1:]) for part in parts if part.kind == ARC]
+
+    return {
+        'parts': parts,
+        'floor': parse_limit(*limits['lower']) if limits['lower'][0] else 0,
+        'ceiling': parse_limit(*limits['upper']) if limits['upper'][0] else None
+        }
@@ -3,31 +3,37 @@ UK AIP Scraper
 """
 
 # Python Imports
+import csv
 import os
 import re
-import sys
 
 # 3rd Party Imports
-import pandas as pd
-import requests
-import urllib3
-from bs4 import BeautifulSoup
 from loguru import logger
 
 # Local Imports
 from . import config
-from .airac import Airac
-from .functions import Geo
-
-logger.remove()
-logger.add(sys.stderr, level="INFO")
 
 
 class Verify:
     """Class to verify VATSIM UK dataset with eAIP"""
 
-    def __init__(self) -> None:
+    def __init__(self, store=None, cycle:str=None) -> None:
         self.root_dir = "G:\\chris\\OneDrive\\Git Repo\\UK-Sector-File\\"
+        # read from the SQLite store if there is one, otherwise from the CSVs
+        self.store = store
+        self.cycle = cycle
+
+    def read_table(self, table:str, file_name:str, section:str) -> list:
+        """Load a scraped table as a list of dicts"""
+
+        if self.store is not None:
+            return self.store.query(table, self.cycle)
+
+        path = config.WORK_DIR + "\\DataFrames\\" + file_name
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{section} has not been scraped ({file_name} is missing), run 'scrape --sections {section}' first")
+
+        return read_csv(path)
 
     def aerodrome_check(self):
         """Check the aerodromes"""
@@ -44,14 +50,13 @@ class Verify:
                 e_aip_list.append(final_folder)
 
         # iterrate over AD01, popping any matches
-        ad01_df = pd.read_csv(config.WORK_DIR + "\\DataFrames\\ad_01.csv")
-        for row in ad01_df.itertuples():
+        for row in self.read_table('aerodromes', "ad_01.csv", "AD-0.1"):
             try:
-                folder_set.remove(row[2])
+                folder_set.remove(row['icao_designator'])
             except KeyError:
-                logger.error("CIV: {} not found in VATSIM UK Data", row[2])
+                logger.error("CIV: {} not found in VATSIM UK Data", row['icao_designator'])
             else:
-                logger.success("CIV: {} has been verified", row[2])
+                logger.success("CIV: {} has been verified", row['icao_designator'])
 
         # remove mil aerodromes
         mil_aerodromes = [
@@ -145,8 +150,8 @@ class Verify:
     def enr_4_4_check(self):
         """Verifies ENR 4.4 Entries"""
 
-        # load the dataframe
-        enr_044_df = pd.read_csv(config.WORK_DIR + "\\DataFrames\\enr_044.csv")
+        # load the table
+        enr_044_rows = self.read_table('fixes', "enr_044.csv", "ENR-4.4")
 
         # reverse check
         rev_fixes = []
@@ -160,13 +165,13 @@ class Verify:
                     rev_fixes.append(line_split[0])
                     logger.debug(line_split)
 
-                    # search the df for a matching point
-                    df_filter = enr_044_df.loc[enr_044_df["name"].str.match(line_split[0])]
+                    # search the table for a matching point
+                    row_filter = [row for row in enr_044_rows if re.match(line_split[0], row['name'])]
 
                     # is there something to look at?
-                    if not df_filter.empty:
+                    if row_filter:
                         # compare the coords
-                        enr044_coords = str(df_filter.iloc[0]['coords'])
+                        enr044_coords = str(row_filter[0]['coords'])
                         ec_sani = re.match(r"([N|S])([\d]{,3})\.([\d]{,2})\.([\d]{,2})\.([\d]{,3})\s([E|W])([\d]{,3})\.([\d]{,2})\.([\d]{,2})\.([\d]{,3})", enr044_coords)
                         enr044_coords = f"{ec_sani.group(1)}{ec_sani.group(2).zfill(3)}.{ec_sani.group(3).zfill(2)}.{ec_sani.group(4).zfill(2)}.{ec_sani.group(5).ljust(3, '0')} {ec_sani.group(6)}{ec_sani.group(7).zfill(3)}.{ec_sani.group(8).zfill(2)}.{ec_sani.group(9).zfill(2)}.{ec_sani.group(10).ljust(3, '0')}"
                         logger.debug("ENR 4.4 Coords: {}", enr044_coords)
@@ -180,6 +185,13 @@ class Verify:
                     else:
                         logger.error("No corresponding point in the AIP for {}", line_split[0])
         
-        for row in enr_044_df.itertuples():
-            if row.name not in rev_fixes:
-                logger.warning("{} seems to be missing from VATSIM UK data", row.name)
+        for row in enr_044_rows:
+            if row['name'] not in rev_fixes:
+                logger.warning("{} seems to be missing from VATSIM UK data", row['name'])
+
+
+def read_csv(path:str) -> list:
+    """Read a CSV written by the scraper into a list of dicts without pulling in pandas"""
+
+    with open(path, "r", encoding="utf-8", newline="") as csv_file:
+        return list(csv.DictReader(csv_file))
@@ -0,0 +1,171 @@
+"""
+UK AIP Scraper
+
+Times how long it takes to find the ENR-2.1 airspace fields, coordinates and arc end points on a stand-in page, the
+way the scraper did before the page was tokenized (a str() and five regex searches per <span>, walking neighbouring
+spans for arcs and reading the arc directions back from a helper CSV) against the single pass token stream.
+
+Both return every field they find, with the start, centre and end of each arc, and the benchmark stops with an error
+if they differ. Arc generation and the boundary output are the same either way so aren't timed.
+
+    python benchmarks/enr02_tokenizer.py [--scale 1.0] [--repeat 3]
+"""
+
+# Python Imports
+import argparse
+import importlib
+import os
+import re
+import sys
+import tempfile
+import time
+
+# 3rd Party Imports
+import pandas as pd
+from bs4 import BeautifulSoup
+from loguru import logger
+
+# Local Imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+standin = importlib.import_module("aip-scraper.standin")
+tokenizer = importlib.import_module("aip-scraper.tokenizer")
+
+
+def before(soup:BeautifulSoup, helper_dir:str) -> list:
+    """The scan from the scraper before the token stream, returning every field found in page order"""
+
+    helper_csv = os.path.join(helper_dir, "enr_02-CW-ACW-Helper.csv")
+    df_columns = ['area', 'number', 'direction']
+    complex_areas = pd.DataFrame(columns=df_columns)
+    complex_search_data = soup.find_all("p")
+    row = 0
+    while row < len(complex_search_data):
+        title = re.search(r"id=\"ID_[\d]{8,10}\"\>([A-Z]*)\s(ATZ|FIR|CTA|TMA|CTR)\s([0-9]{0,2})\<", str(complex_search_data[row]))
+        # the scraper didn't check for a <p> after the title, the token stream version does
+        if title and row + 1 < len(complex_search_data):
+            print_title = f"{str(title.group(1))} {str(title.group(2))} {str(title.group(3))}"
+            direction = re.findall(r"(?<=\s)(anti-clockwise|clockwise)(?=\s)", str(complex_search_data[row + 1]))
+            if direction:
+                for area_number, arc_direction in enumerate(direction):
+                    ca_out = pd.DataFrame({'area': print_title, 'number': str(area_number), 'direction': str(arc_direction)}, columns=df_columns, index=[0])
+                    complex_areas = pd.concat([complex_areas, ca_out], ignore_index=True)
+                row += 1
+        row += 1
+    complex_areas.to_csv(helper_csv)
+
+    search_data = soup.find_all("span")
+    fields = []
+    df_in_title = None
+    last_arc_title = None
+    arc_counter = 0
+    for row in range(len(search_data)):
+        title = re.search(r"TAIRSPACE;TXT_NAME", str(search_data[row]))
+        coords = re.search(r"(?:TAIRSPACE_VERTEX;GEO_L(?:AT|ONG);)([\d]{4})", str(search_data[row]))
+        callsign = re.search(r"TUNIT;TXT_NAME", str(search_data[row]))
+        freq = re.search(r"TFREQUENCY;VAL_FREQ_TRANS", str(search_data[row]))
+        arc = re.search(r"TAIRSPACE_VERTEX;VAL_RADIUS_ARC", str(search_data[row]))
+
+        if title:
+            print_title = re.search(r"\>(.*)\<", str(search_data[row - 1]))
+            if print_title and re.search(r"(ATZ|FIR|CTA|TMA|CTR)", str(search_data[row - 1])):
+                df_in_title = str(print_title.group(1))
+                fields.append(("title", df_in_title))
+        if callsign:
+            print_callsign = re.search(r"\>(.*)\<", str(search_data[row - 1]))
+            if print_callsign:
+                fields.append(("callsign", print_callsign.group(1)))
+        if freq:
+            print_frequency = re.search(r"\>(1[1-3]{1}[\d]{1}\.[\d]{3})\<", str(search_data[row - 1]))
+            if print_frequency:
+                fields.append(("frequency", print_frequency.group(1)))
+        if arc:
+            arc_counter = arc_counter + 1 if df_in_title == last_arc_title else 0
+            complex_areas = pd.read_csv(helper_csv, index_col=0)
+            complex_areas.loc[(complex_areas["area"].str.match(re.escape(df_in_title))) & (complex_areas["number"] == arc_counter)]
+            points = []
+            count_back = 2
+            for hemispheres in ("EW", "NS"):
+                while not (point := re.search(rf"\>([\d]{{6,7}})([{hemispheres}])\<", str(search_data[row - count_back]))):
+                    count_back += 1
+                points.insert(0, point.groups())
+                count_back += 1
+            count_forward = 1
+            for hemispheres in ("NS", "EW", "NS", "EW"):
+                while not (point := re.search(rf"\>([\d]{{6,7}})([{hemispheres}])\<", str(search_data[row + count_forward]))):
+                    count_forward += 1
+                points.append(point.groups())
+                count_forward += 1
+            last_arc_title = df_in_title
+            fields.append(("arc", points))
+        if coords:
+            print_coord = re.findall(r"\>([\d]{6,7})(N|S|E|W)\<", str(search_data[row - 1]))
+            if print_coord:
+                fields.append(("vertex", print_coord[0]))
+
+    return fields
+
+
+def after(soup:BeautifulSoup) -> list:
+    """The same scan from the token stream, returning every field found in page order"""
+
+    directions = []
+
+    def span_texts():
+        for element in soup.find_all(["p", "span"]):
+            if element.name == "span":
+                yield element.get_text()
+            else:
+                directions.extend(re.findall(r"(?<=\s)(anti-clockwise|clockwise)(?=\s)", str(element)))
+
+    tokens, coords = tokenizer.tokenize_enr02(span_texts())
+    fields = []
+    for kind, value in tokens:
+        if kind == tokenizer.TITLE:
+            if value[1] is not None:
+                fields.append(("title", value[0]))
+        elif kind == tokenizer.ARC:
+            fields.append(("arc", tokenizer.find_arc_points(coords, value)))
+        elif kind != tokenizer.VERTEX or value is not None:
+            fields.append((kind, value))
+
+    return fields
+
+
+def best_of(repeat:int, func, *args) -> float:
+    """Fastest of several runs"""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of the size of the UK eAIP to generate")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+    pages = standin.StandIn(scale=args.scale)
+    page = pages.page(f"{pages.country}-ENR-2.1-en-GB.html")
+    soup = BeautifulSoup(page, "html.parser")
+
+    with tempfile.TemporaryDirectory() as helper_dir:
+        fields_before = before(soup, helper_dir)
+        fields_after = after(soup)
+        before_time = best_of(args.repeat, before, soup, helper_dir)
+    after_time = best_of(args.repeat, after, soup)
+    if fields_before != fields_after:
+        sys.exit(f"The token stream found {len(fields_after)} fields but the span scan found {len(fields_before)}, they should be the same")
+
+    print(f"ENR-2.1 stand-in page at scale {args.scale}: {len(page) / 1024:.0f} KiB, {len(soup.find_all('span'))} spans")
+    print(f"before: {before_time:.3f}s")
+    print(f"after:  {after_time:.3f}s")
+    print(f"both found the same {len(fields_after)} fields, speedup: {before_time / after_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
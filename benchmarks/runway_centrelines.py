@@ -0,0 +1,69 @@
+"""
+UK AIP Scraper
+
+Times RunwayGeometry.centrelines over the AD-2.12 runway ends from the stand-in eAIP, and over multiples of them with
+the aerodromes renamed so every copy is paired up on its own.
+
+The pages are fetched and parsed once up front so only the geometry is timed.
+
+    python benchmarks/runway_centrelines.py [--multiples 1 10 100 300] [--repeat 3]
+"""
+
+# Python Imports
+import argparse
+import importlib
+import os
+import sys
+import time
+
+# 3rd Party Imports
+import pandas as pd
+from loguru import logger
+
+# Local Imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+standin = importlib.import_module("aip-scraper.standin")
+scraper = importlib.import_module("aip-scraper.scraper")
+runways = importlib.import_module("aip-scraper.runways")
+
+
+def runway_ends() -> pd.DataFrame:
+    """The AD-2.12 runway ends scraped from a stand-in server"""
+
+    server = standin.serve(standin.StandIn(scale=1.0))
+    try:
+        web_scrape = scraper.Webscrape(render=False, base_url=f"http://127.0.0.1:{server.server_port}/")
+        return web_scrape.parse_ad02_data(web_scrape.parse_ad01_data())[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def best_of(repeat:int, df_rwy:pd.DataFrame) -> float:
+    """Fastest of several runs, building the geometry each time as the scraper does"""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        runways.RunwayGeometry(df_rwy).centrelines()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--multiples", type=int, nargs="+", default=[1, 10, 100, 300], help="multiples of the UK runway set to time")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+    df_rwy = runway_ends()
+    for multiple in args.multiples:
+        df_big = pd.concat([df_rwy.assign(icao_designator=df_rwy['icao_designator'] + str(copy)) for copy in range(multiple)], ignore_index=True)
+        timing = best_of(args.repeat, df_big)
+        print(f"{multiple:>4}x: {len(df_big):>7} runway ends in {timing:.3f}s ({timing / len(df_big) * 1e6:.1f}us per end)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import importlib
+import os
+import sys
+
+# 3rd Party Imports
+
+# Local Imports
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the package directory has a hyphen in its name so it can only be imported through importlib
+sys.path.insert(0, REPO_DIR)
+
+
+def aip_module(name:str=None):
+    """Import a module from the package, or the package itself"""
+
+    return importlib.import_module("aip-scraper" + ("." + name if name else ""))
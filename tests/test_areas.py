@@ -0,0 +1,85 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import numpy as np
+import pytest
+from bs4 import BeautifulSoup
+from pyproj import Geod
+
+# Local Imports
+from conftest import aip_module
+
+areas = aip_module("areas")
+functions = aip_module("functions")
+scraper = aip_module("scraper")
+standin = aip_module("standin")
+tokenizer = aip_module("tokenizer")
+
+GEOD = Geod(ellps="WGS84")
+
+
+@pytest.fixture(scope="module")
+def enr051():
+    """The areas parsed from the stand-in's ENR-5.1"""
+
+    pages = standin.StandIn(scale=0.05)
+    with scraper.Webscrape(render=False) as web_scrape:
+        return web_scrape.parse_enr051_page(BeautifulSoup(pages.page(f"{pages.country}-ENR-5.1-en-GB.html"), "html.parser"))
+
+
+def first_with(enr051, kind:str) -> dict:
+    return next(row for row in enr051 if any(part.kind == kind for part in row['parts']))
+
+
+def distances(centre:tuple, vertices:np.ndarray) -> np.ndarray:
+    """Metres from a centre of latitude and longitude to each vertex"""
+
+    return GEOD.inv(np.full(len(vertices), centre[1]), np.full(len(vertices), centre[0]), vertices[:, 1], vertices[:, 0])[2]
+
+
+def test_circle_area(enr051):
+    circle = first_with(enr051, tokenizer.CIRCLE)
+    radius, centre_lat, centre_lon = circle['parts'][0].value
+
+    vertices = areas.AreaGeometry([circle['parts']]).area(0)
+
+    # a point every degree, all on the published radius
+    assert len(vertices) == 360
+    assert distances((centre_lat, centre_lon), vertices) == pytest.approx(radius * functions.METRES_PER_NM, rel=1e-9)
+
+
+def test_arc_area_meets_its_vertices(enr051):
+    area = first_with(enr051, tokenizer.ARC)
+    parts = area['parts']
+    position = next(index for index, part in enumerate(parts) if part.kind == tokenizer.ARC)
+    start, end = parts[position - 1].value, parts[position + 1].value
+    _, radius, centre_lat, centre_lon = parts[position].value
+    start_distance, end_distance = distances((centre_lat, centre_lon), np.array([start, end]))
+    # the stand-in publishes a rounded radius that the vertices aren't on, as the real eAIP does
+    assert abs(radius * functions.METRES_PER_NM - start_distance) > 100
+
+    vertices = areas.AreaGeometry([parts]).area(0)
+
+    # the published vertices are kept as they are, the arc runs between them
+    assert vertices[position - 1].tolist() == list(start)
+    arc_end = next(index for index in range(position, len(vertices)) if vertices[index].tolist() == list(end))
+    arc = vertices[position:arc_end]
+    assert len(arc) > 10
+    arc_distances = distances((centre_lat, centre_lon), arc)
+    assert np.all(arc_distances >= min(start_distance, end_distance) - 1e-6)
+    assert np.all(arc_distances <= max(start_distance, end_distance) + 1e-6)
+    # each end of the arc is a single step from the vertex it joins, not a jump out to the published radius
+    step = 2 * np.pi * max(start_distance, end_distance) / 360
+    assert distances(start, arc[:1])[0] < 1.5 * step
+    assert distances(end, arc[-1:])[0] < 1.5 * step
+
+
+def test_no_areas():
+    geometry = areas.AreaGeometry([])
+
+    assert len(geometry) == 0
+    assert geometry.boundaries() == []
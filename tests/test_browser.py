@@ -0,0 +1,118 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import threading
+import time
+
+# 3rd Party Imports
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+browser = aip_module("browser")
+
+
+class FakeDriver:
+    '''Stands in for a webdriver, recording how many pages it loaded and how many were loading at once'''
+
+    started = []
+    loading = 0
+    most_loading = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.address = None
+        self.pages = 0
+        self.quit_called = False
+        FakeDriver.started.append(self)
+
+    def get(self, address:str) -> None:
+        with FakeDriver.lock:
+            FakeDriver.loading += 1
+            FakeDriver.most_loading = max(FakeDriver.most_loading, FakeDriver.loading)
+        time.sleep(0.005)
+        self.address = address
+        self.pages += 1
+        with FakeDriver.lock:
+            FakeDriver.loading -= 1
+
+    @property
+    def page_source(self) -> str:
+        return f"<html>{self.address}</html>"
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_driver():
+    FakeDriver.started = []
+    FakeDriver.loading = 0
+    FakeDriver.most_loading = 0
+
+
+def test_browsers_are_recycled():
+    with browser.BrowserPool(1, recycle_after=2, driver_factory=FakeDriver) as pool:
+        sources = [pool.render(f"page-{page}") for page in range(5)]
+
+    assert sources == [f"<html>page-{page}</html>" for page in range(5)]
+    assert [driver.pages for driver in FakeDriver.started] == [2, 2, 1]
+    assert all(driver.quit_called for driver in FakeDriver.started)
+
+
+def test_never_more_browsers_than_the_pool_size():
+    addresses = [f"page-{page}" for page in range(40)]
+    with browser.BrowserPool(3, recycle_after=100, driver_factory=FakeDriver) as pool:
+        sources = list(pool.render_many(addresses))
+
+    assert sources == [f"<html>{address}</html>" for address in addresses]
+    assert len(FakeDriver.started) <= 3
+    assert FakeDriver.most_loading <= 3
+
+
+def test_render_many_only_takes_a_window_ahead():
+    taken = []
+
+    def addresses():
+        for page in range(40):
+            taken.append(page)
+            yield f"page-{page}"
+
+    with browser.BrowserPool(2, driver_factory=FakeDriver) as pool:
+        rendered = pool.render_many(addresses(), window=4)
+        first = next(rendered)
+        # the first page plus at most the four behind it
+        assert len(taken) <= 5
+        rendered.close()
+
+    assert first == "<html>page-0</html>"
+    assert sum(driver.pages for driver in FakeDriver.started) <= 5
+
+
+def test_close_wakes_waiting_threads():
+    pool = browser.BrowserPool(1, driver_factory=FakeDriver)
+    entry = pool.acquire()
+    errors = []
+
+    def wait_for_browser():
+        try:
+            pool.acquire()
+        except RuntimeError as err:
+            errors.append(err)
+
+    waiting = [threading.Thread(target=wait_for_browser) for _ in range(3)]
+    for thread in waiting:
+        thread.start()
+    time.sleep(0.05)
+    pool.close()
+    for thread in waiting:
+        thread.join(timeout=2)
+
+    assert not any(thread.is_alive() for thread in waiting)
+    assert len(errors) == 3
+    # a browser handed back after closing is shut down rather than pooled
+    pool.release(entry)
+    assert entry[0].quit_called
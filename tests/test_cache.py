@@ -0,0 +1,96 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import importlib
+import os
+import pickle
+import sys
+import time
+
+# 3rd Party Imports
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+cache = aip_module("cache")
+scraper = aip_module("scraper")
+standin = aip_module("standin")
+
+PARSER_SOURCE = '''
+CALLS = []
+
+
+def parse_rows(soup):
+    CALLS.append(1)
+    return [len(soup.find_all("tr")) {change}]
+'''
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = standin.serve(standin.StandIn(scale=0.05))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def parser_module(tmp_path, monkeypatch):
+    """A parser in a module of its own, so its source can be changed between runs"""
+
+    path = tmp_path / "cached_parser.py"
+    path.write_text(PARSER_SOURCE.format(change=""))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("cached_parser")
+    yield module
+    sys.modules.pop("cached_parser", None)
+
+
+def parse(server, parse_cache, page_parser) -> list:
+    with scraper.Webscrape(render=False, cache=parse_cache, base_url=f"http://127.0.0.1:{server.server_port}/") as web_scrape:
+        return list(web_scrape.parse_pages(page_parser, [web_scrape.page_name("AD-0.1")]))
+
+
+def test_hit_skips_the_parse(server, parser_module, tmp_path):
+    parse_cache = cache.ParseCache(str(tmp_path / "cache"))
+
+    first = parse(server, parse_cache, parser_module.parse_rows)
+    second = parse(server, parse_cache, parser_module.parse_rows)
+
+    assert first == second
+    assert len(parser_module.CALLS) == 1
+    assert parse_cache.stats()['hits'] == 1
+
+
+def test_changing_the_parser_changes_the_key(server, parser_module, tmp_path):
+    parse_cache = cache.ParseCache(str(tmp_path / "cache"))
+    first = parse(server, parse_cache, parser_module.parse_rows)
+    version = cache.parser_version(parser_module.parse_rows)
+
+    (tmp_path / "cached_parser.py").write_text(PARSER_SOURCE.format(change="+ 1"))
+    module = importlib.reload(parser_module)
+    changed = parse(server, parse_cache, module.parse_rows)
+
+    assert cache.parser_version(module.parse_rows) != version
+    assert parse_cache.stats()['hits'] == 0
+    assert changed == [[first[0][0] + 1]]
+
+
+def test_evicts_least_recently_used_down_to_the_limit(tmp_path):
+    rows = list(range(100))
+    entry_size = len(pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL))
+    parse_cache = cache.ParseCache(str(tmp_path), max_bytes=entry_size * 3)
+    now = time.time()
+    for age, page_hash in zip((30, 20, 10), ("a", "b", "c")):
+        parse_cache.put("v", page_hash, rows)
+        os.utime(parse_cache.path("v", page_hash), (now - age, now - age))
+
+    # a is the oldest entry, reading it makes b the least recently used
+    assert parse_cache.get("v", "a") == rows
+    parse_cache.put("v", "d", rows)
+
+    assert sorted(os.listdir(tmp_path)) == ["v-a.pkl", "v-c.pkl", "v-d.pkl"]
+    assert parse_cache.size == entry_size * 3
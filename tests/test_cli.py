@@ -0,0 +1,59 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+
+def test_verify_names_missing_section(tmp_path, monkeypatch):
+    monkeypatch.setattr(aip_module("config"), "WORK_DIR", str(tmp_path))
+
+    with pytest.raises(SystemExit) as exit_info:
+        aip_module("__main__").main(["verify", "enr-4.4"])
+
+    assert "ENR-4.4 has not been scraped" in str(exit_info.value)
+
+
+def test_scrape_several_countries_keeps_icao(monkeypatch):
+    calls = []
+    monkeypatch.setattr(aip_module("countries"), "scrape_countries", lambda *args, **kwargs: calls.append(kwargs))
+
+    aip_module("__main__").main(["scrape", "--country", "EG", "EI", "--icao", "EGLL", "EIDW", "--cache-size", "0"])
+
+    assert calls[0]['icao'] == ["EGLL", "EIDW"]
+
+
+def test_scrape_exits_with_an_error_when_a_country_fails(monkeypatch):
+    # EI failed and was logged, EG was written
+    monkeypatch.setattr(aip_module("countries"), "scrape_countries", lambda countries, *args, **kwargs: {"EG": []})
+
+    with pytest.raises(SystemExit) as exit_info:
+        aip_module("__main__").main(["scrape", "--country", "EG", "EI", "--cache-size", "0"])
+
+    assert str(exit_info.value) == "Unable to scrape EI"
+
+
+def test_scrape_exits_with_an_error_when_the_only_country_fails(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError("unavailable")
+    monkeypatch.setattr(aip_module("scraper"), "Webscrape", unavailable)
+
+    with pytest.raises(SystemExit) as exit_info:
+        aip_module("__main__").main(["scrape", "--cache-size", "0"])
+
+    assert str(exit_info.value) == "Unable to scrape EG"
+
+
+@pytest.mark.parametrize("base_url", ["http://127.0.0.1:8000", "ftp://example.com/", "Publications/", "https://example.com/?cycle="])
+def test_base_url_not_laid_out_like_nats_is_rejected(base_url):
+    with pytest.raises(SystemExit) as exit_info:
+        aip_module("__main__").main(["scrape", "--base-url", base_url, "--cache-size", "0"])
+
+    assert base_url in str(exit_info.value)
+    assert aip_module("countries").parse_countries(["EI=http://127.0.0.1:8000/"]) == {"EI": "http://127.0.0.1:8000/"}
@@ -0,0 +1,131 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import os
+from datetime import date
+
+# 3rd Party Imports
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+daemon = aip_module("daemon")
+standin = aip_module("standin")
+
+FIRST = date(2026, 9, 3)
+SECOND = date(2026, 10, 1)
+
+
+@pytest.fixture
+def cycle_daemon(tmp_path):
+    server = standin.serve(standin.StandIn(scale=0.05))
+    try:
+        yield daemon.CycleDaemon(
+            sections=["ENR-4.4"],
+            base_url=f"http://127.0.0.1:{server.server_port}/",
+            output_dir=str(tmp_path / "live") + os.sep,
+            staging_dir=str(tmp_path / "cycles"),
+            checkpoint_dir=str(tmp_path / "checkpoints")
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def live_files(cycle_daemon) -> dict:
+    return {name: os.path.getmtime(os.path.join(cycle_daemon.output_dir, name)) for name in os.listdir(cycle_daemon.output_dir)}
+
+
+def test_promote_switches_every_file_at_once(cycle_daemon, monkeypatch):
+    cycle_daemon.prepare(FIRST)
+    cycle_daemon.promote(FIRST)
+    assert cycle_daemon.promoted_cycle() == FIRST
+    assert "enr_044.csv" in live_files(cycle_daemon)
+    before = live_files(cycle_daemon)
+
+    # a crash part way through promoting leaves the old cycle in place, whole
+    cycle_daemon.prepare(SECOND)
+    def crash(*args):
+        raise OSError("crashed")
+    monkeypatch.setattr(daemon.os, "replace", crash)
+    with pytest.raises(OSError):
+        cycle_daemon.promote(SECOND)
+    monkeypatch.undo()
+    assert cycle_daemon.promoted_cycle() == FIRST
+    assert live_files(cycle_daemon) == before
+
+    cycle_daemon.promote(SECOND)
+    assert cycle_daemon.promoted_cycle() == SECOND
+    assert cycle_daemon.live_cycle() == SECOND
+    assert cycle_daemon.staged_cycles() == [SECOND]
+    assert cycle_daemon.current_dir() == cycle_daemon.staging_path(SECOND)
+
+
+def test_promote_without_links(cycle_daemon, monkeypatch):
+    # Windows needs extra rights to make a link, and can't replace a directory or a link to one in a single step
+    def no_links(*args, **kwargs):
+        raise OSError("A required privilege is not held by the client")
+    monkeypatch.setattr(daemon.os, "symlink", no_links)
+
+    cycle_daemon.prepare(FIRST)
+    cycle_daemon.promote(FIRST)
+    cycle_daemon.prepare(SECOND)
+    cycle_daemon.promote(SECOND)
+
+    live = cycle_daemon.output_dir.rstrip(os.sep)
+    assert not os.path.islink(live)
+    assert cycle_daemon.live_cycle() == SECOND
+    assert "enr_044.csv" in live_files(cycle_daemon)
+    # nothing left over from the swap
+    assert not os.path.exists(live + ".new") and not os.path.exists(live + ".old")
+
+
+def test_interrupted_swap_is_finished_at_the_next_tick(cycle_daemon, monkeypatch):
+    cycle_daemon.prepare(FIRST)
+    cycle_daemon.promote(FIRST)
+    cycle_daemon.prepare(SECOND)
+
+    # the pointer has been replaced but the live outputs haven't been swapped yet
+    def crash(*args):
+        raise OSError("crashed")
+    monkeypatch.setattr(daemon.os, "rename", crash)
+    with pytest.raises(OSError):
+        cycle_daemon.promote(SECOND)
+    monkeypatch.undo()
+    assert cycle_daemon.promoted_cycle() == SECOND
+    assert cycle_daemon.live_cycle() == FIRST
+
+    monkeypatch.setattr(cycle_daemon, "is_published", lambda cycle: False)
+    monkeypatch.setattr(daemon, "lower_priority", lambda: None)
+    cycle_daemon.tick(SECOND)
+    assert cycle_daemon.live_cycle() == SECOND
+    assert "enr_044.csv" in live_files(cycle_daemon)
+
+
+def test_existing_outputs_are_kept(cycle_daemon):
+    os.makedirs(cycle_daemon.output_dir)
+    with open(cycle_daemon.output_dir + "ad_01.csv", "w", encoding="utf-8") as csv_file:
+        csv_file.write("from a manual scrape")
+
+    cycle_daemon.prepare(FIRST)
+    cycle_daemon.promote(FIRST)
+
+    assert cycle_daemon.promoted_cycle() == FIRST
+    unmanaged = [name for name in os.listdir(cycle_daemon.staging_dir) if name.startswith("unmanaged-")]
+    assert len(unmanaged) == 1
+    assert os.listdir(os.path.join(cycle_daemon.staging_dir, unmanaged[0])) == ["ad_01.csv"]
+
+
+def test_once_lowers_priority(cycle_daemon, monkeypatch):
+    calls = []
+    monkeypatch.setattr(daemon, "lower_priority", lambda: calls.append(True))
+    monkeypatch.setattr(cycle_daemon, "is_published", lambda cycle: False)
+
+    cycle_daemon.tick(FIRST)
+    cycle_daemon.tick(FIRST)
+
+    # only once, os.nice adds to the niceness on every call
+    assert calls == [True]
@@ -0,0 +1,135 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import asyncio
+import threading
+import time
+
+# 3rd Party Imports
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+standin = aip_module("standin")
+fetch = aip_module("fetch")
+aio = aip_module("aio")
+
+
+@pytest.fixture
+def server(request):
+    """A small stand-in eAIP answering the given fraction of requests with a 429 or 503"""
+
+    server = standin.serve(standin.StandIn(scale=0.05), error_rate=request.param)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def address(server, section:str="AD-0.1") -> str:
+    return f"http://127.0.0.1:{server.server_port}/2023-01-26-AIRAC/html/eAIP/EG-{section}-en-GB.html"
+
+
+@pytest.mark.parametrize("server", [0.5], indirect=True)
+def test_retries_until_the_page_arrives(server):
+    fetcher = fetch.Fetcher(retries=10, backoff=0.001, initial_concurrency=4)
+
+    responses = list(fetcher.fetch_many([address(server)] * 20))
+
+    assert all(response.status == 200 for response in responses)
+    assert len({response.data for response in responses}) == 1
+    stats = fetcher.stats()
+    assert stats['errors'] > 0
+    assert stats['retries'] == stats['errors']
+    assert stats['requests'] == 20 + stats['retries']
+
+
+@pytest.mark.parametrize("server", [1.0], indirect=True)
+def test_backs_off_then_gives_up(server):
+    fetcher = fetch.Fetcher(retries=3, backoff=0.05, initial_concurrency=8)
+
+    start = time.monotonic()
+    with pytest.raises(fetch.FetchError) as error:
+        fetcher.fetch(address(server))
+    elapsed = time.monotonic() - start
+
+    assert error.value.status in (429, 503)
+    assert fetcher.stats()['requests'] == 4
+    # each wait is at least half of 0.05, 0.1 then 0.2 seconds
+    assert elapsed >= 0.175
+    # every failure halves the concurrency limit, at most once per round trip
+    assert fetcher.stats()['concurrency'] < 8
+
+
+@pytest.mark.parametrize("server", [0.0], indirect=True)
+def test_missing_page_is_not_an_error(server):
+    fetcher = fetch.Fetcher(retries=0)
+
+    assert fetcher.fetch(address(server, "AD-2.XXXX")).status == 404
+    assert fetcher.stats()['errors'] == 0
+
+
+@pytest.mark.parametrize("server", [0.0], indirect=True)
+def test_only_fetches_a_window_ahead(server):
+    fetcher = fetch.Fetcher(max_concurrency=2)
+
+    # twice the most requests in flight
+    responses = fetcher.fetch_many([address(server)] * 100)
+    next(responses)
+    time.sleep(0.2)
+    requests = fetcher.stats()['requests']
+    responses.close()
+
+    assert requests <= 5
+    assert fetcher.stats()['backlog'] == 0
+
+
+def test_coroutines_get_slots_in_order_from_any_thread():
+    fetcher = fetch.Fetcher(max_concurrency=1, initial_concurrency=1)
+    async_fetcher = aio.AsyncFetcher(fetcher)
+    order = []
+
+    async def wait_for_slot(number:int):
+        await async_fetcher.acquire()
+        order.append(number)
+
+    async def main():
+        await async_fetcher.acquire()
+        tasks = [asyncio.create_task(wait_for_slot(number)) for number in range(5)]
+        await asyncio.sleep(0.01)
+        assert order == [] and fetcher.stats()['backlog'] == 5
+        # the second waiter gives up, its turn passes to the next one
+        tasks[1].cancel()
+        for _ in range(4):
+            # slots are handed back from the fetcher's threads
+            releaser = threading.Thread(target=fetcher.release)
+            releaser.start()
+            releaser.join()
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(main())
+
+    assert order == [0, 2, 3, 4]
+    assert fetcher.in_flight == 1
+    assert fetcher.stats()['backlog'] == 0
+
+
+def test_slot_handed_to_a_cancelled_coroutine_is_given_back():
+    fetcher = fetch.Fetcher(max_concurrency=1, initial_concurrency=1)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        assert fetcher.acquire_async(loop).done()
+        waiting = fetcher.acquire_async(loop)
+        fetcher.release()
+        # the slot is on its way to the event loop when the waiter is cancelled
+        waiting.cancel()
+        fetcher.cancel_async(waiting)
+        await asyncio.sleep(0)
+        assert fetcher.in_flight == 0
+        assert fetcher.acquire_async(loop).done()
+
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pytest
+from geographiclib.geodesic import Geodesic
+
+# Local Imports
+from conftest import aip_module
+
+functions = aip_module("functions")
+
+CENTRE = (51.5, -0.5)
+
+
+def point(bearing:float, distance:float=10000.0) -> tuple:
+    """A point the given bearing and distance from the centre"""
+
+    position = Geodesic.WGS84.Direct(*CENTRE, bearing, distance)
+
+    return (position['lat2'], position['lon2'])
+
+
+def original_semicircle(center_x, center_y, start_x, start_y, end_x, end_y, clockwise) -> list:
+    """The loop from before the arc cache, bounded so a test can't hang on it"""
+
+    start = Geodesic.WGS84.Inverse(center_x, center_y, start_x, start_y)
+    start_brg = start['azi1']
+    end_brg_compass = (360 + Geodesic.WGS84.Inverse(center_x, center_y, end_x, end_y)['azi1']) % 360
+    arc_out = []
+    while round(start_brg) != round(end_brg_compass) and len(arc_out) < 360:
+        arc_coords = Geodesic.WGS84.Direct(center_x, center_y, start_brg, start['s12'])
+        arc_out.append(functions.Geo.dd2dms(arc_coords['lat2'], arc_coords['lon2']))
+        start_brg = (start_brg + (1 if clockwise else -1)) % 360
+
+    return arc_out
+
+
+@pytest.fixture
+def arc_cache(monkeypatch):
+    """A fresh cache in place of the one shared by every Geo, counting the arcs actually worked out"""
+
+    cache = functions.ArcCache(maxsize=16)
+    monkeypatch.setattr(functions.Geo, "arc_cache", cache)
+    computed = []
+    compute = functions.Geo.compute_semicircle
+
+    def counting_compute(self, *args):
+        computed.append(args)
+        return compute(self, *args)
+
+    monkeypatch.setattr(functions.Geo, "compute_semicircle", counting_compute)
+    cache.computed = computed
+
+    return cache
+
+
+@pytest.mark.parametrize("start, end, clockwise", [
+    (10.5, 100.5, True),
+    (100.5, 10.5, False),
+    (350.5, 20.5, True),
+    (45.0, 135.0, True),
+    (-135.0, 135.0, False),
+    ])
+def test_arc_stops_where_it_always_did(start, end, clockwise):
+    args = (*CENTRE, *point(start), *point(end), clockwise)
+
+    arc = functions.Geo().compute_semicircle(*args)
+
+    assert arc == original_semicircle(*args)
+    assert 0 < len(arc) < 360
+
+
+def test_arc_the_original_loop_never_finished():
+    # the bearings are a hair over .5, after the first step they are exactly .5 and round to even,
+    # going from 272 to 270 without ever rounding to the end bearing's 271
+    args = (*CENTRE, *point(0.5), *point(-89.5), False)
+
+    arc = functions.Geo().compute_semicircle(*args)
+
+    assert len(arc) == 90
+    assert arc == original_semicircle(*args)[:90]
+
+
+def test_repeated_arc_is_a_hit(arc_cache):
+    args = (*CENTRE, *point(10.0), *point(80.0), True)
+
+    first = functions.Geo().generate_semicircle(*args)
+    second = functions.Geo().generate_semicircle(*args)
+
+    assert first == second
+    assert len(arc_cache.computed) == 1
+    assert (arc_cache.hits, arc_cache.misses) == (1, 1)
+
+
+def test_shared_boundary_drawn_the_other_way_has_the_same_vertices(arc_cache):
+    start, end = point(10.0), point(80.0)
+
+    # neighbouring airspaces walk their shared arc in opposite directions
+    one_way = functions.Geo().generate_semicircle(*CENTRE, *start, *end, True)
+    other_way = functions.Geo().generate_semicircle(*CENTRE, *end, *start, False)
+
+    assert other_way == one_way[::-1]
+    assert len(arc_cache.computed) == 1
+    assert arc_cache.reverse_hits == 1
+
+
+def test_key_ignores_sub_centimetre_differences():
+    key = functions.ArcCache.key(51.5, -0.5, 51.6, -0.5, 51.5, -0.4, True)
+
+    assert functions.ArcCache.key(51.5 + 1e-9, -0.5, 51.6, -0.5 - 1e-9, 51.5, -0.4, True) == key
+    assert functions.ArcCache.key(51.5 + 1e-6, -0.5, 51.6, -0.5, 51.5, -0.4, True) != key
+    assert functions.ArcCache.key(51.5, -0.5, 51.6, -0.5, 51.5, -0.4, False) != key
+
+
+def test_least_recently_used_arc_is_evicted():
+    cache = functions.ArcCache(maxsize=2)
+    keys = [functions.ArcCache.key(51.5, -0.5, 51.5 + number, -0.5, 51.5, -0.4, True) for number in range(3)]
+    cache.put(keys[0], ["a"])
+    cache.put(keys[1], ["b"])
+    # reading the first arc makes the second the least recently used
+    assert cache.get(keys[0]) == ("a",)
+    cache.put(keys[2], ["c"])
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == ("a",)
+    assert cache.get(keys[2]) == ("c",)
+    assert cache.evictions == 1
+
+
+def test_cache_can_be_turned_off():
+    cache = functions.ArcCache(maxsize=0)
+    key = functions.ArcCache.key(51.5, -0.5, 51.6, -0.5, 51.5, -0.4, True)
+    cache.put(key, ["a"])
+
+    assert cache.get(key) is None
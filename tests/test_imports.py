@@ -0,0 +1,48 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import json
+import subprocess
+import sys
+
+# 3rd Party Imports
+
+# Local Imports
+from conftest import REPO_DIR
+
+# packages that are slow to import and must only be loaded by the code paths that use them
+HEAVY_MODULES = ("selenium", "pandas", "shapely", "pyproj", "geographiclib", "numpy", "bs4", "aiohttp")
+
+# generous enough for a slow CI machine, the heavy packages alone take well over a second
+IMPORT_BUDGET = 1.0
+
+START_UP = f"""
+import importlib, json, sys, time
+sys.path.insert(0, {REPO_DIR!r})
+start = time.perf_counter()
+for name in ("", ".__main__", ".airac", ".config", ".functions", ".verify", ".countries"):
+    importlib.import_module("aip-scraper" + name)
+importlib.import_module("aip-scraper.__main__").build_parser().parse_args(["scrape"])
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def start_up() -> dict:
+    """Import the package and build the command line in a fresh interpreter, so nothing is already loaded"""
+
+    result = subprocess.run([sys.executable, "-c", START_UP], capture_output=True, text=True, check=True)
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_are_lazy():
+    assert start_up()['loaded'] == []
+
+
+def test_import_time():
+    # the fastest of a few runs so a busy machine doesn't fail the test
+    elapsed = min(start_up()['elapsed'] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, f"Importing the package took {elapsed:.2f}s"
@@ -0,0 +1,67 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pandas as pd
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+index = aip_module("index")
+
+
+@pytest.fixture(scope="module")
+def codes():
+    df_enr_016 = pd.DataFrame({
+        'start': ["0401", "0420", "7000", "7777", "7600", "0401", "9000"],
+        'end': ["0437", "0427", "7000", "7777", "7500", "0437", "9007"],
+        'depart': ["EGLL", "EGKK", "", "", "", "EGLL", ""],
+        'arrive': ["", "", "", "", "", "", ""],
+        'string': ["London", "Gatwick", "Conspicuity", "Monitoring", "Radio failure", "London", "Not octal"]
+        })
+
+    return index.SsrCodeIndex(df_enr_016)
+
+
+def strings(allocations:list) -> list:
+    return [allocation['string'] for allocation in allocations]
+
+
+def test_overlapping_ranges_keep_every_allocation(codes):
+    assert strings(codes.lookup("0401")) == ["London"]
+    assert strings(codes.lookup("0420")) == ["London", "Gatwick"]
+    assert strings(codes.lookup("0427")) == ["London", "Gatwick"]
+    assert strings(codes.lookup("0430")) == ["London"]
+    assert codes.lookup("0440") == []
+
+
+def test_discrete_codes_and_reversed_ranges(codes):
+    assert strings(codes.lookup(7000)) == ["Conspicuity"]
+    assert strings(codes.lookup("7777")) == ["Monitoring"]
+    assert strings(codes.lookup("7576")) == ["Radio failure"]
+    # the duplicate London row and the range that isn't octal are left out
+    assert len(codes.allocations) == 5
+
+
+def test_lookup_many_matches_lookup(codes):
+    batch = ["0425", 7000, "7777", "1234", "8000", "-1"]
+
+    assert codes.lookup_many(batch) == [codes.lookup(code) for code in batch]
+    assert [len(allocations) for allocations in codes.lookup_many(batch)] == [2, 1, 1, 0, 0, 0]
+
+
+@pytest.mark.parametrize("code", ["-1", "0o17", "8000", "7778", "12345", "", "12 3", "+17"])
+def test_bad_codes_are_rejected(codes, code):
+    with pytest.raises(ValueError, match="not an SSR code"):
+        index.SsrCodeIndex.code_to_int(code)
+    # in particular "-1" mustn't wrap round to the allocations for 7777
+    assert codes.lookup(code) == []
+
+
+def test_short_codes_are_zero_padded():
+    assert index.SsrCodeIndex.code_to_int("17") == index.SsrCodeIndex.code_to_int("0017") == 0o17
+    assert index.SsrCodeIndex.code_to_int(" 7777 ") == 4095
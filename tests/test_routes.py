@@ -0,0 +1,82 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pandas as pd
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+routes = aip_module("routes")
+
+
+@pytest.fixture(scope="module")
+def graph():
+    enr_041 = pd.DataFrame({'name': ["AAA", "CCC"], 'coords': ["N050.00.00.000 E000.00.00.000", "N052.00.00.000 E000.00.00.000"]})
+    enr_044 = pd.DataFrame({
+        'name': ["BBB", "DDD", "EEE", "CCC"],
+        'coords': ["N051.00.00.000 E000.00.00.000", "N052.00.00.000 E001.00.00.000", "N051.00.00.000 E001.00.00.000", "N060.00.00.000 E000.00.00.000"]
+        })
+    enr_031 = pd.DataFrame({'name': ["L1", "L2", "L3"], 'route': ["AAA/BBB/CCC", "CCC/DDD", "AAA/EEE/DDD"]})
+    # R1 loops back through BBB
+    enr_033 = pd.DataFrame({'name': ["R1"], 'route': ["BBB/CCC/DDD/EEE/BBB/AAA"]})
+
+    return routes.RouteGraph([enr_031, enr_033], enr_041, enr_044)
+
+
+def test_expand_in_either_direction(graph):
+    assert graph.expand("L1", "AAA", "CCC") == ["AAA", "BBB", "CCC"]
+    assert graph.expand("L1", "CCC", "AAA") == ["CCC", "BBB", "AAA"]
+    assert graph.expand("L1", "BBB", "BBB") == ["BBB"]
+
+
+def test_expand_an_airway_that_revisits_a_point(graph):
+    # BBB is first and fifth on R1, each stretch should use the BBB nearest the other point
+    assert graph.expand("R1", "BBB", "CCC") == ["BBB", "CCC"]
+    assert graph.expand("R1", "CCC", "BBB") == ["CCC", "BBB"]
+    assert graph.expand("R1", "BBB", "AAA") == ["BBB", "AAA"]
+    assert graph.expand("R1", "AAA", "DDD") == ["AAA", "BBB", "EEE", "DDD"]
+    # both BBBs are two points from DDD, so it is flown forwards
+    assert graph.expand("R1", "DDD", "BBB") == ["DDD", "EEE", "BBB"]
+
+
+def test_expand_points_off_the_airway(graph):
+    with pytest.raises(ValueError, match="not both on L2"):
+        graph.expand("L2", "AAA", "DDD")
+
+
+def test_shortest_path(graph):
+    distance, path = graph.shortest_path("AAA", "DDD")
+
+    # AAA, BBB, CCC, DDD is further than cutting across through EEE
+    assert path == ["AAA", "EEE", "DDD"]
+    assert distance == pytest.approx(graph.distance(path))
+    assert graph.distance(["AAA", "BBB", "CCC", "DDD"]) > distance
+    # a degree of latitude is about 60 NM
+    assert graph.distance(["AAA", "BBB"]) == pytest.approx(60.0, rel=0.01)
+
+
+def test_shortest_path_off_the_network(graph):
+    with pytest.raises(ValueError, match="not on the route network"):
+        graph.shortest_path("AAA", "ZZZ")
+
+
+def test_navaids_take_priority_over_fixes(graph):
+    assert graph.points["CCC"] == pytest.approx((52.0, 0.0))
+
+
+def test_validate_many(graph):
+    results = graph.validate_many(["AAA L1 CCC L2 DDD", "AAA L2 DDD", "BBB R1 CCC EEE", "AAA ZZZ", "AAA L1", ""])
+
+    assert results == [
+        [["AAA", "BBB", "CCC", "DDD"], []],
+        [["AAA", "DDD"], ["AAA and DDD are not both on L2"]],
+        [["BBB", "CCC", "EEE"], []],
+        [["AAA", "ZZZ"], ["ZZZ is not a known point or airway"]],
+        [["AAA"], ["L1 has no exit point"]],
+        [[], ["Empty route"]]
+        ]
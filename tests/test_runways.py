@@ -0,0 +1,95 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pandas as pd
+import pytest
+import shapely
+
+# Local Imports
+from conftest import aip_module
+
+functions = aip_module("functions")
+runways = aip_module("runways")
+
+
+@pytest.fixture(scope="module")
+def geometry():
+    """Parallel runways with a centre one at EGXX, and a runway at EGYY with only one end published"""
+
+    return runways.RunwayGeometry(pd.DataFrame({
+        'icao_designator': ["EGXX"] * 6 + ["EGYY"],
+        'runway': ["09L", "27R", "09C", "27C", "09R", "27L", "05"],
+        'location': [
+            "N051.00.00.000 W001.00.00.000", "N051.00.00.000 W000.57.00.000",
+            "N050.59.30.000 W001.00.00.000", "N050.59.30.000 W000.57.00.000",
+            "N050.59.00.000 W001.00.00.000", "N050.59.00.000 W000.57.00.000",
+            "N052.00.00.000 W002.00.00.000"
+            ],
+        'elevation': ["100"] * 7,
+        'bearing': ["090.00", "270.00", "090.00", "270.00", "090.00", "270.00", "045.00"],
+        'length': ["3500", "3500", "3500", "3500", "3500", "3500", "1000"]
+        }))
+
+
+def test_reciprocal_designators():
+    designators = pd.Series(["09L", "27R", "09C", "18", "36", "01R", None, "XX"])
+
+    assert runways.reciprocal(designators).tolist() == ["27R", "09L", "27C", "36", "18", "19L", None, None]
+
+
+def test_reciprocal_ends_are_paired(geometry):
+    centrelines = geometry.centrelines().set_index('runway')
+
+    # the left runway one way is the right runway the other, the centre runway stays the centre
+    assert centrelines.loc["09L", 'reciprocal'] == "27R"
+    assert centrelines.loc["09L", ['end_lat', 'end_lon']].tolist() == pytest.approx([51.0, -0.95])
+    assert centrelines.loc["09C", ['end_lat', 'end_lon']].tolist() == pytest.approx([50.991667, -0.95])
+    assert centrelines.loc["27L", ['end_lat', 'end_lon']].tolist() == pytest.approx([50.983333, -1.0])
+    assert centrelines.loc["27R", 'bearing'] == pytest.approx(270.0, abs=0.05)
+    assert centrelines['paired'].tolist() == [True] * 6 + [False]
+
+
+def test_single_ended_runway_is_extended_along_its_bearing(geometry):
+    single = geometry.centrelines().set_index('runway').loc["05"]
+
+    assert single['reciprocal'] == "23"
+    assert single['length'] == pytest.approx(1000.0, abs=0.5)
+    assert single['bearing'] == pytest.approx(45.0, abs=0.01)
+    assert single['end_lat'] > 52.0 and single['end_lon'] > -2.0
+
+
+def test_centrelines_are_linestrings(geometry):
+    centrelines = geometry.centrelines().set_index('runway')
+    threshold = centrelines.loc["09L", ['threshold_lon', 'threshold_lat']].tolist()
+
+    assert shapely.get_coordinates(centrelines.loc["09L", 'centreline']).ravel().tolist() == pytest.approx(threshold + [-0.95, 51.0])
+    extended = shapely.get_coordinates(centrelines.loc["09L", 'extended_centreline'])
+    # the approach to 09L is from the west, ten miles out
+    assert extended[1].tolist() == pytest.approx(threshold)
+    assert extended[0][0] < threshold[0]
+    assert functions.METRES_PER_NM * 10 == pytest.approx(
+        geometry.geod.inv(extended[0][0], extended[0][1], *threshold)[2], rel=1e-6
+        )
+
+
+def test_pairs_give_each_runway_once(geometry):
+    pairs = geometry.pairs()
+
+    assert pairs[['runway', 'reciprocal']].values.tolist() == [["09L", "27R"], ["09C", "27C"], ["09R", "27L"]]
+    vertices = shapely.get_coordinates(pairs.loc[0, 'extended_centreline'])
+    # in from the west, along the runway, and out over the approach to 27R
+    assert len(vertices) == 4
+    assert vertices[1:3].ravel().tolist() == pytest.approx([-1.0, 51.0, -0.95, 51.0])
+    assert vertices[0][0] < -1.0 < -0.95 < vertices[3][0]
+    assert shapely.get_coordinates(pairs.loc[0, 'centreline']).ravel().tolist() == pytest.approx([-1.0, 51.0, -0.95, 51.0])
+
+
+def test_no_runways():
+    empty = runways.RunwayGeometry(pd.DataFrame(columns=['icao_designator', 'runway', 'location', 'elevation', 'bearing', 'length']))
+
+    assert list(empty.centrelines().columns) == runways.CENTRELINE_COLUMNS
+    assert list(empty.pairs().columns) == runways.PAIR_COLUMNS
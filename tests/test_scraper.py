@@ -0,0 +1,229 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import asyncio
+import os
+
+# 3rd Party Imports
+import pandas as pd
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+browser = aip_module("browser")
+cache = aip_module("cache")
+fetch = aip_module("fetch")
+scraper = aip_module("scraper")
+standin = aip_module("standin")
+
+# the sections fetched up front through the asyncio engine
+SECTIONS = ["ENR-3.1", "ENR-3.3", "ENR-3.5", "ENR-4.1", "ENR-4.4"]
+
+
+def scrape(server, output_dir, retries:int=20, **kwargs) -> tuple:
+    """Scrape a stand-in without rendering, returning the number of rows in each section and the fetcher's stats"""
+
+    os.makedirs(output_dir, exist_ok=True)
+    fetcher = fetch.Fetcher(retries=retries, backoff=0.001, initial_concurrency=4)
+    with scraper.Webscrape(render=False, fetcher=fetcher, base_url=f"http://127.0.0.1:{server.server_port}/", **kwargs) as web_scrape:
+        output = web_scrape.run(SECTIONS, output_dir=str(output_dir) + os.sep)
+
+    return {section: len(table) for section, table in output.items()}, fetcher.stats()
+
+
+@pytest.fixture(scope="module")
+def pages():
+    return standin.StandIn(scale=0.05)
+
+
+@pytest.fixture(scope="module")
+def clean(pages, tmp_path_factory):
+    server = standin.serve(pages)
+    try:
+        yield scrape(server, tmp_path_factory.mktemp("clean"))[0]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def serve_errors(pages, error_rate:float):
+    server = standin.serve(pages, error_rate=error_rate)
+    server.random.seed(1)
+
+    return server
+
+
+def test_errors_are_retried_to_the_same_rows(pages, clean, tmp_path):
+    server = serve_errors(pages, 0.5)
+    try:
+        rows, stats = scrape(server, tmp_path)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stats['errors'] > 0
+    assert all(clean.values())
+    assert rows == clean
+
+
+def test_errors_inside_a_running_loop(pages, clean, tmp_path):
+    server = serve_errors(pages, 0.5)
+
+    async def scrape_from_loop():
+        return scrape(server, tmp_path)
+
+    try:
+        rows, stats = asyncio.run(scrape_from_loop())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stats['errors'] > 0
+    assert rows == clean
+
+
+def test_failed_pages_are_not_kept(pages, tmp_path):
+    server = serve_errors(pages, 1.0)
+    parse_cache = cache.ParseCache(str(tmp_path / "cache"))
+    try:
+        with pytest.raises(fetch.FetchError):
+            scrape(server, tmp_path / "output", retries=1, cache=parse_cache, checkpoint_dir=str(tmp_path / "checkpoints"))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert os.listdir(tmp_path / "cache") == []
+    for kind in ("pages", "stages"):
+        assert [entry for directory in os.listdir(tmp_path / "checkpoints") for entry in os.listdir(tmp_path / "checkpoints" / directory / kind)] == []
+
+
+def test_records_are_read_again_from_the_parse_cache(pages, tmp_path):
+    server = standin.serve(pages)
+    fetcher = fetch.Fetcher(initial_concurrency=4)
+    parse_cache = cache.ParseCache(str(tmp_path / "cache"))
+    try:
+        with scraper.Webscrape(render=False, fetcher=fetcher, cache=parse_cache, base_url=f"http://127.0.0.1:{server.server_port}/") as web_scrape:
+            records = web_scrape.records()
+            runways = list(records.runways())
+            parsed = parse_cache.stats()['misses']
+            services = list(records.services())
+            aerodromes = list(records.aerodromes())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert runways and services
+    # nothing is kept between generators, the pages are fetched again but not parsed again
+    assert not hasattr(records, "ad02")
+    # AD-0.1 and each AD-2 page are parsed once
+    assert len(aerodromes) == parsed - 1
+    assert parse_cache.stats()['misses'] == parsed
+    assert parse_cache.stats()['hits'] == 2 * len(aerodromes)
+
+
+class RenderDriver:
+    '''Stands in for a webdriver, the rendered source being the address it was given'''
+
+    def __init__(self):
+        self.address = None
+
+    def get(self, address:str) -> None:
+        self.address = address
+
+    @property
+    def page_source(self) -> str:
+        return self.address
+
+    def quit(self) -> None:
+        pass
+
+
+def test_rendering_keeps_order_and_only_fetches_a_window_ahead(pages):
+    server = standin.serve(pages)
+    fetcher = fetch.Fetcher(max_concurrency=2)
+    pool = browser.BrowserPool(2, driver_factory=RenderDriver)
+    uris = [f"EG-{section}-en-GB.html" for section in ("AD-0.1", "AD-2.NONE", "ENR-4.1", "ENR-4.4", "AD-2.NONE")] * 10
+    try:
+        with scraper.Webscrape(render=True, fetcher=fetcher, browser=pool, base_url=f"http://127.0.0.1:{server.server_port}/") as web_scrape:
+            sources = web_scrape.get_page_sources(uris)
+            first = next(sources)
+            # rendering doesn't wait for every page to be fetched first
+            assert fetcher.stats()['requests'] < len(uris)
+            rest = list(sources)
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+    assert [first] + rest == [404 if "NONE" in uri else web_scrape.cycle_url + uri for uri in uris]
+
+
+def run_sections(server, output_dir, sections:list, checkpoint_dir:str=None) -> tuple:
+    """Scrape the given sections of a stand-in, giving up on the first failed page"""
+
+    os.makedirs(output_dir, exist_ok=True)
+    fetcher = fetch.Fetcher(retries=1, backoff=0.001, initial_concurrency=4)
+    with scraper.Webscrape(render=False, fetcher=fetcher, base_url=f"http://127.0.0.1:{server.server_port}/", checkpoint_dir=checkpoint_dir) as web_scrape:
+        return web_scrape.run(sections, output_dir=str(output_dir) + os.sep), web_scrape.checkpoint
+
+
+def test_interrupted_run_resumes_to_the_same_output(pages, tmp_path, monkeypatch):
+    sections = ["AD-2", "ENR-4.4"]
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    server = standin.serve(pages)
+    page = pages.page
+    served = []
+
+    def fail_part_way(name:str):
+        # every request fails once three AD-2 pages have been served, so the run stops part way through AD-2
+        if "AD-2." in name:
+            served.append(name)
+            if len(served) == 3:
+                server.error_rate = 1.0
+        return page(name)
+
+    try:
+        clean, _ = run_sections(server, tmp_path / "clean", sections)
+        monkeypatch.setattr(pages, "page", fail_part_way)
+        with pytest.raises(fetch.FetchError):
+            run_sections(server, tmp_path / "interrupted", sections, checkpoint_dir)
+        monkeypatch.undo()
+        server.error_rate = 0.0
+        resumed, checkpoint = run_sections(server, tmp_path / "resumed", sections, checkpoint_dir)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = checkpoint.stats()
+    assert stats['stages'] == 1
+    assert 0 < stats['pages'] < pages.counts['aerodromes']
+    assert resumed.keys() == clean.keys()
+    for section, output in clean.items():
+        # AD-2 gives the aerodromes, runways and services, the rest a table each
+        tables = output if isinstance(output, (list, tuple)) else [output]
+        resumed_tables = resumed[section] if isinstance(output, (list, tuple)) else [resumed[section]]
+        assert len(resumed_tables) == len(tables)
+        for resumed_table, clean_table in zip(resumed_tables, tables):
+            pd.testing.assert_frame_equal(resumed_table, clean_table)
+    # finished runs leave nothing behind to resume from
+    assert os.listdir(checkpoint_dir) == []
+
+
+def test_checkpoints_belong_to_one_base_url_and_parser_version(tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    scrapes = [
+        scraper.Webscrape(render=False, date_in="2026-10-01", base_url=base_url, checkpoint_dir=checkpoint_dir)
+        for base_url in ("http://127.0.0.1:8000/", "http://127.0.0.1:8001/")
+        ]
+    for web_scrape in scrapes:
+        web_scrape.close()
+    one, other = (web_scrape.checkpoint for web_scrape in scrapes)
+
+    one.save_stage(scrapes[0].stage_version, "ENR-4.4", ["from 8000"])
+    assert one.path != other.path
+    assert other.stage(scrapes[1].stage_version, "ENR-4.4") is None
+    assert one.stage(scrapes[0].stage_version, "ENR-4.4") == ["from 8000"]
+    assert one.stage("an older parser", "ENR-4.4") is None
@@ -0,0 +1,43 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pandas as pd
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+spatial = aip_module("spatial")
+
+
+@pytest.fixture(scope="module")
+def index():
+    """A point due north of 50N 0W, further on the WGS84 ellipsoid than on the mean sphere, and one due east"""
+
+    return spatial.PointIndex([pd.DataFrame({
+        'name': ["NORTH", "EAST"],
+        'type': ["FIX", "FIX"],
+        'coords': ["N051.00.00.000 W000.00.00.000", "N050.00.00.000 E002.00.00.000"]
+        })])
+
+
+def test_within_agrees_with_nearest(index):
+    names, distances = index.nearest(50.0, 0.0, 2)
+    north = float(distances[0][list(names[0]).index("NORTH")])
+
+    # the sphere puts NORTH at about 60.04 NM, so a radius just short of the WGS84 distance would have let it in
+    assert [name for name, _ in index.within(50.0, 0.0, north - 0.01)[0]] == []
+    inside = index.within(50.0, 0.0, north + 0.01)[0]
+    assert [name for name, _ in inside] == ["NORTH"]
+    assert inside[0][1] == pytest.approx(north)
+
+
+def test_within_is_sorted_by_distance(index):
+    results = index.within([50.0, 60.0], [0.0, 0.0], 100.0)
+
+    assert [name for name, _ in results[0]] == ["NORTH", "EAST"]
+    assert results[1] == []
@@ -0,0 +1,36 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+airspace = aip_module("airspace")
+scraper = aip_module("scraper")
+standin = aip_module("standin")
+
+
+@pytest.fixture(scope="module")
+def web_scrape():
+    pages = standin.StandIn(scale=1.0)
+    server = standin.serve(pages)
+    try:
+        with scraper.Webscrape(render=False, base_url=f"http://127.0.0.1:{server.server_port}/") as web_scrape:
+            web_scrape.pages = pages
+            yield web_scrape
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_every_airspace_is_valid(web_scrape):
+    enr_02 = web_scrape.parse_enr02_data()
+
+    # the FIR plus every generated CTA, TMA and ATZ, each listed once
+    assert sum(len(enr_02[position]) for position in (0, 2, 3, 4)) == web_scrape.pages.counts['airspaces'] + 1
+    assert airspace.AirspaceGeometry(enr_02).invalid().empty
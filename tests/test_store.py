@@ -0,0 +1,100 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+from datetime import date, timedelta
+
+# 3rd Party Imports
+import pandas as pd
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+store = aip_module("store")
+
+THIS_CYCLE = "2023-01-26"
+NEXT_CYCLE = str(date.today() + timedelta(days=28))
+
+
+def ad02(length:str="3902") -> list:
+    """The AD-2 output of Webscrape.run() for two aerodromes"""
+
+    aerodromes = pd.DataFrame({
+        'icao_designator': ["EGLL", "EGKK"],
+        'verified': [1, 1],
+        'location': ["N051.28.39.000 W000.27.41.000", "N051.08.53.000 W000.11.25.000"],
+        'elevation': ["83", "202"],
+        'name': ["LONDON HEATHROW", "LONDON GATWICK"],
+        'magnetic_variation': ["0.5W", "0.5W"]
+        })
+    runways = pd.DataFrame({
+        'icao_designator': ["EGLL", "EGLL", "EGKK"],
+        'runway': ["09L", "27R", "08R"],
+        'location': ["N051.28.39.000 W000.29.06.000", "N051.28.39.000 W000.25.59.000", "N051.08.45.000 W000.12.36.000"],
+        'elevation': ["79", "78", "196"],
+        'bearing': ["089.67", "269.71", "077.79"],
+        'length': [length, length, "3316"]
+        })
+    services = pd.DataFrame({'icao_designator': ["EGLL"], 'callsign_type': ["HEATHROW TOWER"], 'frequency': ["118.505"]})
+
+    return [aerodromes, runways, services]
+
+
+def airways(count:int) -> pd.DataFrame:
+    return pd.DataFrame({'name': [f"L{number}" for number in range(count)], 'route': ["DVR/KONAN"] * count})
+
+
+@pytest.fixture
+def database(tmp_path):
+    with store.Store(str(tmp_path / "aip.sqlite")) as database:
+        yield database
+
+
+def test_saving_a_cycle_again_updates_it(database):
+    database.save(THIS_CYCLE, {"AD-2": ad02()})
+    database.save(THIS_CYCLE, {"AD-2": ad02(length="3901")})
+
+    runways = database.runways("EGLL", THIS_CYCLE)
+    assert [(runway['runway'], runway['length']) for runway in runways] == [("09L", "3901"), ("27R", "3901")]
+    assert len(database.query('runways', THIS_CYCLE)) == 3
+    assert database.services("EGLL", THIS_CYCLE)[0]['frequency'] == "118.505"
+    assert database.cycles() == [THIS_CYCLE]
+
+
+def test_positional_rows_left_over_from_a_longer_run_are_removed(database):
+    database.save(THIS_CYCLE, {"ENR-3.1": airways(3), "ENR-3.3": airways(2)})
+    database.save(THIS_CYCLE, {"ENR-3.1": airways(1)})
+
+    rows = database.query('airways', THIS_CYCLE)
+    assert [(row['section'], row['seq'], row['name']) for row in rows] == [("3.1", 0, "L0"), ("3.3", 0, "L0"), ("3.3", 1, "L1")]
+
+
+def test_query_defaults_to_the_cycle_in_effect(database):
+    database.save(NEXT_CYCLE, {"AD-2": ad02(length="4000")})
+    # only a cycle that hasn't started yet, so that is all there is to give
+    assert database.runways("EGLL")[0]['cycle'] == NEXT_CYCLE
+
+    database.save(THIS_CYCLE, {"AD-2": ad02()})
+    runways = database.runways("EGLL")
+    assert [runway['cycle'] for runway in runways] == [THIS_CYCLE, THIS_CYCLE]
+    assert runways[0]['length'] == "3902"
+    assert database.runways("EGLL", NEXT_CYCLE)[0]['length'] == "4000"
+    assert database.runways("EGPH") == []
+
+
+def test_lookups_use_an_index(database):
+    database.save(THIS_CYCLE, {"AD-2": ad02()})
+
+    plan = database.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM runways WHERE cycle = ? AND icao_designator = ?", [THIS_CYCLE, "EGLL"]
+        ).fetchall()
+    assert any("USING INDEX" in row['detail'] for row in plan)
+
+
+def test_bad_queries_are_rejected(database):
+    with pytest.raises(ValueError, match="Unknown table"):
+        database.query('runway')
+    with pytest.raises(ValueError, match="no column"):
+        database.query('runways', icao="EGLL")
@@ -0,0 +1,49 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+
+# 3rd Party Imports
+import pandas as pd
+import pytest
+
+# Local Imports
+from conftest import aip_module
+
+scraper = aip_module("scraper")
+standin = aip_module("standin")
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = standin.serve(standin.StandIn(scale=0.2))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def parse(server, stream:bool, section:str, *args) -> list:
+    with scraper.Webscrape(render=False, stream=stream, base_url=f"http://127.0.0.1:{server.server_port}/") as web_scrape:
+        output = getattr(web_scrape, f"parse_{section}_data")(*args)
+
+    return output if isinstance(output, list) else [output]
+
+
+@pytest.mark.parametrize("section, args", [
+    ("enr02", ()),
+    ("enr03", ("1",)),
+    ("enr03", ("3",)),
+    ("enr03", ("5",)),
+    ("enr04", ("1",)),
+    ("enr04", ("4",)),
+    ("enr051", ()),
+    ])
+def test_stream_matches_tree(server, section, args):
+    tree = parse(server, False, section, *args)
+    stream = parse(server, True, section, *args)
+
+    assert all(len(table) for table in tree)
+    assert len(stream) == len(tree)
+    for stream_table, tree_table in zip(stream, tree):
+        pd.testing.assert_frame_equal(stream_table, tree_table)
@@ -0,0 +1,138 @@
+"""
+UK AIP Scraper
+"""
+
+# Python Imports
+import os
+
+# 3rd Party Imports
+import pytest
+from bs4 import BeautifulSoup
+
+# Local Imports
+from conftest import aip_module
+
+config = aip_module("config")
+scraper = aip_module("scraper")
+standin = aip_module("standin")
+tokenizer = aip_module("tokenizer")
+
+
+@pytest.fixture(scope="module")
+def pages():
+    return standin.StandIn(scale=0.05)
+
+
+@pytest.fixture(scope="module")
+def enr021(pages):
+    return BeautifulSoup(pages.page(f"{pages.country}-ENR-2.1-en-GB.html"), "html.parser")
+
+
+def airspace_titles(pages) -> list:
+    """The titles the stand-in gives its CTAs, TMAs and ATZs, in page order"""
+
+    aerodromes = pages.aerodromes
+    return [
+        f"{aerodromes[number % len(aerodromes)]['name']} {['CTA', 'TMA', 'ATZ'][number % 3]} {number // len(aerodromes) + 1}"
+        for number in range(pages.counts['airspaces'])
+        ]
+
+
+def test_enr02_tokens_match_the_stand_in(pages, enr021):
+    tokens, coords = tokenizer.tokenize_enr02(span.get_text() for span in enr021.find_all("span"))
+    kinds = [token.kind for token in tokens]
+    titles = [token.value for token in tokens if token.kind == tokenizer.TITLE]
+
+    assert titles == [(title, title.split()[-2] if title != "LONDON FIR" else "FIR") for title in ["LONDON FIR"] + airspace_titles(pages)]
+    assert kinds.count(tokenizer.CALLSIGN) == kinds.count(tokenizer.FREQUENCY) == len(titles)
+    assert kinds.count(tokenizer.ARC) == str(enr021).count("by the arc of a circle")
+    # every volume is a box of four vertices, an arc's centre isn't a vertex
+    vertices = [token.value for token in tokens if token.kind == tokenizer.VERTEX]
+    assert len(vertices) == 8 * len(titles)
+    assert None not in vertices
+    assert len(coords) == len(vertices) + 2 * kinds.count(tokenizer.ARC)
+
+
+def test_arc_points_are_the_vertices_either_side(enr021):
+    tokens, coords = tokenizer.tokenize_enr02(span.get_text() for span in enr021.find_all("span"))
+    position = next(index for index, token in enumerate(tokens) if token.kind == tokenizer.ARC)
+    arc = tokens[position]
+
+    start_lat, start_lon, mid_lat, mid_lon, end_lat, end_lon = tokenizer.find_arc_points(coords, arc.value)
+
+    assert [start_lat, start_lon] == [tokens[position - 2].value, tokens[position - 1].value]
+    assert [mid_lat, mid_lon] == coords[arc.value:arc.value + 2]
+    assert [end_lat, end_lon] == [tokens[position + 1].value, tokens[position + 2].value]
+    with pytest.raises(ValueError):
+        tokenizer.find_arc_points(coords[:arc.value + 2], arc.value)
+
+
+def test_enr02_page_keeps_the_last_airspace_and_writes_nothing(pages, enr021, tmp_path, monkeypatch):
+    # the scan before the token stream dropped the last airspace on the page and wrote a helper CSV under WORK_DIR
+    monkeypatch.setattr(config, "WORK_DIR", str(tmp_path / "work"))
+    with scraper.Webscrape(render=False) as web_scrape:
+        airspaces = web_scrape.parse_enr02_page(enr021)
+
+    last = airspace_titles(pages)[-1]
+    assert airspaces[last.split()[-2]][-1]['name'] == last
+    assert sum(len(rows) for rows in airspaces.values()) == pages.counts['airspaces'] + 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_dms_to_degrees():
+    assert tokenizer.dms_to_degrees("512839", "N") == pytest.approx(51 + 28 / 60 + 39 / 3600)
+    assert tokenizer.dms_to_degrees("0002741.50", "W") == pytest.approx(-(27 / 60 + 41.5 / 3600))
+    assert tokenizer.dms_to_degrees("0010000", "E") == pytest.approx(1.0)
+    assert tokenizer.dms_to_degrees("500000", "S") == pytest.approx(-50.0)
+
+
+@pytest.mark.parametrize("value, unit, feet", [
+    ("SFC", "", 0),
+    ("GND", "FT", 0),
+    ("95", "FL", 9500),
+    ("FL 195", "", 19500),
+    ("2000", "FT", 2000),
+    ("2000 FT ALT", "", 2000),
+    ("3500 FT AMSL", "", 3500),
+    ("600", "M", 1969),
+    ("UNL", "", None),
+    ("", "FT", None),
+    ])
+def test_parse_limit(value, unit, feet):
+    assert tokenizer.parse_limit(value, unit) == feet
+
+
+def test_enr051_arc_in_kilometres():
+    texts = [
+        "EG R101", "TAIRSPACE;CODE_ID",
+        "510000N", "TAIRSPACE_VERTEX;GEO_LAT;1234", "0010000W", "TAIRSPACE_VERTEX;GEO_LONG;1234",
+        "thence anti-clockwise by the arc of a circle radius",
+        "9.26", "TAIRSPACE_VERTEX;VAL_RADIUS_ARC", "KM", "TAIRSPACE_VERTEX;UOM_RADIUS_ARC",
+        "505500N", "TAIRSPACE_VERTEX;GEO_LAT_ARC", "0010000W", "TAIRSPACE_VERTEX;GEO_LONG_ARC",
+        "505000N", "TAIRSPACE_VERTEX;GEO_LAT;4321", "0010000W", "TAIRSPACE_VERTEX;GEO_LONG;4321",
+        "95", "TAIRSPACE_VOLUME;VAL_DIST_VER_UPPER", "FL", "TAIRSPACE_VOLUME;UOM_DIST_VER_UPPER",
+        "SFC", "TAIRSPACE_VOLUME;VAL_DIST_VER_LOWER", "FT", "TAIRSPACE_VOLUME;UOM_DIST_VER_LOWER",
+        ]
+
+    area = tokenizer.tokenize_enr051(texts)
+
+    assert [part.kind for part in area['parts']] == [tokenizer.POINT, tokenizer.ARC, tokenizer.POINT]
+    clockwise, radius, centre_lat, centre_lon = area['parts'][1].value
+    assert not clockwise
+    assert radius == pytest.approx(5.0)
+    assert (centre_lat, centre_lon) == pytest.approx((50 + 55 / 60, -1.0))
+    assert area['parts'][2].value == pytest.approx((50 + 50 / 60, -1.0))
+    assert (area['floor'], area['ceiling']) == (0, 9500)
+
+
+def test_enr051_circle():
+    texts = [
+        "A circle,", "2.5", "TAIRSPACE_VERTEX;VAL_RADIUS_ARC", "NM", "TAIRSPACE_VERTEX;UOM_RADIUS_ARC", "radius centred at",
+        "520000N", "TAIRSPACE_VERTEX;GEO_LAT_ARC", "0020000E", "TAIRSPACE_VERTEX;GEO_LONG_ARC",
+        "2000", "TAIRSPACE_VOLUME;VAL_DIST_VER_UPPER", "FT", "TAIRSPACE_VOLUME;UOM_DIST_VER_UPPER",
+        ]
+
+    area = tokenizer.tokenize_enr051(texts)
+
+    assert area['parts'] == [tokenizer.Token(tokenizer.CIRCLE, (2.5, 52.0, 2.0))]
+    assert (area['floor'], area['ceiling']) == (0, 2000)